@@ -1,96 +1,228 @@
-import re
-
-palavras_reservadas = {
-    "ABSOLUTE", "AND", "ARRAY", "BEGIN", "CASE", "CHAR", "CONST", "DIV", "DO",
-    "DOWNTO", "ELSE", "END", "EXTERNAL", "FILE", "FOR", "FORWARD", "FUNC",
-    "FUNCTION", "GOTO", "IF", "IMPLEMENTATION", "INTEGER", "INTERFACE",
-    "INTERRUPT", "LABEL", "MAIN", "NIL", "NIT", "NOT", "OF", "OR", "PACKED",
-    "PROC", "PROGRAM", "REAL", "RECORD", "REPEAT", "SET", "SHL", "SHR",
-    "STRING", "THEN", "TO", "TYPE", "UNIT", "UNTIL", "USES", "VAR",
-    "WHILE", "WITH", "XOR"
-}
-
-# Definicao dos padroes de tokens
-token_specification = [
-    ("COMMENT",       r'/\*.*?\*/'),                    # Comentarios
-    ("READ",          r'\bread\b'),                     # Comando de entrada
-    ("WRITE",         r'\bwrite\b'),                    # Comando de saída
-    ("WRITELN",       r'\bwriteln\b'),                  # Comando de saída com quebra de linha
-    ("STRING",        r'"[^"]*"'),                      # Strings delimitadas por aspas duplas
-    ("CHAR",          r"'[^']*'"),                      # Caracteres delimitados por aspas simples
-    ("NUMBER",        r'\d+(\.\d*)?([eE][+-]?\d+)?'),   # Numeros inteiros, decimais e com notacao cientifica
-    ("BEGIN",         r'\bbegin\b'),                    # Blocos de comandos
-    ("END",           r'\bend\b'),                      # Blocos de comandos
-    ("IF",            r'\bif\b'),                       # Condicionais
-    ("THEN",          r'\bthen\b'),                     # Condicionais
-    ("ELSE",          r'\belse\b'),                     # Condicionais
-    ("WHILE",         r'\bwhile\b'),                    # Estruturas de repetição
-    ("DO",            r'\bdo\b'),                       # Estruturas de repetição
-    ("REPEAT",        r'\brepeat\b'),                   # palavra reservada "repeat"
-    ("UNTIL",         r'\buntil\b'),                    # palavra reservada "until"
-    ("FOR",           r'\bfor\b'),                      # Estrutura de for-to-do
-    ("TO",            r'\bto\b'),                       # Estrutura de for-to-do
-    ("AND",           r'\band\b'),                      # Operadores logicos
-    ("OR",            r'\bor\b'),                       # Operadores logicos
-    ("NOT",           r'\bnot\b'),                      # Operadores logicos
-    ("MOD",           r'\bmod\b'),                      # Operadores
-    ("DIV",           r'\bdiv\b'),                      # Operadores
-    ("PLUS",          r'\+'),                       # Operadores
-    ("MINUS",         r'-'),                     # Operadores
-    ("DIVIDE",        r'/'),                              # Operadores
-    ("TIMES",         r'\*'),                  # Operadores
-    ("LESS_EQUAL",    r'<='),                        # Operadores relacionais
-    ("GREATER_EQUAL", r'>='),                           # Operadores relacionais
-    ("NOT_EQUAL",     r'<>'),                          # Operadores relacionais
-    ("LESS_THAN",     r'<'),                         # Operadores relacionais
-    ("GREATER_THAN",  r'>'),                           # Operadores relacionais
-    ("EQUAL",         r'='),                              # Operadores relacionais
-    ("ASSIGN",        r':='),                           # Atribuicao
-    ("ID",            r'[A-Za-z_]\w*'),                 # Identificadores("LPAREN",  r"\("),
-    ("LPAREN",        r'\('),
-    ("RPAREN",        r'\)'),
-    ("SEMI",          r';'),
-    ("COLON",         r':'),
-    ("COMMA",         r','),
-    ("END_PROGRAM",   r'\.'),                           # Final de programa
-    ("SKIP",          r'[ \t]+'),                       # Espacos e tabulacoes
-    ("MISMATCH",      r'.'),                            # Qualquer coisa inesperada
-]
-
-tok_regex = "|".join(f"(?P<{name}>{pattern})" for name, pattern in token_specification)
-# re.DOTALL faz com que o regex r'.' idendifique qualquer caractere mais o caractere de quebra de linha (\n),
-# isso faz que ele consiga indentificar comentarios de multiplas linhas
-get_token = re.compile(tok_regex, re.DOTALL).match
-
-print("Digite o nome do arquivo que deseja ler: ")
-arquivo_de_entrada = input()
-arquivo_de_saida = arquivo_de_entrada[:5] + "_output.txt"
-
-def lexer(code):
+import contextlib
+import hashlib
+import mmap
+import sys
+from itertools import islice
+import cache_tokens
+import linguagem
+from leitor import CHUNK_PADRAO, abrir_fonte
+from linhas import IndiceLinhas
+from nucleo import nomes_tipos, tokens_em_fluxo
+
+# A especificação dos tokens fica em linguagem.py (dialeto "estendido"); os
+# nomes abaixo continuam existindo para quem importava daqui
+DIALETO = linguagem.obter("estendido")
+palavras_reservadas = DIALETO.palavras_reservadas
+token_specification = DIALETO.especificacao
+
+get_token = DIALETO.regex().match
+
+def lexer(code, dialeto=None, posicoes=False):
+    # Gera (tipo, valor); com posicoes=True, (tipo, valor, linha, coluna),
+    # tiradas do índice de linhas da fonte (linhas.py)
+    d = DIALETO if dialeto is None else linguagem.obter(dialeto)
+    get_token = d.regex().match
+    reservadas = d.palavras_reservadas
+    ignorar = d.ignorar
+    indice = IndiceLinhas(code) if posicoes else None
+    linha = 1
     pos = 0
     while pos < len(code):
         match = get_token(code, pos)
         if not match:
-            raise SyntaxError(f"Caractere inválido em {pos}")
+            linha, coluna = IndiceLinhas(code).posicao(pos)
+            raise SyntaxError(f"Caractere inválido na linha {linha}, coluna {coluna}")
         kind = match.lastgroup
         value = match.group()
         # Faz verificacao se o ID eh igual a algum token presente na lista "palvras_reservadas"
-        if(kind == "ID" and value.upper() in palavras_reservadas):# O compilador vai ser case-sensitive?
-            kind = "RESERVED_TOKEN"
-        if kind not in ("SKIP", "MISMATCH", "COMMENT"):
-            yield kind, value
+        if(kind == "ID" and value.upper() in reservadas):# O compilador vai ser case-sensitive?
+            kind = d.tipo_reservada(value.upper())
+        if kind not in ignorar:
+            if indice is None:
+                yield kind, value
+            else:
+                # As posições só crescem: avança a linha em vez de buscar
+                while pos >= indice.inicios[linha]:
+                    linha += 1
+                yield kind, value, linha, pos - indice.inicios[linha - 1] + 1
         pos = match.end()
 
-try:
-    with open(arquivo_de_entrada, 'r', encoding='utf-8') as leitor:
-        codigo_completo = leitor.read()
-        tokens = list(lexer(codigo_completo))
-    with open(arquivo_de_saida, 'w', encoding='utf-8') as escritor:
-        for token in tokens:
-            escritor.write(str(token) + "\n")
-            # Se quiser printar no terminal...
-            #print(token)
-except FileNotFoundError:
-    print(f"O arquivo nao foi encontrado.")
-except Exception as e:
-    print(f"Ocorreu um erro: {e}")
+# Versão em fluxo do lexer acima: lê a fonte em blocos (arquivo ou mmap) com
+# o autômato determinístico compilado da mesma especificação (uma vez por
+# processo, ver linguagem.py), sem carregar o arquivo inteiro em memória
+def lexer_stream(fonte, chunk_size=CHUNK_PADRAO, dialeto=None):
+    for kind, value, _, _ in lexer_stream_posicoes(fonte, chunk_size, dialeto):
+        yield kind, value
+
+# Igual ao lexer_stream, mas também devolve o início e o fim de cada token em
+# bytes na fonte (UTF-8), que é o que o cache de tokens guarda
+def lexer_stream_posicoes(fonte, chunk_size=CHUNK_PADRAO, dialeto=None):
+    # O lexer em fluxo do núcleo, com caracteres inválidos como tokens
+    # MISMATCH (o analisador os lista em vez de parar) e sem o EOF
+    d = DIALETO if dialeto is None else linguagem.obter(dialeto)
+    nomes = nomes_tipos(d.nome)
+    eof = nomes.index("EOF")
+    for k, value, inicio, fim, _ in tokens_em_fluxo(fonte, chunk_size, d.nome,
+                                                     invalidos_como_tokens=True, em_bytes=True):
+        if k != eof:
+            yield nomes[k], value, inicio, fim
+
+# ==============================================================================
+# CACHE DE TOKENS E SAÍDA EM TEXTO
+# ==============================================================================
+#
+# Os tokens de <arquivo> ficam em <arquivo>.tokens (ver cache_tokens.py). Se a
+# fonte e a especificação não mudaram, a próxima execução lê os tokens do
+# cache em vez de rodar o lexer.
+
+def versao_especificacao(dialeto=None):
+    # O hash do dialeto já cobre a especificação, as palavras reservadas e a
+    # versão declarada em linguagem.py
+    d = DIALETO if dialeto is None else linguagem.obter(dialeto)
+    return bytes.fromhex(d.hash[:16])
+
+def nomes_tokens(dialeto=None):
+    d = DIALETO if dialeto is None else linguagem.obter(dialeto)
+    nomes = list(d.tipos())
+    if d.reservada_como:
+        nomes.append(d.reservada_como)
+    return nomes
+
+VERSAO_ESPECIFICACAO = versao_especificacao()
+
+class _LeitorComHash:
+    # Repassa os blocos lidos da fonte ao lexer calculando o hash e o tamanho
+    # no caminho, para fontes lidas em fluxo (sem mmap)
+    def __init__(self, fonte):
+        self.fonte = fonte
+        self.hash = hashlib.sha256()
+        self.tamanho = 0
+
+    def read(self, n=-1):
+        bloco = self.fonte.read(n)
+        self.hash.update(bloco)
+        self.tamanho += len(bloco)
+        return bloco
+
+def tokens_do_arquivo(caminho, fonte, usar_cache=True, dialeto=None):
+    # Gera (tipo, valor) para a fonte já aberta (mmap ou arquivo), usando ou
+    # gravando o cache de tokens. Com mmap o cache é lido direto da fonte
+    # mapeada; sem mmap a fonte é lida em blocos (o cache só é gravado, já
+    # que ler os valores do cache precisaria da fonte inteira em memória)
+    if not usar_cache:
+        yield from lexer_stream(fonte, dialeto=dialeto)
+        return
+    versao = versao_especificacao(dialeto)
+    caminho_cache = caminho + cache_tokens.EXTENSAO
+    if isinstance(fonte, mmap.mmap):
+        hash_da_fonte = cache_tokens.hash_fonte(fonte)
+        cache = cache_tokens.carregar(caminho_cache, fonte, hash_da_fonte, versao)
+        if cache is not None:
+            with cache:
+                yield from cache
+            return
+        entrada = fonte
+        tamanho = len(fonte)
+    else:
+        entrada = _LeitorComHash(fonte)
+        tamanho = None
+    try:
+        gravador = cache_tokens.GravadorCache(caminho_cache, nomes_tokens(dialeto), tamanho)
+    except OSError:
+        gravador = None
+    try:
+        for kind, value, inicio, fim in lexer_stream_posicoes(entrada, dialeto=dialeto):
+            if gravador is not None:
+                try:
+                    gravador.append(kind, inicio, fim)
+                except OSError:
+                    # O cache é só um complemento: sem disco, a análise segue
+                    gravador.descartar()
+                    gravador = None
+            yield kind, value
+        # Só grava o cache quando a análise chega ao fim
+        if gravador is not None:
+            if tamanho is None:
+                hash_da_fonte, tamanho = entrada.hash.digest(), entrada.tamanho
+            with contextlib.suppress(OSError):
+                gravador.salvar(hash_da_fonte, versao, tamanho)
+                gravador = None
+    finally:
+        if gravador is not None:
+            gravador.descartar()
+
+def tokens_em_paralelo(fonte, workers, dialeto=None):
+    # (tipo, valor) com o lexer dividido entre processos (ver paralelo.py);
+    # a fonte é lida inteira
+    from paralelo import tokenizar_paralelo
+    d = DIALETO if dialeto is None else linguagem.obter(dialeto)
+    code = fonte.read().decode('utf-8', errors='ignore')
+    tokens = tokenizar_paralelo(code, workers, dialeto=d.nome)
+    for i in range(len(tokens) - 1):  # sem o EOF
+        yield tokens.kind(i), tokens.value(i)
+
+def escrever_texto(tokens, escritor, lote=65536):
+    # Uma linha por token, idêntica a str((tipo, valor)), escrita em blocos
+    # grandes em vez de uma chamada de write por token. Os nomes dos tipos não
+    # têm aspas, então só o valor precisa de repr()
+    tokens = iter(tokens)
+    while True:
+        bloco = [f"('{kind}', {value!r})\n" for kind, value in islice(tokens, lote)]
+        if not bloco:
+            break
+        escritor.write("".join(bloco))
+
+# ==============================================================================
+# LINHA DE COMANDO
+# ==============================================================================
+#
+#   python analisador.py entrada.txt              (tokens em entra_output.txt)
+#   python analisador.py entrada.txt -o -         (tokens na saída padrão)
+#   cat entrada.txt | python analisador.py - -o tokens.txt
+#   python analisador.py grande.txt --paralelo 8  (lexer em 8 processos, sem cache)
+#
+# Código de saída: 0 em caso de sucesso e 2 para erro de uso ou de leitura.
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Lista os tokens de um arquivo-fonte.")
+    parser.add_argument("arquivo", help='arquivo-fonte ("-" lê da entrada padrão)')
+    parser.add_argument("-o", "--saida", default=None,
+                        help='arquivo de saída ("-" para a saída padrão; padrão: os 5 primeiros '
+                             'caracteres do nome + "_output.txt", ou a saída padrão se a '
+                             'entrada for "-")')
+    parser.add_argument("--dialeto", default=None,
+                        help=f"dialeto da linguagem (padrão: {DIALETO.nome})")
+    parser.add_argument("--sem-cache", action="store_true",
+                        help="não lê nem grava o cache de tokens")
+    parser.add_argument("--paralelo", type=int, default=0, metavar="N",
+                        help="roda o lexer em N processos (ver paralelo.py); não usa o cache")
+    args = parser.parse_args(argv)
+    try:
+        linguagem.obter(args.dialeto)
+    except ValueError as e:
+        parser.error(str(e))
+    saida = args.saida
+    if saida is None:
+        saida = "-" if args.arquivo == "-" else args.arquivo[:5] + "_output.txt"
+
+    try:
+        with abrir_fonte(args.arquivo) as leitor, \
+                (contextlib.nullcontext(sys.stdout) if saida == "-" else
+                 open(saida, 'w', encoding='utf-8', buffering=1 << 20)) as escritor:
+            if args.paralelo:
+                tokens = tokens_em_paralelo(leitor, args.paralelo, args.dialeto)
+            elif args.arquivo == "-":
+                # Sem caminho não há onde guardar o cache
+                tokens = lexer_stream(leitor, dialeto=args.dialeto)
+            else:
+                tokens = tokens_do_arquivo(args.arquivo, leitor, not args.sem_cache, args.dialeto)
+            escrever_texto(tokens, escritor)
+    except OSError as e:
+        print(f"Erro: {e.filename or args.arquivo}: {e.strerror or e}", file=sys.stderr)
+        return 2
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,346 +1,38 @@
-import re
 import sys
-from flask import Flask, render_template, request, jsonify
-from docx import Document
-import io
-import contextlib
-
-# ==============================================================================
-# 1. ANALISADOR LÉXICO (Mantido, mas gera tokens para o parser)
-# ==============================================================================
-
-palavras_reservadas = {
-    "PROGRAM", "VAR", "INTEGER", "BOOLEAN", "BEGIN", "END", "IF", "THEN",
-    "ELSE", "WHILE", "DO", "READ", "READLN", "WRITE", "WRITELN", "TRUE", "FALSE"
-}
-
-token_specification = [
-    ("COMMENT",       r'/\*.*?\*/'),                    
-    ("STRING",        r"'[^']*'"),                      
-    ("NUMBER",        r'\d+(\.\d*)?'),                  
-    ("ASSIGN",        r':='),                           
-    ("LE_EQ",         r'<='),                           
-    ("GE_EQ",         r'>='),                           
-    ("NE_EQ",         r'<>'),                           
-    ("SEMI",          r';'),
-    ("COLON",         r':'),
-    ("COMMA",         r','),
-    ("DOT",           r'\.'),                           
-    ("LPAREN",        r'\('),
-    ("RPAREN",        r'\)'),
-    ("PLUS",          r'\+'),
-    ("MINUS",         r'-'),
-    ("TIMES",         r'\*'),
-    ("DIVIDE",        r'/'),
-    ("EQUAL",         r'='),
-    ("LESS",          r'<'),
-    ("GREATER",       r'>'),
-    ("ID",            r'[A-Za-z_]\w*'),                 
-    ("SKIP",          r'[ \t\n]+'),                     
-    ("MISMATCH",      r'.'),                            
-]
-
-tok_regex = "|".join(f"(?P<{name}>{pattern})" for name, pattern in token_specification)
-get_token = re.compile(tok_regex, re.DOTALL).match
-
-def lexer(code):
-    line_num = 1
-    pos = 0
-    while pos < len(code):
-        match = get_token(code, pos)
-        if not match:
-            raise SyntaxError(f"Caractere inválido na posição {pos}")
-        
-        kind = match.lastgroup
-        value = match.group()
-        
-        if kind == "SKIP":
-            line_num += value.count('\n')
-        elif kind == "ID":
-            if value.upper() in palavras_reservadas:
-                kind = value.upper() 
-            yield kind, value, line_num
-        elif kind == "MISMATCH":
-            raise SyntaxError(f"Erro léxico: '{value}' na linha {line_num}")
-        elif kind != "COMMENT":
-            yield kind, value, line_num
-            
-        pos = match.end()
-    
-    yield "EOF", "", line_num
-
-# ==============================================================================
-# 2. ANALISADOR SINTÁTICO COM LOGS (Instrumentado)
-# ==============================================================================
-
-class Parser:
-    def __init__(self, tokens):
-        self.tokens = list(tokens)
-        self.pos = 0
-        self.current_token = self.tokens[self.pos]
-        self.indent_level = 0 # Controla a indentação dos logs
-
-    # --- Helpers de Log ---
-    def _log(self, msg):
-        indent = "|   " * self.indent_level
-        print(f"{indent}{msg}")
-
-    def _enter_rule(self, rule_name):
-        self._log(f"┌── ENTER <{rule_name}>")
-        self.indent_level += 1
-
-    def _exit_rule(self, rule_name):
-        self.indent_level -= 1
-        self._log(f"└── REDUCE <{rule_name}> (Regra validada)")
-
-    def _shift_log(self, token_type, value):
-        indent = "|   " * self.indent_level
-        print(f"{indent}>> SHIFT: Consumiu '{value}' ({token_type})")
-
-    # --- Controle de Fluxo ---
-    def error(self, msg):
-        token_atual = self.current_token
-        raise SyntaxError(
-            f"\n[ERRO SINTÁTICO] {msg}\n"
-            f"Linha: {token_atual[2]} | Encontrado: '{token_atual[1]}' ({token_atual[0]})"
-        )
-
-    def eat(self, token_type):
-        if self.current_token[0] == token_type:
-            self._shift_log(token_type, self.current_token[1])
-            self.pos += 1
-            if self.pos < len(self.tokens):
-                self.current_token = self.tokens[self.pos]
-        else:
-            self.error(f"Esperava token '{token_type}'")
-
-    # --- Regras da Gramática (Métodos) ---
-
-    def parse_program(self):
-        self._enter_rule("programa")
-        try:
-            self.eat('PROGRAM')
-            self.eat('ID')
-            self.eat('SEMI')
-            
-            if self.current_token[0] == 'VAR':
-                self.parse_declaracoes()
-                
-            self.eat('BEGIN')
-            self.parse_lista_comandos()
-            self.eat('END')
-            self.eat('DOT')
-        finally:
-            self._exit_rule("programa")
-
-    def parse_declaracoes(self):
-        self._enter_rule("declarações")
-        try:
-            self.eat('VAR')
-            while self.current_token[0] == 'ID':
-                self.parse_lista_ids()
-                self.eat('COLON')
-                self.parse_tipo()
-                self.eat('SEMI')
-        finally:
-            self._exit_rule("declarações")
-
-    def parse_lista_ids(self):
-        self._enter_rule("lista_ids")
-        try:
-            self.eat('ID')
-            while self.current_token[0] == 'COMMA':
-                self.eat('COMMA')
-                self.eat('ID')
-        finally:
-            self._exit_rule("lista_ids")
-
-    def parse_tipo(self):
-        self._enter_rule("tipo")
-        try:
-            if self.current_token[0] in ('INTEGER', 'BOOLEAN'):
-                self.eat(self.current_token[0])
-            else:
-                self.error("Esperado tipo 'integer' ou 'boolean'")
-        finally:
-            self._exit_rule("tipo")
-
-    def parse_lista_comandos(self):
-        self._enter_rule("lista_comandos")
-        try:
-            self.parse_comando()
-            self.eat('SEMI')
-            
-            first_comando = {'ID', 'READ', 'READLN', 'WRITE', 'WRITELN', 'BEGIN', 'IF', 'WHILE'}
-            while self.current_token[0] in first_comando:
-                self.parse_comando()
-                self.eat('SEMI')
-        finally:
-            self._exit_rule("lista_comandos")
-
-    def parse_comando(self):
-        self._enter_rule("comando")
-        try:
-            token_type = self.current_token[0]
-            if token_type == 'ID':
-                self.parse_atribuicao()
-            elif token_type in ('READ', 'READLN'):
-                self.parse_leitura()
-            elif token_type in ('WRITE', 'WRITELN'):
-                self.parse_escrita()
-            elif token_type == 'BEGIN':
-                self.parse_composto()
-            elif token_type == 'IF':
-                self.parse_condicional()
-            elif token_type == 'WHILE':
-                self.parse_repeticao()
-            else:
-                self.error("Comando não reconhecido")
-        finally:
-            self._exit_rule("comando")
-
-    def parse_atribuicao(self):
-        self._enter_rule("atribuição")
-        try:
-            self.eat('ID')
-            self.eat('ASSIGN')
-            self.parse_expr()
-        finally:
-            self._exit_rule("atribuição")
-
-    def parse_leitura(self):
-        self._enter_rule("leitura")
-        try:
-            if self.current_token[0] == 'READ':
-                self.eat('READ')
-                self.eat('LPAREN')
-                self.parse_lista_ids()
-                self.eat('RPAREN')
-            elif self.current_token[0] == 'READLN':
-                self.eat('READLN')
-                if self.current_token[0] == 'LPAREN':
-                    self.eat('LPAREN')
-                    self.parse_lista_ids()
-                    self.eat('RPAREN')
-        finally:
-            self._exit_rule("leitura")
-
-    def parse_escrita(self):
-        self._enter_rule("escrita")
-        cmd = self.current_token[0]
-        try:
-            self.eat(cmd)
-            if self.current_token[0] == 'LPAREN':
-                self.eat('LPAREN')
-                self.parse_lista_stringvar()
-                self.eat('RPAREN')
-        finally:
-            self._exit_rule("escrita")
-
-    def parse_lista_stringvar(self):
-        self._enter_rule("lista_stringvar")
-        try:
-            self.parse_stringvar()
-            while self.current_token[0] == 'COMMA':
-                self.eat('COMMA')
-                self.parse_stringvar()
-        finally:
-            self._exit_rule("lista_stringvar")
-
-    def parse_stringvar(self):
-        # Não logaremos enter/exit aqui para não poluir muito, pois é muito simples
-        if self.current_token[0] == 'STRING':
-            self.eat('STRING')
-        else:
-            self.parse_expr()
-
-    def parse_composto(self):
-        self._enter_rule("composto")
-        try:
-            self.eat('BEGIN')
-            self.parse_lista_comandos()
-            self.eat('END')
-        finally:
-            self._exit_rule("composto")
-
-    def parse_condicional(self):
-        self._enter_rule("condicional")
-        try:
-            self.eat('IF')
-            self.parse_exprboolean()
-            self.eat('THEN')
-            self.parse_comando()
-            if self.current_token[0] == 'ELSE':
-                self.eat('ELSE')
-                self.parse_comando()
-        finally:
-            self._exit_rule("condicional")
-
-    def parse_repeticao(self):
-        self._enter_rule("repetição")
-        try:
-            self.eat('WHILE')
-            self.parse_exprboolean()
-            self.eat('DO')
-            self.parse_comando()
-        finally:
-            self._exit_rule("repetição")
-
-    def parse_exprboolean(self):
-        self._enter_rule("expr_boolean")
-        try:
-            self.parse_expr()
-            ops_relacionais = {'LESS', 'LE_EQ', 'GREATER', 'GE_EQ', 'EQUAL', 'NE_EQ'}
-            if self.current_token[0] in ops_relacionais:
-                self.eat(self.current_token[0])
-                self.parse_expr()
-        finally:
-            self._exit_rule("expr_boolean")
-
-    def parse_expr(self):
-        self._enter_rule("expressão")
-        try:
-            self.parse_termo()
-            while self.current_token[0] in ('PLUS', 'MINUS'):
-                self.eat(self.current_token[0])
-                self.parse_termo()
-        finally:
-            self._exit_rule("expressão")
 
-    def parse_termo(self):
-        self._enter_rule("termo")
-        try:
-            self.parse_fator()
-            while self.current_token[0] in ('TIMES', 'DIVIDE'):
-                self.eat(self.current_token[0])
-                self.parse_fator()
-        finally:
-            self._exit_rule("termo")
+# A linha de comando não usa a interface web: é atendida pelo nucleo.py antes
+# de o Flask ser importado
+if __name__ == "__main__" and "--cli" in sys.argv[1:]:
+    import nucleo
+    sys.exit(nucleo.main([a for a in sys.argv[1:] if a != "--cli"], prog="app.py --cli"))
 
-    def parse_fator(self):
-        self._enter_rule("fator")
-        try:
-            token = self.current_token
-            if token[0] in ('PLUS', 'MINUS'):
-                self.eat(token[0])
-                self.parse_fator()
-            elif token[0] == 'LPAREN':
-                self.eat('LPAREN')
-                self.parse_expr()
-                self.eat('RPAREN')
-            elif token[0] == 'ID':
-                self.eat('ID')
-            elif token[0] == 'NUMBER':
-                self.eat('NUMBER')
-            elif token[0] in ('TRUE', 'FALSE'):
-                self.eat(token[0])
-            else:
-                self.error("Fator inesperado")
-        finally:
-            self._exit_rule("fator")
+import io
+import json
+import os
+import threading
+import zipfile
+from flask import Flask, render_template, request, jsonify, stream_with_context, url_for
+import leitor_docx
+import linguagem
+# O lexer e o Parser ficam no nucleo.py; os nomes continuam disponíveis aqui
+# para quem importava do app.py
+from nucleo import (
+    Parser, ParserIterativo, ParserRecuperacao, analisar_arvore, analisar_diagnosticos,
+    analisar_execucao, analisar_lexico, analisar_sintaxe, get_automato, lexer, lexer_dfa, lexer_regex,
+    lexer_stream, lexer_stream_posicoes, nomes_tipos, palavras_reservadas,
+    token_specification, tokenizar,
+)
+from cache import CacheResultados, versao_do_codigo
+from perfil import Perfil, perfilar
+from incremental import Documentos
+import lote
+from trabalhos import (
+    FILA_PADRAO, TEMPO_LIMITE_PADRAO, FalhaNoTrabalho, FilaCheia, GerenciadorTrabalhos,
+    TempoEsgotado,
+)
 
 # ==============================================================================
-# 3. INTERFACE WEB
+# INTERFACE WEB
 # ==============================================================================
 
 app = Flask(__name__)
@@ -357,120 +49,556 @@ def lexico():
 def sintatico():
     return render_template('sintatico.html')
 
+def ler_upload(f):
+    # Devolve o texto do arquivo enviado ou None se o tipo não é suportado
+    filename = f.filename
+    if filename.lower().endswith('.txt'):
+        return f.stream.read().decode('utf-8', errors='ignore')
+    elif filename.lower().endswith('.docx'):
+        # Texto direto do XML do documento (ver leitor_docx.py)
+        return leitor_docx.extrair_texto(f.stream)
+    return None
+
+# --- Cache de resultados (ver cache.py) ---
+
+cache = CacheResultados(
+    max_entradas=int(os.environ.get("ANALISADOR_CACHE_ENTRADAS", 1024)),
+    max_bytes=int(os.environ.get("ANALISADOR_CACHE_BYTES", 64 * 1024 * 1024)),
+    diretorio=os.environ.get("ANALISADOR_CACHE_DIR") or None,
+    # Módulos que definem o conteúdo das respostas guardadas
+    versao=versao_do_codigo("app", "nucleo", "arvore", "compilador", "linhas", "token_stream",
+                            "automato", "linguagem"),
+)
+
+def resposta_em_cache(endpoint, code, calcular, *opcoes):
+    chave = cache.chave(endpoint, code, *opcoes)
+    corpo = cache.get(chave)
+    if corpo is None:
+        corpo = (app.json.dumps(calcular()) + "\n").encode('utf-8')
+        cache.put(chave, corpo)
+    return app.response_class(corpo, mimetype="application/json")
+
+# --- Pool de análises e modo de produção (ver trabalhos.py) ---
+#
+# Em modo de produção (python app.py --producao) as análises das rotas
+# síncronas (inclusive as partes de um /batch_parse) rodam no pool de
+# processos, com fila limitada (fila cheia: 503 com Retry-After) e tempo
+# limite por análise (504). No servidor de
+# desenvolvimento rodam na própria thread da requisição. A API /jobs usa o
+# pool nos dois modos; ele é criado no primeiro uso.
+
+_trabalhos = None
+_trabalhos_lock = threading.Lock()
+
+def trabalhos(workers=None, max_fila=None, tempo_limite=None):
+    global _trabalhos
+    with _trabalhos_lock:
+        if _trabalhos is None:
+            _trabalhos = GerenciadorTrabalhos(
+                workers=workers or int(os.environ.get("ANALISADOR_WORKERS", 0)) or None,
+                max_fila=max_fila or int(os.environ.get("ANALISADOR_FILA", FILA_PADRAO)),
+                tempo_limite=tempo_limite or float(os.environ.get("ANALISADOR_TEMPO_LIMITE",
+                                                                  TEMPO_LIMITE_PADRAO)))
+        return _trabalhos
+
+# --- Perfil das análises (ver perfil.py) ---
+#
+# Com ANALISADOR_PERFIL=1 (ou --perfil no modo de produção) cada análise que
+# passa por executar() é medida por regra da gramática e por tipo de token, e
+# /stats devolve a soma. Respostas vindas do cache não rodam análise nenhuma,
+# então não entram no perfil. Desligado, nada é medido.
+
+app.config["ANALISADOR_PERFIL"] = os.environ.get("ANALISADOR_PERFIL", "") not in ("", "0")
+perfil_servidor = Perfil()
+_perfil_lock = threading.Lock()
+
+def executar(funcao, *args):
+    if app.config.get("ANALISADOR_PERFIL"):
+        # A análise roda com o perfil ligado (no pool ou aqui) e o perfil dela
+        # é somado ao do servidor (ver /stats)
+        args = (funcao, *args)
+        funcao = perfilar
+    if app.config.get("ANALISADOR_PRODUCAO"):
+        resultado = trabalhos().executar(funcao, *args)
+    else:
+        resultado = funcao(*args)
+    if funcao is perfilar:
+        resultado, dados = resultado
+        with _perfil_lock:
+            perfil_servidor.somar(dados)
+    return resultado
+
+@app.errorhandler(FilaCheia)
+def fila_cheia(e):
+    return jsonify({"error": str(e)}), 503, {"Retry-After": "1"}
+
+@app.errorhandler(TempoEsgotado)
+def tempo_esgotado(e):
+    return jsonify({"error": str(e)}), 504
+
+@app.errorhandler(FalhaNoTrabalho)
+def falha_no_trabalho(e):
+    return jsonify({"error": str(e)}), 500
+
+@app.errorhandler(413)
+def grande_demais(e):
+    limite = app.config.get("MAX_CONTENT_LENGTH")
+    return jsonify({"error": f"Requisição maior que o limite de {limite} bytes"}), 413
+
+# --- Respostas em fluxo ---
+#
+# Com "stream" a lista de tokens não é montada: os tokens saem do lexer em
+# lotes e cada lote é serializado e enviado assim que fica pronto (resposta
+# chunked, fora do cache de resultados).
+#   "ndjson": um objeto por linha: o cabeçalho (filename/content no /upload,
+#             "kinds" no formato compacto), {"tokens": [...]} por lote e, no
+#             fim, {"done": true, "count": n} ou {"error": ..., "line": ...};
+#   "json":   o mesmo documento da resposta normal, gerado aos pedaços (um
+#             erro léxico no meio vira o campo "error" no fim do documento).
+# format="compact" troca [tipo, valor] pela lista plana [código, distância,
+# comprimento, ...] de analisar_lexico().
+
+FLUXOS = ("ndjson", "json")
+FORMATOS = ("full", "compact")
+LOTE_FLUXO = 8192
+
+def opcoes_de_saida(data):
+    stream = data.get('stream') or None
+    formato = data.get('format') or "full"
+    if stream is not None and stream not in FLUXOS:
+        raise ValueError(f"Modo de fluxo desconhecido: {stream}")
+    if formato not in FORMATOS:
+        raise ValueError(f"Formato desconhecido: {formato}")
+    return stream, formato
+
+def _json(obj):
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+
+def tokens_em_lotes(fonte, dialeto, formato):
+    # Listas de até LOTE_FLUXO tokens, já no formato da resposta, direto do
+    # lexer em fluxo (fonte: str ou arquivo texto). Um erro léxico só é
+    # repassado depois do lote com os tokens anteriores a ele
+    lote = []
+    try:
+        if formato == "compact":
+            eof = nomes_tipos(dialeto).index("EOF")
+            anterior = 0
+            for k, inicio, fim, _ in lexer_stream_posicoes(fonte, dialeto=dialeto):
+                if k == eof:
+                    break
+                lote += (k, inicio - anterior, fim - inicio)
+                anterior = fim
+                if len(lote) >= 3 * LOTE_FLUXO:
+                    yield lote
+                    lote = []
+        else:
+            for kind, value, _ in lexer_stream(fonte, dialeto=dialeto):
+                if kind == 'EOF':
+                    break
+                lote.append([kind, value])
+                if len(lote) >= LOTE_FLUXO:
+                    yield lote
+                    lote = []
+    except SyntaxError:
+        if lote:
+            yield lote
+        raise
+    if lote:
+        yield lote
+
+def resposta_em_fluxo(stream, lotes, formato, dialeto, cabecalho=None):
+    cabecalho = dict(cabecalho or {})
+    largura = 1
+    if formato == "compact":
+        cabecalho["kinds"] = nomes_tipos(dialeto)
+        largura = 3
+    if stream == "ndjson":
+        return app.response_class(stream_with_context(_ndjson(lotes, cabecalho, largura)),
+                                  mimetype="application/x-ndjson")
+    return app.response_class(stream_with_context(_json_em_partes(lotes, cabecalho)),
+                              mimetype="application/json")
+
+def _erro_em_fluxo(e):
+    return {"error": str(e), "line": getattr(e, 'linha', None)}
+
+def _ndjson(lotes, cabecalho, largura):
+    if cabecalho:
+        yield _json(cabecalho) + "\n"
+    total = 0
+    try:
+        for lote in lotes:
+            total += len(lote) // largura
+            yield '{"tokens":' + _json(lote) + "}\n"
+    except SyntaxError as e:
+        yield _json(_erro_em_fluxo(e)) + "\n"
+        return
+    yield _json({"done": True, "count": total}) + "\n"
+
+def _json_em_partes(lotes, cabecalho):
+    # {<cabeçalho>, "tokens": [...]} com os colchetes de cada lote removidos
+    # para formar uma única lista
+    yield _json(cabecalho)[:-1] + ("," if cabecalho else "") + '"tokens":['
+    primeiro = True
+    try:
+        for lote in lotes:
+            yield ("" if primeiro else ",") + _json(lote)[1:-1]
+            primeiro = False
+    except SyntaxError as e:
+        yield "]," + _json(_erro_em_fluxo(e))[1:]
+        return
+    yield "]}"
+
+def obter_dialeto(nome, analisavel=False):
+    # Dialeto pedido pelo cliente; ValueError com a mensagem de erro se não
+    # existir ou (para as rotas sintáticas) se o Parser não o entende
+    d = linguagem.obter(nome)
+    if analisavel and not d.analisavel:
+        raise ValueError(f"O dialeto '{d.nome}' não tem analisador sintático")
+    return d
+
+# --- Endpoints ---
+
+@app.route('/dialects', methods=['GET'])
+def dialects():
+    return jsonify([{"name": d.nome, "version": d.versao, "hash": d.hash,
+                     "parser": d.analisavel, "description": d.descricao,
+                     "default": d.nome == linguagem.PADRAO}
+                    for d in linguagem.DIALETOS.values()])
+
 @app.route('/analyze', methods=['POST'])
 def analyze():
-    data = request.get_json(force=True)
-    code = data.get('code', '')
-    tokens = []
-    for t in lexer(code):
-        if t[0] == 'EOF':
-            continue
-        tokens.append([t[0], t[1]])
-    return jsonify({"tokens": tokens})
+    # O código vem em JSON ({"code": ...} mais as opções) ou como text/plain,
+    # com as opções na query string; nesse caso, com "stream", o corpo é lido
+    # em blocos e nunca fica inteiro na memória
+    texto_puro = request.mimetype == 'text/plain'
+    data = request.args if texto_puro else request.get_json(force=True)
+    try:
+        d = obter_dialeto(data.get('dialect'))
+        stream, formato = opcoes_de_saida(data)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    if stream:
+        if texto_puro:
+            fonte = io.TextIOWrapper(request.stream, encoding='utf-8', errors='ignore')
+        else:
+            fonte = data.get('code', '')
+        return resposta_em_fluxo(stream, tokens_em_lotes(fonte, d.nome, formato), formato,
+                                 d.nome)
+    code = request.get_data(as_text=True) if texto_puro else data.get('code', '')
+    return resposta_em_cache("analyze", code, lambda: executar(analisar_lexico, code, d.nome, formato),
+                             d.hash, formato)
 
 @app.route('/upload', methods=['POST'])
 def upload():
     f = request.files.get('file')
     if not f:
         return jsonify({"success": False, "error": "Arquivo não enviado"}), 400
-    filename = f.filename
-    if filename.lower().endswith('.txt'):
-        content = f.stream.read().decode('utf-8', errors='ignore')
-    elif filename.lower().endswith('.docx'):
-        doc = Document(f)
-        content = "\n".join(p.text for p in doc.paragraphs)
-    else:
+    try:
+        d = obter_dialeto(request.form.get('dialect'))
+        stream, formato = opcoes_de_saida(request.form)
+    except ValueError as e:
+        return jsonify({"success": False, "error": str(e)}), 400
+    # include_content=0 não devolve o texto do arquivo na resposta
+    incluir_conteudo = request.form.get('include_content', '1').lower() not in ('0', 'false', 'no')
+    nome = f.filename.lower()
+    if stream and not incluir_conteudo and nome.endswith(('.txt', '.docx')):
+        # Sem eco do conteúdo: os tokens saem do arquivo enviado em blocos (no
+        # .docx, parágrafo a parágrafo, à medida que o XML é lido)
+        if nome.endswith('.docx'):
+            fonte = leitor_docx.FonteDocx(f.stream)
+        else:
+            fonte = io.TextIOWrapper(f.stream, encoding='utf-8', errors='ignore')
+        return resposta_em_fluxo(stream, tokens_em_lotes(fonte, d.nome, formato), formato,
+                                 d.nome, {"success": True, "filename": f.filename})
+    content = ler_upload(f)
+    if content is None:
         return jsonify({"success": False, "error": "Tipo de arquivo não suportado"}), 400
-    tokens = []
-    for t in lexer(content):
-        if t[0] == 'EOF':
-            continue
-        tokens.append([t[0], t[1]])
-    return jsonify({"success": True, "filename": filename, "content": content, "tokens": tokens})
+    cabecalho = {"success": True, "filename": f.filename}
+    if incluir_conteudo:
+        cabecalho["content"] = content
+    if stream:
+        return resposta_em_fluxo(stream, tokens_em_lotes(content, d.nome, formato), formato,
+                                 d.nome, cabecalho)
+    return jsonify({**cabecalho, **executar(analisar_lexico, content, d.nome, formato)})
 
 @app.route('/parse', methods=['POST'])
 def parse():
     data = request.get_json(force=True)
     code = data.get('code', '')
-    buf = io.StringIO()
-    valid = True
-    message = ""
-    
+    trace = data.get('trace', 'text')
     try:
-        tokens = list(lexer(code))
-        with contextlib.redirect_stdout(buf):
-            p = Parser(tokens)
-            p.parse_program()
-        message = "Código válido"
-    except SyntaxError as e:
-        valid = False
-        message = str(e)
-    logs = buf.getvalue().splitlines()
-    
-    if not valid:
-        logs.append("-" * 40)
-        logs.append("FALHA ENCONTRADA:")
-        logs.extend(message.split('\n'))
-        logs.append("-" * 40)
-    return jsonify({"valid": valid, "message": message, "logs": logs})
+        d = obter_dialeto(data.get('dialect'), analisavel=True)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    if data.get('recover'):
+        # Todos os erros de uma vez, sem rastro
+        return resposta_em_cache("parse_recover", code,
+                                 lambda: executar(analisar_diagnosticos, code, d.nome), d.hash)
+    if trace not in ('text', 'compact', 'off'):
+        return jsonify({"error": f"Modo de rastro desconhecido: {trace}"}), 400
+    return resposta_em_cache("parse", code, lambda: executar(analisar_sintaxe, code, trace, d.nome),
+                             trace, d.hash)
+
+@app.route('/ast', methods=['POST'])
+def ast():
+    data = request.get_json(force=True)
+    code = data.get('code', '')
+    try:
+        d = obter_dialeto(data.get('dialect'), analisavel=True)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    return resposta_em_cache("ast", code, lambda: executar(analisar_arvore, code, d.nome), d.hash)
+
+# --- Execução dos programas (ver compilador.py) ---
+#
+# O cliente pode pedir um limite de instruções menor que o do servidor
+# (ANALISADOR_MAX_INSTRUCOES, padrão: o de compilador.py), nunca maior.
+
+app.config["ANALISADOR_MAX_INSTRUCOES"] = int(os.environ.get("ANALISADOR_MAX_INSTRUCOES", 0)) or None
+
+def opcoes_de_execucao(data):
+    # (entrada, limite de instruções); ValueError se forem inválidas
+    from compilador import MAX_INSTRUCOES
+    entrada = data.get('input', '')
+    if not isinstance(entrada, str):
+        raise ValueError("'input' deve ser um texto")
+    limite = app.config.get("ANALISADOR_MAX_INSTRUCOES") or MAX_INSTRUCOES
+    pedido = data.get('max_instructions')
+    if pedido is not None:
+        if not isinstance(pedido, int) or isinstance(pedido, bool) or pedido < 1:
+            raise ValueError("'max_instructions' deve ser um inteiro positivo")
+        limite = min(limite, pedido)
+    return entrada, limite
+
+@app.route('/run', methods=['POST'])
+def run():
+    data = request.get_json(force=True)
+    code = data.get('code', '')
+    try:
+        d = obter_dialeto(data.get('dialect'), analisavel=True)
+        entrada, limite = opcoes_de_execucao(data)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    return resposta_em_cache("run", code,
+                             lambda: executar(analisar_execucao, code, entrada, d.nome, limite),
+                             entrada, limite, d.hash)
 
 @app.route('/upload_parse', methods=['POST'])
 def upload_parse():
     f = request.files.get('file')
     if not f:
         return jsonify({"success": False, "error": "Arquivo não enviado"}), 400
-    filename = f.filename
-    if filename.lower().endswith('.txt'):
-        content = f.stream.read().decode('utf-8', errors='ignore')
-    elif filename.lower().endswith('.docx'):
-        doc = Document(f)
-        content = "\n".join(p.text for p in doc.paragraphs)
-    else:
+    try:
+        d = obter_dialeto(request.form.get('dialect'), analisavel=True)
+    except ValueError as e:
+        return jsonify({"success": False, "error": str(e)}), 400
+    content = ler_upload(f)
+    if content is None:
+        return jsonify({"success": False, "error": "Tipo de arquivo não suportado"}), 400
+    return jsonify({"success": True, "filename": f.filename, "content": content,
+                    **executar(analisar_sintaxe, content, 'text', d.nome)})
+
+# --- Análise léxica incremental (ver incremental.py) ---
+
+documentos = Documentos(get_automato, palavras_reservadas)
+
+@app.route('/analyze_incremental', methods=['POST'])
+def analyze_incremental():
+    # {"doc_id", "code"} abre/recarrega o documento e devolve todos os tokens;
+    # {"doc_id", "version", "edit": {"offset", "deleted", "inserted"}} aplica
+    # uma edição e devolve só o trecho que mudou: os "deleted" tokens a partir
+    # de "start" devem ser trocados por "tokens"
+    data = request.get_json(force=True)
+    doc_id = data.get('doc_id')
+    if not doc_id:
+        return jsonify({"error": "doc_id não informado"}), 400
+    if 'code' in data:
+        doc = documentos.abrir(doc_id, data['code'])
+        with doc.lock:
+            return jsonify({"version": doc.version, "start": 0, "deleted": 0,
+                            "tokens": doc.tokens(), "error": doc.erro()})
+    doc = documentos.get(doc_id)
+    if doc is None:
+        return jsonify({"error": "Documento desconhecido, reenvie o código completo"}), 409
+    edit = data.get('edit') or {}
+    with doc.lock:
+        if data.get('version') != doc.version:
+            return jsonify({"error": "Versão desatualizada, reenvie o código completo"}), 409
+        try:
+            start, deleted, tokens = doc.aplicar_edicao(
+                int(edit.get('offset', 0)), int(edit.get('deleted', 0)), edit.get('inserted', ''))
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        return jsonify({"version": doc.version, "start": start, "deleted": deleted,
+                        "tokens": tokens, "error": doc.erro()})
+
+@app.route('/batch_parse', methods=['POST'])
+def batch_parse():
+    # Vários arquivos no campo "files" (.txt, .docx ou .zip com eles),
+    # validados em paralelo no pool de processos (ver lote.py)
+    arquivos = request.files.getlist('files') or request.files.getlist('file')
+    if not arquivos:
+        return jsonify({"success": False, "error": "Arquivo não enviado"}), 400
+    itens = []
+    try:
+        for f in arquivos:
+            dados = f.stream.read()
+            if f.filename.lower().endswith('.zip'):
+                itens.extend(lote.itens_de_zip(dados, prefixo=f.filename + ':'))
+            elif f.filename.lower().endswith(lote.EXTENSOES):
+                itens.append((f.filename, dados))
+    except (ValueError, zipfile.BadZipFile) as e:
+        return jsonify({"success": False, "error": str(e)}), 400
+    if not itens:
         return jsonify({"success": False, "error": "Tipo de arquivo não suportado"}), 400
-    buf = io.StringIO()
-    valid = True
-    message = ""
-    
+    if app.config.get("ANALISADOR_PRODUCAO"):
+        # No pool limitado, como as outras análises: uma parte do lote por
+        # worker, com a mesma fila (503) e o tempo limite por parte (504)
+        g = trabalhos()
+        resultados, resumo = lote.analisar_lote(
+            itens, workers=min(g.workers, g.max_fila or g.workers), mapear=g.mapear)
+    else:
+        resultados, resumo = lote.analisar_lote(itens)
+    return jsonify({"success": True, "results": resultados, **resumo})
+
+@app.route('/cache/stats', methods=['GET'])
+def cache_stats():
+    return jsonify(cache.stats())
+
+@app.route('/stats', methods=['GET'])
+def stats():
+    with _perfil_lock:
+        dados = perfil_servidor.dados()
+    return jsonify({"enabled": bool(app.config.get("ANALISADOR_PERFIL")), **dados})
+
+@app.route('/stats', methods=['DELETE'])
+def stats_reset():
+    global perfil_servidor
+    with _perfil_lock:
+        perfil_servidor = Perfil()
+    return jsonify({"enabled": bool(app.config.get("ANALISADOR_PERFIL"))})
+
+# --- Trabalhos assíncronos: submissão + consulta ---
+
+def preparar_trabalho(data):
+    # (função, argumentos) do trabalho pedido; ValueError se for inválido
+    tipo = data.get('kind', 'parse')
+    code = data.get('code', '')
+    if tipo == 'analyze':
+        formato = data.get('format', 'full')
+        if formato not in FORMATOS:
+            raise ValueError(f"Formato desconhecido: {formato}")
+        return analisar_lexico, (code, obter_dialeto(data.get('dialect')).nome, formato)
+    if tipo not in ('parse', 'diagnostics', 'ast', 'run'):
+        raise ValueError(f"Tipo de trabalho desconhecido: {tipo}")
+    d = obter_dialeto(data.get('dialect'), analisavel=True)
+    if tipo == 'diagnostics':
+        return analisar_diagnosticos, (code, d.nome)
+    if tipo == 'ast':
+        return analisar_arvore, (code, d.nome)
+    if tipo == 'run':
+        entrada, limite = opcoes_de_execucao(data)
+        return analisar_execucao, (code, entrada, d.nome, limite)
+    trace = data.get('trace', 'text')
+    if trace not in ('text', 'compact', 'off'):
+        raise ValueError(f"Modo de rastro desconhecido: {trace}")
+    return analisar_sintaxe, (code, trace, d.nome)
+
+@app.route('/jobs', methods=['POST'])
+def jobs_submit():
+    # {"kind": "analyze"|"parse"|"diagnostics"|"ast"|"run", "code", ...opções da
+    # rota correspondente}: 202 com o id; o resultado sai em GET /jobs/<id>
     try:
-        tokens = list(lexer(content))
-        with contextlib.redirect_stdout(buf):
-            p = Parser(tokens)
-            p.parse_program()
-        message = "Código válido"
-    except SyntaxError as e:
-        valid = False
-        message = str(e)
-        
-    logs = buf.getvalue().splitlines()
-    if not valid:
-        logs.append("-" * 40)
-        logs.append("FALHA ENCONTRADA:")
-        logs.extend(message.split('\n'))
-        logs.append("-" * 40)
-
-    return jsonify({"success": True, "filename": filename, "content": content, "valid": valid, "message": message, "logs": logs})
+        funcao, args = preparar_trabalho(request.get_json(force=True))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    trabalho = trabalhos().submeter(funcao, *args)
+    url = url_for('jobs_status', id_trabalho=trabalho.id)
+    return jsonify({"id": trabalho.id, "status": trabalho.estado, "url": url}), 202, {"Location": url}
+
+@app.route('/jobs/<id_trabalho>', methods=['GET'])
+def jobs_status(id_trabalho):
+    # ?wait=N espera até N segundos (no máximo 30) o trabalho terminar
+    trabalho = trabalhos().obter(id_trabalho)
+    if trabalho is None:
+        return jsonify({"error": "Trabalho desconhecido ou expirado"}), 404
+    try:
+        espera = min(float(request.args.get('wait', 0)), 30.0)
+    except ValueError:
+        return jsonify({"error": "wait deve ser um número de segundos"}), 400
+    if espera > 0:
+        trabalho.esperar(espera)
+    return jsonify(trabalho.para_json())
+
+@app.route('/jobs/<id_trabalho>', methods=['DELETE'])
+def jobs_cancel(id_trabalho):
+    trabalho = trabalhos().cancelar(id_trabalho)
+    if trabalho is None:
+        return jsonify({"error": "Trabalho desconhecido ou expirado"}), 404
+    if not trabalho.cancelado:
+        return jsonify({"error": "O trabalho já terminou", **trabalho.para_json()}), 409
+    # Um trabalho que estava rodando termina (processo morto) logo em seguida
+    trabalho.esperar(1)
+    return jsonify(trabalho.para_json())
+
+@app.route('/jobs', methods=['GET'])
+def jobs_stats():
+    return jsonify(trabalhos().stats())
 
 # ==============================================================================
-# 3. EXECUÇÃO
+# EXECUÇÃO
 # ==============================================================================
+#
+# python app.py sobe o servidor de desenvolvimento (debug, recarga
+# automática); python app.py --producao sobe o modo de produção; python
+# app.py --cli ... é a linha de comando do nucleo.py (ver lá as opções).
+
+def servir_producao(argv=None):
+    import argparse
+    from werkzeug.serving import make_server
+
+    parser = argparse.ArgumentParser(
+        prog="app.py --producao",
+        description="Servidor sem debug, com as análises no pool de processos.")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=5000)
+    parser.add_argument("--workers", type=int, default=int(os.environ.get("ANALISADOR_WORKERS", 0)),
+                        help="processos de análise (padrão: um por CPU)")
+    parser.add_argument("--fila", type=int, default=int(os.environ.get("ANALISADOR_FILA", FILA_PADRAO)),
+                        help="análises esperando um processo antes de recusar com 503")
+    parser.add_argument("--tempo-limite", type=float,
+                        default=float(os.environ.get("ANALISADOR_TEMPO_LIMITE", TEMPO_LIMITE_PADRAO)),
+                        help="segundos por análise antes de o processo ser morto (504)")
+    parser.add_argument("--max-bytes", type=int,
+                        default=int(os.environ.get("ANALISADOR_MAX_BYTES", 32 * 1024 * 1024)),
+                        help="tamanho máximo de uma requisição (413)")
+    parser.add_argument("--perfil", action="store_true",
+                        default=app.config["ANALISADOR_PERFIL"],
+                        help="mede cada análise por regra e por tipo de token (ver /stats)")
+    args = parser.parse_args(argv)
+
+    app.config.update(ANALISADOR_PRODUCAO=True, MAX_CONTENT_LENGTH=args.max_bytes,
+                      ANALISADOR_PERFIL=args.perfil)
+    # Os processos de análise sobem antes das threads do servidor
+    gerenciador = trabalhos(args.workers or None, args.fila, args.tempo_limite)
+    servidor = make_server(args.host, args.port, app, threaded=True)
+    print(f" * Modo de produção em http://{args.host}:{servidor.server_port} "
+          f"({gerenciador.workers} workers, fila de {args.fila}, "
+          f"limite de {args.tempo_limite:g} s)", flush=True)
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        servidor.server_close()
+        gerenciador.fechar()
+        lote.fechar()
 
 if __name__ == "__main__":
-    if "--cli" in sys.argv:
-        print("Digite o nome do arquivo que deseja ler: ")
-        nome_arquivo = input()
-        try:
-            with open(nome_arquivo, 'r', encoding='utf-8') as file:
-                codigo = file.read()
-            tokens_gerados = list(lexer(codigo))
-            parser = Parser(tokens_gerados)
-            parser.parse_program()
-            print("RESULTADO: O CÓDIGO FONTE É VÁLIDO.")
-        except FileNotFoundError:
-            print(f"Erro: Arquivo '{nome_arquivo}' não encontrado.")
-        except SyntaxError as e:
-            print(f"\n[FALHA NA ANÁLISE] O código é INVÁLIDO.")
-            print(e)
-        except Exception as e:
-            print(f"\nErro inesperado: {e}")
+    if "--producao" in sys.argv[1:]:
+        servir_producao([a for a in sys.argv[1:] if a != "--producao"])
     else:
-        app.run(host='0.0.0.0', port=5000, debug=True)
+        try:
+            app.run(host='0.0.0.0', port=5000, debug=True)
+        finally:
+            lote.fechar()
@@ -0,0 +1,307 @@
+import struct
+import sys
+from array import array
+
+# ==============================================================================
+# ÁRVORE SINTÁTICA ABSTRATA EM ARENA
+# ==============================================================================
+#
+# O Parser (modo trace="ast") monta a árvore pelos mesmos ganchos de log: cada
+# regra, ao terminar, reduz os nós e tokens que produziu a um nó da AST
+# (atribuição, operação binária, if, while...). Os nós não são objetos: ficam
+# em arrays paralelos (tipo, token, primeiro filho, próximo irmão), ~13 bytes
+# por nó, e o texto de cada nó é fatiado da fonte só quando alguém pede.
+#
+# Serialização: para_json() gera uma forma plana (sem aninhamento, então não
+# há limite de profundidade), aninhado() gera listas [tipo, valor, filhos...]
+# e para_bytes()/de_bytes() uma forma binária autocontida.
+
+TIPOS = (
+    "PROGRAMA",     # token: nome do programa; filhos: DECLARACAO..., BLOCO
+    "DECLARACAO",   # token: tipo (integer/boolean); filhos: VARIAVEL...
+    "BLOCO",        # token: begin; filhos: comandos
+    "ATRIBUICAO",   # token: variável; filho: expressão
+    "LEITURA",      # token: read/readln; filhos: VARIAVEL...
+    "ESCRITA",      # token: write/writeln; filhos: TEXTO ou expressões
+    "SE",           # token: if; filhos: condição, então, [senão]
+    "ENQUANTO",     # token: while; filhos: condição, corpo
+    "BINARIO",      # token: operador; filhos: esquerda, direita
+    "UNARIO",       # token: + ou -; filho: operando
+    "VARIAVEL",
+    "NUMERO",
+    "BOOLEANO",
+    "TEXTO",
+)
+(PROGRAMA, DECLARACAO, BLOCO, ATRIBUICAO, LEITURA, ESCRITA, SE, ENQUANTO,
+ BINARIO, UNARIO, VARIAVEL, NUMERO, BOOLEANO, TEXTO) = range(len(TIPOS))
+
+# Forma binária (little-endian): cabeçalho, tipos (1 byte por nó), token,
+# primeiro filho e próximo irmão (int32), offsets dos textos (uint32, n + 1)
+# e os textos em UTF-8
+MAGICO = b"ARV1"
+_CABECALHO = struct.Struct("<4sIi")
+
+
+class Arvore:
+    def __init__(self, tokens=None):
+        self.tokens = tokens
+        self.tipos = array('B')
+        self.token = array('i')
+        self.filho = array('i')
+        self.irmao = array('i')
+        self.raiz = -1
+        self._valores = None  # textos dos nós, quando carregada de bytes
+
+    def novo(self, tipo, token, filhos=()):
+        i = len(self.tipos)
+        self.tipos.append(tipo)
+        self.token.append(token)
+        self.irmao.append(-1)
+        if filhos:
+            self.filho.append(filhos[0])
+            irmao = self.irmao
+            for a, b in zip(filhos, filhos[1:]):
+                irmao[a] = b
+        else:
+            self.filho.append(-1)
+        return i
+
+    def __len__(self):
+        return len(self.tipos)
+
+    # --- Acesso ---
+    def tipo(self, i):
+        return TIPOS[self.tipos[i]]
+
+    def valor(self, i):
+        if self._valores is not None:
+            return self._valores[i]
+        tokens = self.tokens
+        j = self.token[i]
+        if hasattr(tokens, 'value'):
+            return tokens.value(j)
+        return tokens[j][1]
+
+    def linha(self, i):
+        if self.tokens is None:
+            return None
+        tokens = self.tokens
+        j = self.token[i]
+        if hasattr(tokens, 'line'):
+            return tokens.line(j)
+        return tokens[j][2]
+
+    def filhos(self, i):
+        lista = []
+        c = self.filho[i]
+        while c >= 0:
+            lista.append(c)
+            c = self.irmao[c]
+        return lista
+
+    def nbytes(self):
+        return sum(a.itemsize * len(a) for a in (self.tipos, self.token, self.filho, self.irmao))
+
+    # --- Serialização ---
+    def _todos_os_valores(self):
+        if self._valores is not None:
+            return list(self._valores)
+        return [self.valor(i) for i in range(len(self))]
+
+    def para_json(self):
+        return {
+            "kinds": list(TIPOS),
+            "root": self.raiz,
+            "type": self.tipos.tolist(),
+            "value": self._todos_os_valores(),
+            "first_child": self.filho.tolist(),
+            "next_sibling": self.irmao.tolist(),
+        }
+
+    def aninhado(self, i=None):
+        # [tipo, valor, filho, filho, ...]; montado com pilha explícita para
+        # aguentar árvores profundas
+        i = self.raiz if i is None else i
+        raiz = [self.tipo(i), self.valor(i)]
+        pilha = [(i, raiz)]
+        while pilha:
+            no, lista = pilha.pop()
+            for c in self.filhos(no):
+                sub = [self.tipo(c), self.valor(c)]
+                lista.append(sub)
+                pilha.append((c, sub))
+        return raiz
+
+    def para_bytes(self):
+        textos = [v.encode('utf-8', errors='surrogatepass') for v in self._todos_os_valores()]
+        offsets = array('I', [0])
+        total = 0
+        for t in textos:
+            total += len(t)
+            offsets.append(total)
+        partes = [_CABECALHO.pack(MAGICO, len(self), self.raiz), self.tipos.tobytes()]
+        for a in (self.token, self.filho, self.irmao, offsets):
+            if sys.byteorder == 'big':
+                a = array(a.typecode, a)
+                a.byteswap()
+            partes.append(a.tobytes())
+        partes.extend(textos)
+        return b"".join(partes)
+
+    @classmethod
+    def de_bytes(cls, dados):
+        magico, n, raiz = _CABECALHO.unpack_from(dados, 0)
+        if magico != MAGICO:
+            raise ValueError("Formato de árvore desconhecido")
+        pos = _CABECALHO.size
+        arvore = cls()
+        arvore.raiz = raiz
+        arvore.tipos = array('B', dados[pos:pos + n])
+        pos += n
+        arrays = []
+        for typecode, tamanho in (('i', n), ('i', n), ('i', n), ('I', n + 1)):
+            a = array(typecode)
+            a.frombytes(dados[pos:pos + a.itemsize * tamanho])
+            if sys.byteorder == 'big':
+                a.byteswap()
+            pos += a.itemsize * tamanho
+            arrays.append(a)
+        arvore.token, arvore.filho, arvore.irmao, offsets = arrays
+        blob = dados[pos:]
+        arvore._valores = [blob[offsets[i]:offsets[i + 1]].decode('utf-8', errors='surrogatepass')
+                           for i in range(n)]
+        return arvore
+
+
+class ConstrutorArvore:
+    """Ganchos _enter_rule/_exit_rule/_shift_log que montam a AST.
+
+    Os resultados parciais ficam em uma pilha: nós (>= 0) e tokens
+    consumidos (~índice, sempre < 0). Ao sair de uma regra, tudo o que ela
+    empilhou é reduzido pela função da regra e o resultado volta à pilha.
+    """
+
+    def __init__(self, parser, arvore=None):
+        self.parser = parser
+        tokens = parser.tokens
+        self.arvore = arvore if arvore is not None else Arvore(tokens)
+        if hasattr(tokens, 'kind'):
+            self.kind = tokens.kind
+        else:
+            self.kind = lambda i: tokens[i][0]
+        self.pilha = []
+        self.marcas = []
+        self.redutores = {
+            "programa": self._programa,
+            "declarações": self._declaracoes,
+            "lista_ids": self._lista_ids,
+            "tipo": _mantem,
+            "lista_comandos": _so_nos,
+            "comando": _mantem,
+            "atribuição": self._atribuicao,
+            "leitura": self._com_filhos(LEITURA),
+            "escrita": self._com_filhos(ESCRITA),
+            "lista_stringvar": self._lista_stringvar,
+            "composto": self._com_filhos(BLOCO),
+            "condicional": self._com_filhos(SE),
+            "repetição": self._com_filhos(ENQUANTO),
+            "expr_boolean": self._binario,
+            "expressão": self._binario,
+            "termo": self._binario,
+            "fator": self._fator,
+        }
+
+    # --- Ganchos ---
+    def entrar(self, regra):
+        self.marcas.append(len(self.pilha))
+
+    def consumir(self, token_type):
+        self.pilha.append(~self.parser.pos)
+
+    def sair(self, regra):
+        pilha = self.pilha
+        marca = self.marcas.pop()
+        itens = pilha[marca:]
+        del pilha[marca:]
+        if self.parser.erro is not None:
+            # Regra interrompida por um erro de sintaxe (o gancho roda no
+            # "finally" da regra): a árvore é descartada e o erro original
+            # segue seu caminho. Qualquer outra exceção de um redutor sobe.
+            return
+        pilha.extend(self.redutores[regra](itens))
+        if regra == "programa" and pilha:
+            self.arvore.raiz = pilha[-1]
+
+    # --- Redutores ---
+    def _fator(self, itens):
+        if len(itens) == 1:
+            pos = ~itens[0]
+            kind = self.kind(pos)
+            tipo = VARIAVEL if kind == 'ID' else NUMERO if kind == 'NUMBER' else BOOLEANO
+            return [self.arvore.novo(tipo, pos)]
+        if len(itens) == 3:
+            # "(" expressão ")"
+            return [itens[1]]
+        return [self.arvore.novo(UNARIO, ~itens[0], (itens[1],))]
+
+    def _binario(self, itens):
+        if len(itens) == 1:
+            return itens
+        novo = self.arvore.novo
+        acumulado = itens[0]
+        for i in range(1, len(itens), 2):
+            acumulado = novo(BINARIO, ~itens[i], (acumulado, itens[i + 1]))
+        return [acumulado]
+
+    def _atribuicao(self, itens):
+        return [self.arvore.novo(ATRIBUICAO, ~itens[0], (itens[2],))]
+
+    def _lista_ids(self, itens):
+        novo = self.arvore.novo
+        kind = self.kind
+        return [novo(VARIAVEL, ~x) for x in itens if kind(~x) == 'ID']
+
+    def _lista_stringvar(self, itens):
+        novo = self.arvore.novo
+        kind = self.kind
+        return [x if x >= 0 else novo(TEXTO, ~x)
+                for x in itens if x >= 0 or kind(~x) == 'STRING']
+
+    def _com_filhos(self, tipo):
+        # Nó com o primeiro token da regra e todos os nós produzidos por ela
+        def reduzir(itens):
+            return [self.arvore.novo(tipo, ~itens[0], [x for x in itens if x >= 0])]
+        return reduzir
+
+    def _declaracoes(self, itens):
+        # VAR (VARIAVEL... ":" tipo ";")*
+        novo = self.arvore.novo
+        declaracoes = []
+        variaveis = []
+        esperando_tipo = False
+        for x in itens[1:]:
+            if x >= 0:
+                variaveis.append(x)
+            elif self.kind(~x) == 'COLON':
+                esperando_tipo = True
+            elif esperando_tipo:
+                declaracoes.append(novo(DECLARACAO, ~x, variaveis))
+                variaveis = []
+                esperando_tipo = False
+        return declaracoes
+
+    def _programa(self, itens):
+        # PROGRAM ID ";" DECLARACAO... BEGIN comandos... END "."
+        kind = self.kind
+        inicio = next(i for i, x in enumerate(itens) if x < 0 and kind(~x) == 'BEGIN')
+        declaracoes = [x for x in itens[:inicio] if x >= 0]
+        bloco = self.arvore.novo(BLOCO, ~itens[inicio], [x for x in itens[inicio:] if x >= 0])
+        return [self.arvore.novo(PROGRAMA, ~itens[1], declaracoes + [bloco])]
+
+
+def _mantem(itens):
+    return itens
+
+
+def _so_nos(itens):
+    return [x for x in itens if x >= 0]
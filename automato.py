@@ -0,0 +1,565 @@
+import re
+
+# ==============================================================================
+# AUTÔMATO FINITO DETERMINÍSTICO (DFA) PARA O ANALISADOR LÉXICO
+# ==============================================================================
+#
+# Compila uma lista "token_specification" (nome, regex) em um único autômato
+# determinístico com tabela de transição indexada por classe de caractere.
+# As palavras reservadas são incorporadas ao autômato como literais
+# case-insensitive com prioridade maior que o ID, dispensando o
+# "value.upper() in palavras_reservadas" feito a cada identificador.
+#
+# O subconjunto de regex aceito é o usado pelas especificações do projeto:
+# literais, escapes (\d \w \s \. \* ...), classes [...] e [^...], ".",
+# grupos (...) e (?:...), alternância "|", quantificadores * + ? (inclusive
+# na forma preguiçosa *? +? ??) e \b no início ou no fim do padrão.
+#
+# Semântica: vence o casamento mais longo; em empate, o token que aparece
+# primeiro na especificação. Tokens com quantificador preguiçoso (ex.: o
+# COMMENT "/\*.*?\*/") param no primeiro estado de aceitação, reproduzindo o
+# comportamento do "re".
+
+# --- Alfabeto ---
+# Cada caractere ASCII é um símbolo próprio; os demais caracteres são
+# agrupados nas categorias que importam para \d, \w e \s.
+NA_DIGIT = 128   # dígito decimal não-ASCII (\d e \w)
+NA_WORD = 129    # letra/número não-ASCII (\w)
+NA_SPACE = 130   # espaço não-ASCII (\s)
+NA_OTHER = 131   # qualquer outro caractere não-ASCII
+N_ATOMS = 132
+
+ALL_ATOMS = frozenset(range(N_ATOMS))
+_DIGITS = frozenset(ord(c) for c in "0123456789") | {NA_DIGIT}
+_WORD = (frozenset(ord(c) for c in "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789_")
+         | {NA_DIGIT, NA_WORD})
+_SPACE = frozenset(ord(c) for c in " \t\n\r\f\v") | frozenset(range(0x1c, 0x20)) | {NA_SPACE}
+
+_CLASS_ESCAPES = {
+    'd': _DIGITS, 'D': ALL_ATOMS - _DIGITS,
+    'w': _WORD, 'W': ALL_ATOMS - _WORD,
+    's': _SPACE, 'S': ALL_ATOMS - _SPACE,
+}
+_CHAR_ESCAPES = {'n': '\n', 't': '\t', 'r': '\r', 'f': '\f', 'v': '\v', '0': '\0'}
+
+
+def atom_of(c):
+    o = ord(c)
+    if o < 128:
+        return o
+    if c.isdecimal():
+        return NA_DIGIT
+    if c.isalnum():
+        return NA_WORD
+    if c.isspace():
+        return NA_SPACE
+    return NA_OTHER
+
+
+# ==============================================================================
+# 1. REGEX -> NFA (construção de Thompson)
+# ==============================================================================
+
+class _NFA:
+    def __init__(self):
+        self.eps = []      # eps[s] -> lista de estados alcançáveis por epsilon
+        self.edges = []    # edges[s] -> lista de (conjunto de átomos, destino)
+
+    def new_state(self):
+        self.eps.append([])
+        self.edges.append([])
+        return len(self.eps) - 1
+
+
+class _RegexParser:
+    """Converte um padrão em um fragmento (início, fim) do NFA."""
+
+    def __init__(self, nfa, pattern, ignore_case=False):
+        self.nfa = nfa
+        self.pattern = pattern
+        self.pos = 0
+        self.ignore_case = ignore_case
+        self.lazy = False
+        self.leading_boundary = False
+
+    def error(self, msg):
+        raise ValueError(f"Regex não suportada pelo autômato ({msg}): {self.pattern!r}")
+
+    def parse(self):
+        pattern = self.pattern
+        if pattern.startswith(r'\b'):
+            self.leading_boundary = True
+            self.pos = 2
+        # \b final: a preferência pelo casamento mais longo já garante que
+        # "read" seguido de letra vira ID, então ele pode ser descartado.
+        if pattern.endswith(r'\b') and not pattern.endswith(r'\\b'):
+            pattern = pattern[:-2]
+            self.pattern = pattern
+        frag = self._alternation()
+        if self.pos != len(self.pattern):
+            self.error(f"caractere inesperado na posição {self.pos}")
+        return frag
+
+    def _peek(self):
+        return self.pattern[self.pos] if self.pos < len(self.pattern) else None
+
+    def _alternation(self):
+        frags = [self._concat()]
+        while self._peek() == '|':
+            self.pos += 1
+            frags.append(self._concat())
+        if len(frags) == 1:
+            return frags[0]
+        start, end = self.nfa.new_state(), self.nfa.new_state()
+        for s, e in frags:
+            self.nfa.eps[start].append(s)
+            self.nfa.eps[e].append(end)
+        return start, end
+
+    def _concat(self):
+        start = end = self.nfa.new_state()
+        while self._peek() not in (None, '|', ')'):
+            s, e = self._repeat()
+            self.nfa.eps[end].append(s)
+            end = e
+        return start, end
+
+    def _repeat(self):
+        s, e = self._atom()
+        op = self._peek()
+        if op not in ('*', '+', '?'):
+            return s, e
+        self.pos += 1
+        if self._peek() == '?':
+            self.pos += 1
+            self.lazy = True
+        nfa = self.nfa
+        start, end = nfa.new_state(), nfa.new_state()
+        nfa.eps[start].append(s)
+        nfa.eps[e].append(end)
+        if op in ('*', '?'):
+            nfa.eps[start].append(end)
+        if op in ('*', '+'):
+            nfa.eps[e].append(s)
+        return start, end
+
+    def _atom(self):
+        c = self._peek()
+        if c == '(':
+            self.pos += 1
+            if self.pattern.startswith('?:', self.pos):
+                self.pos += 2
+            elif self._peek() == '?':
+                self.error("grupo especial")
+            frag = self._alternation()
+            if self._peek() != ')':
+                self.error("parêntese não fechado")
+            self.pos += 1
+            return frag
+        if c == '[':
+            return self._edge(self._char_class())
+        if c == '.':
+            self.pos += 1
+            return self._edge(ALL_ATOMS)   # o projeto compila com re.DOTALL
+        if c == '\\':
+            self.pos += 1
+            return self._edge(self._escape())
+        if c in ('*', '+', '?', '{'):
+            self.error(f"quantificador '{c}' sem operando")
+        self.pos += 1
+        return self._edge(self._literal(c))
+
+    def _literal(self, c):
+        if ord(c) >= 128:
+            self.error("literal não-ASCII")
+        if self.ignore_case:
+            return frozenset({ord(c.lower()), ord(c.upper())})
+        return frozenset({ord(c)})
+
+    def _escape(self):
+        c = self._peek()
+        if c is None:
+            self.error("escape no fim do padrão")
+        self.pos += 1
+        if c in _CLASS_ESCAPES:
+            return _CLASS_ESCAPES[c]
+        if c in _CHAR_ESCAPES:
+            return self._literal(_CHAR_ESCAPES[c])
+        if c.isalnum():
+            self.error(f"escape \\{c}")
+        return self._literal(c)
+
+    def _char_class(self):
+        self.pos += 1
+        negate = False
+        if self._peek() == '^':
+            negate = True
+            self.pos += 1
+        atoms = set()
+        first = True
+        while True:
+            c = self._peek()
+            if c is None:
+                self.error("classe não fechada")
+            if c == ']' and not first:
+                self.pos += 1
+                break
+            first = False
+            if c == '\\':
+                self.pos += 1
+                item = self._escape()
+                if len(item) != 1 or next(iter(item)) >= 128:
+                    atoms |= item
+                    continue
+                lo = chr(next(iter(item)))
+            else:
+                self.pos += 1
+                lo = c
+            if self._peek() == '-' and self.pos + 1 < len(self.pattern) and self.pattern[self.pos + 1] != ']':
+                self.pos += 1
+                hi = self._peek()
+                self.pos += 1
+                if hi == '\\':
+                    hi = chr(next(iter(self._escape())))
+                for o in range(ord(lo), ord(hi) + 1):
+                    atoms |= self._literal(chr(o))
+            else:
+                atoms |= self._literal(lo)
+        atoms = frozenset(atoms)
+        return ALL_ATOMS - atoms if negate else atoms
+
+    def _edge(self, atoms):
+        s, e = self.nfa.new_state(), self.nfa.new_state()
+        self.nfa.edges[s].append((frozenset(atoms), e))
+        return s, e
+
+
+# ==============================================================================
+# 2. NFA -> DFA (construção de subconjuntos) + compressão de classes
+# ==============================================================================
+
+def tipos_da_especificacao(specification, palavras_reservadas=(), id_kind="ID"):
+    # Palavras reservadas entram como literais imediatamente antes do ID
+    kinds = []
+    for name, _ in specification:
+        if name == id_kind:
+            kinds.extend(sorted(palavras_reservadas))
+        kinds.append(name)
+    return kinds
+
+
+_NAO_ASCII = (NA_DIGIT, NA_WORD, NA_SPACE, NA_OTHER)
+
+
+def _inteiro(valor, minimo, limite):
+    # Inteiro em [minimo, limite), vindo de um artefato em disco
+    if type(valor) is not int or not minimo <= valor < limite:
+        raise ValueError("Autômato compilado inválido")
+    return valor
+
+
+def _inteiros(valores, minimo, limite, tamanho=None):
+    # Lista de inteiros em [minimo, limite), do tamanho pedido
+    if (not isinstance(valores, list) or (tamanho is not None and len(valores) != tamanho)
+            or not all(type(v) is int and minimo <= v < limite for v in valores)):
+        raise ValueError("Autômato compilado inválido")
+    return valores
+
+
+class Automato:
+    def __init__(self, specification, palavras_reservadas=(), id_kind="ID"):
+        kinds = tipos_da_especificacao(specification, palavras_reservadas, id_kind)
+        patterns = []
+        for name, pattern in specification:
+            if name == id_kind:
+                patterns.extend((re.escape(palavra), True) for palavra in sorted(palavras_reservadas))
+            patterns.append((pattern, False))
+        self.kinds = kinds
+        self.kind_index = {name: i for i, name in enumerate(kinds)}
+
+        nfa = _NFA()
+        accepting = {}
+        start_word = []       # inícios válidos quando o caractere anterior é \w
+        start_nonword = []
+        lazy = [False] * len(kinds)
+        self.uses_boundary = False
+        for i, (pattern, ignore_case) in enumerate(patterns):
+            rp = _RegexParser(nfa, pattern, ignore_case)
+            s, e = rp.parse()
+            accepting[e] = i
+            lazy[i] = rp.lazy
+            start_nonword.append(s)
+            if rp.leading_boundary:
+                self.uses_boundary = True
+            else:
+                start_word.append(s)
+
+        self._build(nfa, accepting, lazy, start_nonword, start_word)
+        self._compress()
+        self._build_accelerators()
+
+    def _closure(self, nfa, states):
+        stack = list(states)
+        seen = set(states)
+        while stack:
+            s = stack.pop()
+            for t in nfa.eps[s]:
+                if t not in seen:
+                    seen.add(t)
+                    stack.append(t)
+        return frozenset(seen)
+
+    def _build(self, nfa, accepting, lazy, start_nonword, start_word):
+        index = {}
+        sets = []
+        trans = []
+        accept = []
+
+        def add(nstates):
+            if nstates in index:
+                return index[nstates]
+            index[nstates] = len(sets)
+            sets.append(nstates)
+            trans.append(None)
+            kinds = [accepting[s] for s in nstates if s in accepting]
+            accept.append(min(kinds) if kinds else -1)
+            return index[nstates]
+
+        self.start = add(self._closure(nfa, start_nonword))
+        self.start_after_word = add(self._closure(nfa, start_word))
+        i = 0
+        while i < len(sets):
+            row = [-1] * N_ATOMS
+            if not (accept[i] >= 0 and lazy[accept[i]]):
+                moves = {}
+                for s in sets[i]:
+                    for atoms, target in nfa.edges[s]:
+                        for a in atoms:
+                            moves.setdefault(a, set()).add(target)
+                cache = {}
+                for a, targets in moves.items():
+                    key = frozenset(targets)
+                    if key not in cache:
+                        cache[key] = add(self._closure(nfa, key))
+                    row[a] = cache[key]
+            trans[i] = row
+            i += 1
+        self._rows = trans
+        self.accept = accept
+
+    def _compress(self):
+        # Átomos com colunas idênticas em toda a tabela formam uma só classe
+        columns = {}
+        atom_class = [0] * N_ATOMS
+        for a in range(N_ATOMS):
+            col = tuple(row[a] for row in self._rows)
+            atom_class[a] = columns.setdefault(col, len(columns))
+        self.n_classes = n = len(columns)
+        self.ascii_class = atom_class[:128]
+        self.na_class = {k: atom_class[k] for k in _NAO_ASCII}
+        self._class_atoms = [[a for a in range(N_ATOMS) if atom_class[a] == c] for c in range(n)]
+        table = []
+        for row in self._rows:
+            compact = [-1] * n
+            for a in range(N_ATOMS):
+                compact[atom_class[a]] = row[a]
+            table.extend(compact)
+        self.table = table
+        self.n_states = len(self._rows)
+        del self._rows
+
+    def char_class(self, c):
+        o = ord(c)
+        if o < 128:
+            return self.ascii_class[o]
+        return self.na_class[atom_of(c)]
+
+    def _build_accelerators(self):
+        # Estados com laço sobre si mesmos (espaços, corpo de comentário,
+        # identificadores, dígitos...) consomem a sequência inteira de uma vez
+        # com uma classe de caracteres compilada, em vez de caractere a caractere.
+        self.run = [None] * self.n_states
+        n = self.n_classes
+        for s in range(self.n_states):
+            loop = set()
+            for c in range(n):
+                if self.table[s * n + c] == s:
+                    loop.update(self._class_atoms[c])
+            if loop:
+                char_set = _atoms_to_regex(loop)
+                if char_set is not None:
+                    self.run[s] = re.compile(char_set + '*', re.DOTALL).match
+
+    # --------------------------------------------------------------------------
+    # ARTEFATO EM DISCO
+    # --------------------------------------------------------------------------
+    #
+    # linguagem.py grava o autômato compilado como dados puros (JSON: nomes dos
+    # tipos e listas de inteiros), nunca como objetos Python. Ao carregar, cada
+    # índice é conferido contra o tamanho da tabela antes do uso, e os
+    # aceleradores são recompilados a partir dela.
+
+    def para_dados(self):
+        return {
+            "kinds": list(self.kinds),
+            "uses_boundary": self.uses_boundary,
+            "start": self.start,
+            "start_after_word": self.start_after_word,
+            "accept": self.accept,
+            "n_classes": self.n_classes,
+            "ascii_class": self.ascii_class,
+            "na_class": [self.na_class[k] for k in _NAO_ASCII],
+            "class_atoms": self._class_atoms,
+            "table": self.table,
+        }
+
+    @classmethod
+    def de_dados(cls, dados, kinds):
+        """Autômato gravado por para_dados(); ValueError se os dados não valem.
+
+        kinds: os tipos que o autômato deve ter (os da especificação).
+        """
+        if not isinstance(dados, dict) or dados.get("kinds") != list(kinds):
+            raise ValueError("Autômato compilado de outra especificação")
+        n = _inteiro(dados.get("n_classes"), 1, N_ATOMS + 1)
+        table = dados.get("table")
+        if not isinstance(table, list) or not table or len(table) % n:
+            raise ValueError("Autômato compilado inválido")
+        n_states = len(table) // n
+        automato = cls.__new__(cls)
+        automato.kinds = list(kinds)
+        automato.kind_index = {name: i for i, name in enumerate(automato.kinds)}
+        automato.uses_boundary = dados.get("uses_boundary")
+        if not isinstance(automato.uses_boundary, bool):
+            raise ValueError("Autômato compilado inválido")
+        automato.start = _inteiro(dados.get("start"), 0, n_states)
+        automato.start_after_word = _inteiro(dados.get("start_after_word"), 0, n_states)
+        automato.accept = _inteiros(dados.get("accept"), -1, len(kinds), n_states)
+        automato.n_classes = n
+        automato.ascii_class = _inteiros(dados.get("ascii_class"), 0, n, 128)
+        automato.na_class = dict(zip(_NAO_ASCII, _inteiros(dados.get("na_class"), 0, n,
+                                                           len(_NAO_ASCII))))
+        class_atoms = dados.get("class_atoms")
+        if not isinstance(class_atoms, list) or len(class_atoms) != n:
+            raise ValueError("Autômato compilado inválido")
+        automato._class_atoms = [_inteiros(atoms, 0, N_ATOMS) for atoms in class_atoms]
+        automato.table = _inteiros(table, -1, n_states)
+        automato.n_states = n_states
+        automato._build_accelerators()
+        return automato
+
+    # --------------------------------------------------------------------------
+    # 3. EXECUÇÃO
+    # --------------------------------------------------------------------------
+
+    def inicio(self, code, pos):
+        # Estado inicial em pos: depois de um caractere \w os padrões com \b
+        # no começo não podem casar
+        if self.uses_boundary and pos > 0 and atom_of(code[pos - 1]) in _WORD:
+            return self.start_after_word
+        return self.start
+
+    def percorrer(self, code, pos, end, state, last_kind=-1, last_end=None):
+        """Laço de transição usado por match(), continuar() e scan().
+
+        Anda de pos até end a partir de "state" e retorna (índice do tipo, fim
+        do casamento, estado, parada): o último tipo aceito e onde ele termina
+        (last_kind e last_end se nenhum estado de aceitação foi alcançado), o
+        estado vivo em end (-1 se o autômato morreu antes) e a posição do
+        caractere que o matou (end se ele não morreu).
+        """
+        table = self.table
+        n = self.n_classes
+        ascii_class = self.ascii_class
+        accept = self.accept
+        run = self.run
+        if last_end is None:
+            last_end = pos
+        i = pos
+        while i < end:
+            o = ord(code[i])
+            cls = ascii_class[o] if o < 128 else self.na_class[atom_of(code[i])]
+            state = table[state * n + cls]
+            if state < 0:
+                return last_kind, last_end, -1, i
+            i += 1
+            skip = run[state]
+            if skip is not None:
+                i = skip(code, i, end).end()
+            if accept[state] >= 0:
+                last_kind = accept[state]
+                last_end = i
+        return last_kind, last_end, state, end
+
+    def match(self, code, pos, end=None):
+        """Casa o token mais longo a partir de pos.
+
+        Retorna (índice do tipo, fim do casamento, esgotou). O índice é -1 se
+        nada casou; "esgotou" indica que o autômato ainda estava vivo ao
+        alcançar "end", ou seja, mais texto poderia estender o casamento.
+        """
+        if end is None:
+            end = len(code)
+        kind, fim, state, _ = self.percorrer(code, pos, end, self.inicio(code, pos))
+        return kind, fim, state >= 0
+
+    def continuar(self, code, pos, end=None, state=None, last_kind=-1, last_end=None):
+        """Como match(), mas retomável: retorna (índice do tipo, fim, estado).
+
+        "estado" é o estado em que o autômato chegou vivo em "end" (-1 se ele
+        morreu antes). Passando-o de volta com o tipo e o fim retornados, o
+        casamento continua em um texto que segue este (pos = 0), sem
+        reexaminar o anterior; o fim fica relativo ao novo texto (negativo se
+        o casamento mais longo ainda termina no texto anterior). Usado pelo
+        lexer em fluxo (leitor.py) para tokens que atravessam blocos.
+        """
+        if end is None:
+            end = len(code)
+        if state is None:
+            state = self.inicio(code, pos)
+            last_end = pos
+        kind, fim, state, _ = self.percorrer(code, pos, end, state, last_kind, last_end)
+        return kind, fim, state
+
+    def scan(self, code, pos, end=None):
+        """Como match(), mas retorna (índice do tipo, fim, alcance).
+
+        "alcance" é a posição seguinte ao último caractere examinado (end + 1
+        se o autômato chegou vivo em "end", já que texto acrescentado ali
+        também seria examinado). Ele pode passar bem do fim do token (ex.: "/"
+        de um "/*" sem "*/" examina até o fim do texto) e diz até onde uma
+        edição pode mudar esse token.
+        """
+        if end is None:
+            end = len(code)
+        kind, fim, _, parada = self.percorrer(code, pos, end, self.inicio(code, pos))
+        return kind, fim, parada + 1
+
+
+def _atoms_to_regex(atoms):
+    # Converte um conjunto de átomos em uma classe de caracteres do "re"
+    na = {a for a in atoms if a >= 128}
+    ascii_chars = {a for a in atoms if a < 128}
+    if na == {NA_DIGIT, NA_WORD, NA_SPACE, NA_OTHER}:
+        missing = set(range(128)) - ascii_chars
+        if not missing:
+            return '.'
+        return '[^' + ''.join(_escape_class_char(chr(a)) for a in sorted(missing)) + ']'
+    if not na:
+        if not ascii_chars:
+            return None
+        return '[' + ''.join(_escape_class_char(chr(a)) for a in sorted(ascii_chars)) + ']'
+    if na == {NA_DIGIT, NA_WORD} and _WORD - na <= ascii_chars:
+        extra = ascii_chars - _WORD
+        return '[\\w' + ''.join(_escape_class_char(chr(a)) for a in sorted(extra)) + ']'
+    if na == {NA_DIGIT} and _DIGITS - na <= ascii_chars and ascii_chars <= _DIGITS:
+        return '\\d'
+    return None
+
+
+def _escape_class_char(c):
+    if c in '\\]^-[':
+        return '\\' + c
+    if c.isprintable():
+        return c
+    return '\\x%02x' % ord(c)
@@ -0,0 +1,113 @@
+# Benchmark da AST em arena (arvore.py) x árvore ingênua de dicionários.
+#
+# Uso: python benchmarks/bench_arvore.py [milhões_de_tokens]
+#
+# As duas árvores são montadas pelos mesmos redutores (ConstrutorArvore); só
+# muda o armazenamento dos nós. Mede tempo de construção, memória retida
+# pela árvore (tracemalloc) e tempo/tamanho da serialização.
+
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+AQUI = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(AQUI, ".."))
+sys.path.insert(0, AQUI)
+
+from nucleo import ParserIterativo, tokenizar
+from arvore import TIPOS, Arvore, ConstrutorArvore
+from gerador import GeradorProgramas
+
+
+class ArvoreDict:
+    # Um dicionário por nó, com o texto e a lista de filhos
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.nos = []
+        self.raiz = -1
+
+    def novo(self, tipo, token, filhos=()):
+        self.nos.append({"type": TIPOS[tipo], "value": self.tokens.value(token),
+                         "children": [self.nos[c] for c in filhos]})
+        return len(self.nos) - 1
+
+    def __len__(self):
+        return len(self.nos)
+
+
+def construir(tokens, classe):
+    p = ParserIterativo(tokens, trace="off")
+    construtor = ConstrutorArvore(p, classe(tokens))
+    p._enter_rule = construtor.entrar
+    p._exit_rule = construtor.sair
+    p._shift_log = construtor.consumir
+    p.parse_program()
+    return construtor.arvore
+
+
+def medir(tokens, classe):
+    gc.collect()
+    inicio = time.perf_counter()
+    construir(tokens, classe)
+    dt = time.perf_counter() - inicio
+    # Memória retida: só o que sobrevive à construção (a árvore)
+    gc.collect()
+    tracemalloc.start()
+    arvore = construir(tokens, classe)
+    gc.collect()
+    retida = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return arvore, dt, retida
+
+
+def main():
+    milhoes = float(sys.argv[1]) if len(sys.argv) > 1 else 1
+    gerador = GeradorProgramas(3, profundidade=4)
+    code = gerador.programa(int(milhoes * 1_000_000 / 65))
+    tokens = tokenizar(code)
+    print(f"Entrada: {len(tokens):,} tokens ({len(code) / 1024 / 1024:.1f} MB)")
+
+    arena, dt_arena, mem_arena = medir(tokens, Arvore)
+    dicts, dt_dict, mem_dict = medir(tokens, ArvoreDict)
+    if arena.aninhado() != _aninhado_dict(dicts.nos[dicts.raiz]):
+        raise SystemExit("ERRO: as árvores diferem")
+    n = len(arena)
+    print(f"Nós: {n:,}")
+    print(f"  arena:       {dt_arena:6.2f} s  {mem_arena / 1024 / 1024:8.1f} MB ({mem_arena / n:6.1f} B/nó)")
+    print(f"  dicionários: {dt_dict:6.2f} s  {mem_dict / 1024 / 1024:8.1f} MB ({mem_dict / n:6.1f} B/nó)")
+
+    inicio = time.perf_counter()
+    binario = arena.para_bytes()
+    dt_bin = time.perf_counter() - inicio
+    inicio = time.perf_counter()
+    plano = json.dumps(arena.para_json(), separators=(",", ":"))
+    dt_plano = time.perf_counter() - inicio
+    inicio = time.perf_counter()
+    ingenuo = json.dumps(dicts.nos[dicts.raiz], separators=(",", ":"))
+    dt_ingenuo = time.perf_counter() - inicio
+    inicio = time.perf_counter()
+    Arvore.de_bytes(binario)
+    dt_carga = time.perf_counter() - inicio
+    print("Serialização:")
+    print(f"  arena binária: {len(binario) / 1024 / 1024:7.1f} MB {dt_bin:6.2f} s (carga {dt_carga:.2f} s)")
+    print(f"  arena JSON:    {len(plano) / 1024 / 1024:7.1f} MB {dt_plano:6.2f} s")
+    print(f"  dicts JSON:    {len(ingenuo) / 1024 / 1024:7.1f} MB {dt_ingenuo:6.2f} s")
+
+
+def _aninhado_dict(raiz):
+    resultado = [raiz["type"], raiz["value"]]
+    pilha = [(raiz, resultado)]
+    while pilha:
+        no, lista = pilha.pop()
+        for filho in no["children"]:
+            sub = [filho["type"], filho["value"]]
+            lista.append(sub)
+            pilha.append((filho, sub))
+    return resultado
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+# Benchmark do cache binário de tokens do analisador.py (cache_tokens.py).
+#
+# Uso: python benchmarks/bench_cache_tokens.py [tamanho_em_MB]
+#
+# Compara, para o mesmo arquivo:
+#   - primeira execução: lexer + gravação do cache;
+#   - execuções seguintes: tokens lidos do cache mapeado em memória;
+# e a saída em texto escrita token a token (como antes) x em blocos.
+
+import os
+import sys
+import tempfile
+import time
+
+AQUI = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(AQUI, ".."))
+sys.path.insert(0, AQUI)
+
+import analisador
+from bench_lexer import gerar_entrada
+from cache_tokens import EXTENSAO
+from leitor import abrir_fonte
+
+
+def rodar(caminho, usar_cache=True):
+    inicio = time.perf_counter()
+    with abrir_fonte(caminho) as fonte:
+        total = sum(1 for _ in analisador.tokens_do_arquivo(caminho, fonte, usar_cache))
+    return total, time.perf_counter() - inicio
+
+
+def texto_token_a_token(tokens, escritor):
+    for token in tokens:
+        escritor.write(str(token) + "\n")
+
+
+def main():
+    tamanho_mb = float(sys.argv[1]) if len(sys.argv) > 1 else 8
+    with tempfile.TemporaryDirectory() as pasta:
+        caminho = os.path.join(pasta, "entrada.txt")
+        with open(caminho, "w", encoding="utf-8") as f:
+            f.write(gerar_entrada(tamanho_mb))
+
+        total, frio = rodar(caminho)
+        _, quente = rodar(caminho)
+        with abrir_fonte(caminho) as fonte:
+            lexer = list(analisador.lexer_stream(fonte))
+        with abrir_fonte(caminho) as fonte:
+            if list(analisador.tokens_do_arquivo(caminho, fonte)) != lexer:
+                raise SystemExit("ERRO: o cache devolveu tokens diferentes do lexer")
+
+        print(f"Entrada: {tamanho_mb:.0f} MB, {total:,} tokens, "
+              f"cache de {os.path.getsize(caminho + EXTENSAO) / 1024 / 1024:.1f} MB")
+        print(f"  sem cache (lexer + gravação): {frio:6.2f} s")
+        print(f"  com cache (mmap):             {quente:6.2f} s  ({frio / quente:.1f}x)")
+
+        esperado = None
+        for nome, escrever in (("token a token", texto_token_a_token),
+                               ("em blocos", analisador.escrever_texto)):
+            saida = os.path.join(pasta, "saida.txt")
+            inicio = time.perf_counter()
+            with open(saida, "w", encoding="utf-8") as escritor:
+                escrever(lexer, escritor)
+            print(f"  texto {nome:14}          {time.perf_counter() - inicio:6.2f} s")
+            with open(saida, encoding="utf-8") as f:
+                conteudo = f.read()
+            if esperado is not None and conteudo != esperado:
+                raise SystemExit("ERRO: as saídas em texto diferem")
+            esperado = conteudo
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+# Benchmark da extração de texto de .docx: leitor_docx.py x python-docx.
+#
+# Uso: python benchmarks/bench_docx.py [tamanho_em_MB]
+#
+# Gera localmente (só com zipfile) um .docx grande com o programa de
+# bench_lexer.gerar_entrada, um parágrafo por linha e cada linha dividida em
+# vários runs (como o Word costuma gravar texto editado). Cada extrator roda
+# em um processo novo; a memória é o pico de RSS do processo inteiro (o lxml
+# do python-docx aloca fora do alcance do tracemalloc), e "base" é o pico só
+# com o interpretador e os módulos importados (lidos de /proc, só Linux).
+
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import zipfile
+from xml.sax.saxutils import escape
+
+AQUI = os.path.dirname(os.path.abspath(__file__))
+RAIZ = os.path.join(AQUI, "..")
+sys.path.insert(0, RAIZ)
+sys.path.insert(0, AQUI)
+
+from bench_lexer import gerar_entrada
+
+W = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+TIPOS = ('<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+         '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+         '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+         '<Default Extension="xml" ContentType="application/xml"/>'
+         '<Override PartName="/word/document.xml" ContentType="application/'
+         'vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/></Types>')
+RELACOES = ('<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/'
+            'relationships/officeDocument" Target="word/document.xml"/></Relationships>')
+
+_EXTRAIR = """
+import hashlib, sys, time
+
+def pico_rss():
+    # VmHWM: pico de RSS deste processo (ru_maxrss herda o do processo pai)
+    with open("/proc/self/status") as f:
+        for linha in f:
+            if linha.startswith("VmHWM:"):
+                return int(linha.split()[1])
+sys.path.insert(0, {raiz!r})
+{importar}
+antes = pico_rss()
+inicio = time.perf_counter()
+texto = {extrair}
+dt = time.perf_counter() - inicio
+depois = pico_rss()
+if isinstance(texto, str):
+    print(dt, antes * 1024, depois * 1024, len(texto), hashlib.sha256(texto.encode()).hexdigest())
+else:
+    print(dt, antes * 1024, depois * 1024, texto, "-")
+"""
+
+EXTRATORES = [
+    ("python-docx", "from docx import Document",
+     "'\\n'.join(p.text for p in Document({caminho!r}).paragraphs)"),
+    ("leitor_docx", "import leitor_docx", "leitor_docx.extrair_texto({caminho!r})"),
+    ("leitor_docx (em fluxo)", "import leitor_docx\nfrom nucleo import lexer_stream",
+     "sum(1 for _ in lexer_stream(leitor_docx.FonteDocx({caminho!r})))"),
+]
+
+
+def gerar_docx(caminho, texto, seed=0):
+    aleatorio = random.Random(seed)
+    with zipfile.ZipFile(caminho, "w", zipfile.ZIP_DEFLATED) as z:
+        z.writestr("[Content_Types].xml", TIPOS)
+        z.writestr("_rels/.rels", RELACOES)
+        with z.open("word/document.xml", "w") as f:
+            f.write(f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+                    f'<w:document xmlns:w="{W}"><w:body>'.encode())
+            partes = []
+            for linha in texto.split("\n"):
+                runs = []
+                while linha:
+                    n = aleatorio.randint(1, 12)
+                    runs.append('<w:r><w:rPr><w:rFonts w:ascii="Consolas"/></w:rPr>'
+                                f'<w:t xml:space="preserve">{escape(linha[:n])}</w:t></w:r>')
+                    linha = linha[n:]
+                partes.append("<w:p>" + "".join(runs) + "</w:p>")
+                if len(partes) >= 4096:
+                    f.write("".join(partes).encode())
+                    partes = []
+            f.write(("".join(partes) + "<w:sectPr/></w:body></w:document>").encode())
+
+
+def rodar(importar, extrair, caminho):
+    codigo = _EXTRAIR.format(raiz=RAIZ, importar=importar, extrair=extrair.format(caminho=caminho))
+    saida = subprocess.run([sys.executable, "-c", codigo], capture_output=True, text=True, check=True)
+    dt, base, pico, tamanho, assinatura = saida.stdout.split()
+    return float(dt), int(base), int(pico), int(tamanho), assinatura
+
+
+def main():
+    tamanho_mb = float(sys.argv[1]) if len(sys.argv) > 1 else 4
+    texto = gerar_entrada(tamanho_mb)
+    with tempfile.TemporaryDirectory() as pasta:
+        caminho = os.path.join(pasta, "grande.docx")
+        gerar_docx(caminho, texto)
+        with zipfile.ZipFile(caminho) as z:
+            xml = z.getinfo("word/document.xml").file_size
+        print(f"Texto: {len(texto) / 1024 / 1024:.1f} MB; .docx: "
+              f"{os.path.getsize(caminho) / 1024 / 1024:.1f} MB "
+              f"(document.xml: {xml / 1024 / 1024:.1f} MB)")
+        referencia = None
+        for nome, importar, extrair in EXTRATORES:
+            dt, base, pico, tamanho, assinatura = rodar(importar, extrair, caminho)
+            if "fluxo" not in nome:
+                if referencia is not None and assinatura != referencia:
+                    raise SystemExit(f"ERRO: {nome} extraiu um texto diferente")
+                referencia = assinatura
+                detalhe = ""
+            else:
+                detalhe = f" ({tamanho} tokens pelo lexer)"
+            print(f"  {nome:24} {dt:6.2f} s  pico {pico / 1024 / 1024:7.1f} MB RSS "
+                  f"(base {base / 1024 / 1024:.1f} MB){detalhe}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+# Benchmark do tempo de partida das entradas de linha de comando.
+#
+# Uso: python benchmarks/bench_importacao.py [repetições]
+#
+# Cada medida é um processo Python novo (como os jobs em lote que chamam a
+# linha de comando milhares de vezes); vale o menor tempo de parede entre as
+# repetições. "Pilha web" reproduz o que a linha de comando carregava antes,
+# quando o lexer e o Parser moravam no app.py junto do Flask e do python-docx.
+
+import compileall
+import os
+import subprocess
+import sys
+import time
+
+AQUI = os.path.dirname(os.path.abspath(__file__))
+RAIZ = os.path.join(AQUI, "..")
+PROGRAMA = os.path.join(RAIZ, "testes", "Teste Básico (Caminho Feliz).txt")
+
+CASOS = [
+    ("python vazio", ["-c", "pass"]),
+    ("import nucleo", ["-c", "import nucleo"]),
+    ("import analisador", ["-c", "import analisador"]),
+    ("pilha web (flask + docx + nucleo)", ["-c", "import flask, docx, nucleo"]),
+    ("import app", ["-c", "import app"]),
+    ("app.py --cli programa", ["app.py", "--cli", "-q", PROGRAMA]),
+    ("nucleo.py programa", ["nucleo.py", "-q", PROGRAMA]),
+    ("analisador.py programa", ["analisador.py", PROGRAMA, "-o", os.devnull, "--sem-cache"]),
+]
+
+
+def medir(argumentos, repeticoes):
+    melhor = float("inf")
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        subprocess.run([sys.executable, *argumentos], cwd=RAIZ, stdout=subprocess.DEVNULL)
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor
+
+
+def modulos(codigo):
+    saida = subprocess.run([sys.executable, "-c", codigo + "; import sys; print(len(sys.modules))"],
+                           cwd=RAIZ, capture_output=True, text=True)
+    return saida.stdout.strip()
+
+
+def main():
+    repeticoes = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    # Bytecode já gerado (mesmo com PYTHONDONTWRITEBYTECODE) e uma execução
+    # antes para o autômato compilado estar no cache em disco
+    compileall.compile_dir(RAIZ, maxlevels=0, quiet=1)
+    medir(CASOS[-2][1], 1)
+    for nome, argumentos in CASOS:
+        print(f"{nome:36} {medir(argumentos, repeticoes) * 1000:7.1f} ms")
+    print("Módulos carregados:")
+    for codigo in ("import nucleo", "import flask, docx, nucleo"):
+        print(f"  {codigo:34} {modulos(codigo):>5}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+# Benchmark da análise léxica incremental (/analyze_incremental).
+#
+# Uso: python benchmarks/bench_incremental.py
+#
+# Para documentos de tamanhos diferentes, mede a latência média de edições
+# de um caractere (inserção e remoção em posições aleatórias, em sequência
+# próxima como na digitação) e compara com re-analisar o arquivo inteiro.
+# No fim confere que os tokens mantidos incrementalmente são iguais aos de
+# uma análise completa do texto final.
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from nucleo import get_automato, palavras_reservadas
+from bench_trace import CORPO
+from incremental import DocumentoIncremental
+
+
+def documento(linhas):
+    blocos = max(1, linhas // CORPO.count("\n"))
+    return "program bench;\nvar x, y: integer;\nbegin\n" + CORPO * blocos + "end.\n"
+
+
+def medir(linhas, edicoes=2000):
+    text = documento(linhas)
+    automato = get_automato()
+
+    inicio = time.perf_counter()
+    doc = DocumentoIncremental(automato, palavras_reservadas, text)
+    completo = time.perf_counter() - inicio
+    tokens = doc.tokens()
+
+    rnd = random.Random(linhas)
+    cursor = len(text) // 2
+    tempos = []
+    for _ in range(edicoes):
+        # O cursor anda pouco entre edições, como ao digitar
+        cursor = max(0, min(len(doc.text) - 1, cursor + rnd.randint(-40, 40)))
+        # Apagar uma aspa ou parte de um "/*" muda legitimamente todo o resto do
+        # arquivo (as strings seguintes trocam de par), então essas edições
+        # ficam de fora da medida de latência típica
+        if rnd.random() < 0.6 or doc.text[cursor] in "'/*":
+            edicao = (cursor, 0, rnd.choice("abx1 ;:=()+\n"))
+        else:
+            edicao = (cursor, 1, "")
+        t = time.perf_counter()
+        a, n, novos = doc.aplicar_edicao(*edicao)
+        tempos.append(time.perf_counter() - t)
+        tokens[a:a + n] = novos
+
+    if tokens != DocumentoIncremental(automato, palavras_reservadas, doc.text).tokens():
+        raise SystemExit("ERRO: tokens incrementais diferem da análise completa")
+    tempos.sort()
+    media = sum(tempos) / len(tempos)
+    print(f"{linhas:>7} linhas ({len(tokens):>7} tokens): completo {completo * 1000:8.1f} ms | "
+          f"edição média {media * 1e6:6.0f} us, p99 {tempos[int(len(tempos) * 0.99)] * 1e6:6.0f} us")
+
+
+def main():
+    for linhas in (500, 5000, 50000):
+        medir(linhas)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+# Interpretador de bytecode (compilador.py) x avaliador ingênuo da AST.
+#
+# Uso: python benchmarks/bench_interpretador.py [escala]
+#
+# Roda programas com laços pesados (somas aninhadas, contagem de primos por
+# divisão, passos de Collatz) de duas formas: compilados para bytecode e
+# executados por compilador.executar(), e por um avaliador que percorre a
+# AST (arvore.py) recursivamente, com as variáveis em um dicionário e o texto
+# dos nós fatiado da fonte a cada visita. Confere que a saída é a mesma e
+# mostra o tempo de cada um (o do bytecode inclui a compilação) e as
+# instruções executadas (ver compilador.py).
+
+import os
+import sys
+import time
+
+AQUI = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(AQUI, ".."))
+
+import arvore as A
+from compilador import MAX_INTEIRO, MIN_INTEIRO, compilar, executar
+from nucleo import ParserIterativo, tokenizar
+
+PROGRAMAS = {
+    "somas aninhadas": ("""
+program somas;
+var i, j, n, s: integer;
+begin
+    read(n);
+    i := 0;
+    while i < n do
+    begin
+        j := 0;
+        while j < n do
+        begin
+            s := s + i * j - s / 3;
+            j := j + 1;
+        end;
+        i := i + 1;
+    end;
+    writeln(s);
+end.
+""", 300),
+    "primos": ("""
+program primos;
+var n, k, d, total: integer;
+    primo: boolean;
+begin
+    read(n);
+    k := 2;
+    while k <= n do
+    begin
+        primo := true;
+        d := 2;
+        while d * d <= k do
+        begin
+            if k - k / d * d = 0 then
+            begin
+                primo := false;
+                d := k;
+            end;
+            d := d + 1;
+        end;
+        if primo then total := total + 1;
+        k := k + 1;
+    end;
+    writeln('primos: ', total);
+end.
+""", 20000),
+    "collatz": ("""
+program collatz;
+var n, k, x, passos: integer;
+begin
+    read(n);
+    k := 1;
+    while k <= n do
+    begin
+        x := k;
+        while x <> 1 do
+        begin
+            if x - x / 2 * 2 = 0 then x := x / 2 else x := 3 * x + 1;
+            passos := passos + 1;
+        end;
+        k := k + 1;
+    end;
+    writeln('passos: ', passos);
+end.
+""", 3000),
+}
+
+
+class AvaliadorArvore:
+    # Percorre a AST a cada execução: sem compilação, sem slots
+    def __init__(self, arvore, entrada):
+        self.arvore = arvore
+        self.variaveis = {}
+        self.entrada = entrada.split()[::-1]
+        self.saida = []
+
+    def rodar(self):
+        arv = self.arvore
+        for no in arv.filhos(arv.raiz):
+            if arv.tipos[no] == A.DECLARACAO:
+                inicial = 0 if arv.valor(no).lower() == "integer" else False
+                for v in arv.filhos(no):
+                    self.variaveis[arv.valor(v).lower()] = inicial
+            else:
+                self.comando(no)
+        return "".join(self.saida)
+
+    def comando(self, no):
+        arv = self.arvore
+        tipo = arv.tipos[no]
+        filhos = arv.filhos(no)
+        if tipo == A.BLOCO:
+            for filho in filhos:
+                self.comando(filho)
+        elif tipo == A.ATRIBUICAO:
+            self.variaveis[arv.valor(no).lower()] = self.expressao(filhos[0])
+        elif tipo == A.SE:
+            if self.expressao(filhos[0]):
+                self.comando(filhos[1])
+            elif len(filhos) > 2:
+                self.comando(filhos[2])
+        elif tipo == A.ENQUANTO:
+            while self.expressao(filhos[0]):
+                self.comando(filhos[1])
+        elif tipo == A.LEITURA:
+            for v in filhos:
+                self.variaveis[arv.valor(v).lower()] = int(self.entrada.pop())
+        elif tipo == A.ESCRITA:
+            for filho in filhos:
+                if arv.tipos[filho] == A.TEXTO:
+                    self.saida.append(arv.valor(filho)[1:-1])
+                else:
+                    valor = self.expressao(filho)
+                    self.saida.append(("TRUE" if valor else "FALSE") if isinstance(valor, bool)
+                                      else str(valor))
+            if arv.valor(no).upper() == "WRITELN":
+                self.saida.append("\n")
+
+    def expressao(self, no):
+        arv = self.arvore
+        tipo = arv.tipos[no]
+        if tipo == A.VARIAVEL:
+            return self.variaveis[arv.valor(no).lower()]
+        if tipo == A.NUMERO:
+            return int(arv.valor(no))
+        if tipo == A.BOOLEANO:
+            return arv.valor(no).upper() == "TRUE"
+        if tipo == A.UNARIO:
+            valor = self.expressao(arv.filhos(no)[0])
+            return self.inteiro(-valor if arv.valor(no) == "-" else valor)
+        x, y = (self.expressao(f) for f in arv.filhos(no))
+        op = arv.valor(no)
+        if op == "+":
+            return self.inteiro(x + y)
+        if op == "-":
+            return self.inteiro(x - y)
+        if op == "*":
+            return self.inteiro(x * y)
+        if op == "/":
+            q = x // y
+            return self.inteiro(q + 1 if q < 0 and q * y != x else q)
+        return {"<": x < y, "<=": x <= y, ">": x > y, ">=": x >= y,
+                "=": x == y, "<>": x != y}[op]
+
+    @staticmethod
+    def inteiro(valor):
+        if valor > MAX_INTEIRO or valor < MIN_INTEIRO:
+            raise OverflowError("estouro de inteiro")
+        return valor
+
+
+def arvore_de(code):
+    p = ParserIterativo(tokenizar(code), trace="ast")
+    p.parse_program()
+    return p.arvore
+
+
+def cronometrar(funcao):
+    inicio = time.perf_counter()
+    resultado = funcao()
+    return resultado, time.perf_counter() - inicio
+
+
+def main():
+    escala = float(sys.argv[1]) if len(sys.argv) > 1 else 1.0
+    print(f"{'programa':<18}{'instruções':>14}{'árvore s':>11}{'bytecode s':>12}{'ganho':>8}")
+    for nome, (code, n) in PROGRAMAS.items():
+        entrada = str(max(1, int(n * escala)))
+        arv = arvore_de(code)
+        esperado, t_arvore = cronometrar(lambda: AvaliadorArvore(arv, entrada).rodar())
+        resultado, t_bytecode = cronometrar(
+            lambda: executar(compilar(arv), entrada, max_instrucoes=10 ** 12))
+        if resultado["output"] != esperado:
+            raise SystemExit(f"ERRO: saídas diferentes em {nome}: "
+                             f"{resultado['output']!r} x {esperado!r}")
+        print(f"{nome:<18}{resultado['instructions']:>14,}{t_arvore:>11.2f}{t_bytecode:>12.2f}"
+              f"{t_arvore / t_bytecode:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
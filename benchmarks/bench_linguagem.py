@@ -0,0 +1,58 @@
+# Benchmark da compilação dos dialetos (linguagem.py).
+#
+# Uso: python benchmarks/bench_linguagem.py
+#
+# Para cada dialeto mede, em um processo novo (como um worker ou uma execução
+# da linha de comando), o tempo até ter o autômato pronto:
+#   - compilando a especificação (sem artefato em disco);
+#   - carregando o artefato compilado gravado pela execução anterior;
+# e o custo de cada uso seguinte dentro do mesmo processo.
+
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+AQUI = os.path.dirname(os.path.abspath(__file__))
+RAIZ = os.path.join(AQUI, "..")
+sys.path.insert(0, RAIZ)
+
+import linguagem
+
+_MEDIR = """
+import time
+import linguagem
+inicio = time.perf_counter()
+linguagem.obter({nome!r}).automato()
+print(time.perf_counter() - inicio)
+"""
+
+
+def processo_novo(nome, diretorio):
+    env = dict(os.environ, ANALISADOR_COMPILADOS=diretorio)
+    saida = subprocess.run([sys.executable, "-c", _MEDIR.format(nome=nome)], cwd=RAIZ,
+                           env=env, capture_output=True, text=True, check=True)
+    return float(saida.stdout)
+
+
+def main():
+    for nome, dialeto in linguagem.DIALETOS.items():
+        with tempfile.TemporaryDirectory() as diretorio:
+            compilar = processo_novo(nome, diretorio)
+            carregar = min(processo_novo(nome, diretorio) for _ in range(3))
+            tamanho = sum(os.path.getsize(os.path.join(diretorio, f)) for f in os.listdir(diretorio))
+        dialeto.automato()
+        inicio = time.perf_counter()
+        for _ in range(100_000):
+            dialeto.automato()
+        por_uso = (time.perf_counter() - inicio) / 100_000
+        print(f"{nome:10} (hash {dialeto.hash[:12]}):")
+        print(f"  compilando:         {compilar * 1000:8.1f} ms")
+        print(f"  carregando do disco:{carregar * 1000:8.1f} ms  ({compilar / carregar:.1f}x, "
+              f"{tamanho / 1024:.0f} KB)")
+        print(f"  já compilado:       {por_uso * 1e9:8.0f} ns por uso")
+
+
+if __name__ == "__main__":
+    main()
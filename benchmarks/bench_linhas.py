@@ -0,0 +1,66 @@
+# Benchmark do índice de linhas (linhas.py).
+#
+# Uso: python benchmarks/bench_linhas.py [comandos]
+#
+# Para um programa gerado (gerador.py) com comentários de várias
+# linhas e para a mesma fonte "minificada" (uma linha só), mede:
+#   - a montagem do índice e as linhas de todos os tokens (calcular_linhas);
+#   - a coluna de todos os tokens pelo índice x pelo rfind da quebra de linha
+#     anterior (como TokenStream.column fazia), que custa o tamanho da linha;
+# e confere as linhas e colunas contra a contagem direta de quebras.
+
+import os
+import sys
+import time
+
+AQUI = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(AQUI, ".."))
+sys.path.insert(0, AQUI)
+
+from linhas import IndiceLinhas
+from nucleo import tokenizar
+from gerador import GeradorProgramas
+
+
+def cronometrar(funcao):
+    inicio = time.perf_counter()
+    resultado = funcao()
+    return resultado, time.perf_counter() - inicio
+
+
+def colunas_rfind(code, amostra):
+    return [s - code.rfind('\n', 0, s) for s in amostra]
+
+
+def medir(nome, code, amostra):
+    tokens = tokenizar(code)
+    starts = tokens.starts
+    indice, t_indice = cronometrar(lambda: IndiceLinhas(code))
+    linhas, t_linhas = cronometrar(lambda: indice.linhas(starts))
+    # O rfind numa fonte de uma linha só é quadrático: mede uma amostra de
+    # tokens espalhados pela fonte
+    passo = max(1, len(starts) // amostra)
+    posicoes = starts[::passo]
+    colunas, t_indice_col = cronometrar(lambda: [indice.coluna(s) for s in posicoes])
+    esperadas, t_rfind = cronometrar(lambda: colunas_rfind(code, posicoes))
+    if colunas != esperadas:
+        raise SystemExit(f"ERRO: colunas diferentes ({nome})")
+    if list(linhas[::passo]) != [code.count('\n', 0, s) + 1 for s in posicoes]:
+        raise SystemExit(f"ERRO: linhas diferentes ({nome})")
+    print(f"{nome}: {len(code) / 1024:.0f} KB, {len(indice)} linhas, {len(tokens):,} tokens")
+    print(f"  índice:                  {t_indice * 1000:8.2f} ms")
+    print(f"  linhas de todos tokens:  {t_linhas * 1000:8.2f} ms")
+    print(f"  colunas ({len(posicoes):,} tokens): índice {t_indice_col * 1000:8.2f} ms, "
+          f"rfind {t_rfind * 1000:8.2f} ms")
+
+
+def main():
+    comandos = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    code = ("/* cabeçalho\n   de várias\n   linhas */\n"
+            + GeradorProgramas(seed=1).programa(comandos))
+    medir("programa", code, 20_000)
+    medir("minificado", code.replace('\n', ' '), 2_000)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+# Benchmark da análise em lote (lote.py) com número variável de processos.
+#
+# Uso: python benchmarks/bench_lote.py [arquivos] [comandos_por_arquivo]
+#
+# Gera programas em um diretório temporário (um em cada dez com erro de
+# sintaxe) e mede o tempo total com 1, 2, 4... processos até o número de
+# CPUs, mostrando a aceleração em relação à execução sequencial.
+
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from bench_trace import gerar_programa
+from lote import analisar_lote, itens_de_caminhos
+
+
+def main():
+    arquivos = int(sys.argv[1]) if len(sys.argv) > 1 else 400
+    comandos = int(sys.argv[2]) if len(sys.argv) > 2 else 300
+    cpus = os.cpu_count() or 1
+
+    with tempfile.TemporaryDirectory() as pasta:
+        for i in range(arquivos):
+            code = gerar_programa(comandos)
+            if i % 10 == 0:
+                code = code.replace(";", "", 1 + i % 7)
+            with open(os.path.join(pasta, f"prog{i:05d}.txt"), "w", encoding="utf-8") as f:
+                f.write(code)
+        itens = itens_de_caminhos([pasta])
+
+        inicio = time.perf_counter()
+        resultados, resumo = analisar_lote(itens, workers=1)
+        base = time.perf_counter() - inicio
+        print(f"{arquivos} arquivos ({resumo['invalid']} inválidos), {cpus} CPUs")
+        print(f"sequencial : {base:.2f} s")
+
+        workers = 2
+        while workers <= max(cpus, 2):
+            with ProcessPoolExecutor(workers) as executor:
+                inicio = time.perf_counter()
+                paralelos, _ = analisar_lote(itens, executor=executor, workers=workers)
+                dt = time.perf_counter() - inicio
+            if [r["valid"] for r in paralelos] != [r["valid"] for r in resultados]:
+                raise SystemExit("ERRO: resultados paralelos diferem dos sequenciais")
+            print(f"{workers:2d} processos: {dt:.2f} s ({base / dt:.2f}x)")
+            workers *= 2
+
+
+if __name__ == "__main__":
+    main()
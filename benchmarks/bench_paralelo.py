@@ -0,0 +1,72 @@
+# Benchmark do lexer paralelo (paralelo.py) x tokenizar() sequencial.
+#
+# Uso: python benchmarks/bench_paralelo.py [tamanho_em_MB] [workers ...]
+#
+# Gera uma fonte grande (programas de gerador.py repetidos, com
+# comentários e strings de várias linhas para a pré-varredura ter o que
+# pular), mede tokenizar() e tokenizar_paralelo() com 1, 2, 4... processos
+# (até o número de CPUs, ou os números pedidos) e confere que os tokens são
+# idênticos. O pool de cada medição é criado e aquecido antes do cronômetro.
+
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+AQUI = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(AQUI, ".."))
+sys.path.insert(0, AQUI)
+
+import linguagem
+from nucleo import tokenizar
+from paralelo import fronteiras, tokenizar_paralelo
+from gerador import GeradorProgramas
+
+
+def gerar_entrada(tamanho_mb):
+    bloco = ("/* comentário\n   de várias linhas */\n"
+             + GeradorProgramas(seed=7).programa(2000)
+             + "program s; begin writeln('texto\ncom quebra') end.\n")
+    return bloco * max(1, int(tamanho_mb * 1024 * 1024 / len(bloco.encode("utf-8"))))
+
+
+def iguais(a, b):
+    return (a.kinds == b.kinds and a.starts == b.starts and a.ends == b.ends
+            and a.lines == b.lines)
+
+
+def main():
+    tamanho_mb = float(sys.argv[1]) if len(sys.argv) > 1 else 100
+    cpus = os.cpu_count() or 1
+    if len(sys.argv) > 2:
+        contagens = [int(w) for w in sys.argv[2:]]
+    else:
+        contagens = sorted({1, 2, *(2 ** i for i in range(1, 8) if 2 ** i <= cpus), cpus})
+    code = gerar_entrada(tamanho_mb)
+    d = linguagem.obter()
+    d.automato()
+    print(f"Entrada: {len(code.encode('utf-8')) / 1024 / 1024:.0f} MB, {cpus} CPU(s)")
+
+    inicio = time.perf_counter()
+    fronteiras(code, max(contagens), d.delimitadores)
+    print(f"  pré-varredura ({max(contagens)} partes): {time.perf_counter() - inicio:6.2f} s")
+
+    inicio = time.perf_counter()
+    sequencial = tokenizar(code)
+    base = time.perf_counter() - inicio
+    print(f"  tokenizar():               {base:6.2f} s  ({len(sequencial):,} tokens)")
+
+    for workers in contagens:
+        with ProcessPoolExecutor(workers) as executor:
+            list(executor.map(abs, range(workers)))  # sobe os processos
+            inicio = time.perf_counter()
+            tokens = tokenizar_paralelo(code, workers, executor)
+            dt = time.perf_counter() - inicio
+        if not iguais(tokens, sequencial):
+            raise SystemExit(f"ERRO: tokens diferentes com {workers} processos")
+        print(f"  paralelo, {workers:3d} processo(s): {dt:6.2f} s  ({base / dt:.2f}x)")
+        del tokens
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+# Benchmark do Parser recursivo x ParserIterativo (pilha explícita).
+#
+# Uso: python benchmarks/bench_parser.py [comandos]
+#
+# Mede os dois motores em programas gerados (gerador.py) com os
+# três modos de rastro, confere que produzem os mesmos registros de rastro e
+# os mesmos erros, e mostra até que profundidade de aninhamento cada um chega.
+
+import io
+import os
+import sys
+import time
+
+AQUI = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(AQUI, ".."))
+sys.path.insert(0, AQUI)
+
+from nucleo import Parser, ParserIterativo, tokenizar
+from gerador import GeradorProgramas, blocos_aninhados, parenteses_profundos
+
+MOTORES = (("recursivo", Parser), ("iterativo", ParserIterativo))
+
+
+def rodar(classe, tokens, trace):
+    p = classe(tokens, trace=trace, saida=io.StringIO())
+    try:
+        p.parse_program()
+        return p, None
+    except SyntaxError as e:
+        return p, str(e)
+
+
+def medir(classe, tokens, trace, rodadas=3):
+    melhor = None
+    for _ in range(rodadas):
+        inicio = time.perf_counter()
+        rodar(classe, tokens, trace)
+        dt = time.perf_counter() - inicio
+        melhor = dt if melhor is None else min(melhor, dt)
+    return melhor
+
+
+def conferir(programas):
+    for code in programas:
+        tokens = tokenizar(code)
+        a, erro_a = rodar(Parser, tokens, "struct")
+        b, erro_b = rodar(ParserIterativo, tokens, "struct")
+        if erro_a != erro_b or a.trace.compacto() != b.trace.compacto():
+            raise SystemExit("ERRO: os motores divergiram")
+
+
+def profundidade_maxima(classe, gerar, limite=1 << 17):
+    # Maior profundidade (potência de 2) que o motor aceita
+    ok = 0
+    n = 64
+    while n <= limite:
+        try:
+            classe(tokenizar(gerar(n)), trace="off").parse_program()
+        except RecursionError:
+            break
+        ok = n
+        n *= 2
+    return ok
+
+
+def main():
+    comandos = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    code = GeradorProgramas(7, profundidade=6).programa(comandos)
+    tokens = tokenizar(code)
+
+    # Programas válidos e com um token removido (erros em pontos variados)
+    amostras = []
+    for seed in range(50):
+        programa = GeradorProgramas(seed, profundidade=5).programa(20)
+        partes = programa.split(" ")
+        del partes[seed * 7 % len(partes)]
+        amostras += [programa, " ".join(partes)]
+    conferir(amostras)
+
+    print(f"Entrada: {len(tokens):,} tokens")
+    for trace in ("off", "struct", "text"):
+        base = None
+        for nome, classe in MOTORES:
+            dt = medir(classe, tokens, trace)
+            base = base or dt
+            print(f"  trace={trace:6} {nome:10} {dt * 1000:9.1f} ms "
+                  f"{len(tokens) / dt:12,.0f} tokens/s  ({base / dt:.2f}x)")
+
+    print("\nProfundidade máxima (limite de recursão do Python: "
+          f"{sys.getrecursionlimit()})")
+    for rotulo, gerar in (("parênteses", parenteses_profundos), ("begin/end", blocos_aninhados)):
+        for nome, classe in MOTORES:
+            print(f"  {rotulo:11} {nome:10} {profundidade_maxima(classe, gerar):>8,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+# Custo do perfil por regra (perfil.py).
+#
+# Uso: python benchmarks/bench_perfil.py [comandos]
+#
+# Mede a mesma análise (analisar_sintaxe com trace="off" e analisar_arvore)
+# de um programa gerado (gerador.py) sem perfil e com o perfil
+# ligado (perfilar), confere que o resultado é o mesmo e mostra o custo do
+# perfil e o relatório.
+
+import os
+import sys
+import time
+
+AQUI = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(AQUI, ".."))
+sys.path.insert(0, AQUI)
+
+from nucleo import analisar_arvore, analisar_sintaxe
+from perfil import perfilar, relatorio
+from gerador import GeradorProgramas
+
+
+def melhor_tempo(funcao, rodadas=5):
+    melhor = None
+    for _ in range(rodadas):
+        inicio = time.perf_counter()
+        resultado = funcao()
+        dt = time.perf_counter() - inicio
+        melhor = dt if melhor is None else min(melhor, dt)
+    return resultado, melhor
+
+
+def main():
+    comandos = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    code = GeradorProgramas(seed=1).programa(comandos)
+    print(f"Programa com {comandos} comandos ({len(code) / 1024:.0f} KB)")
+    dados = None
+    for nome, funcao, args in (("sintaxe (off)", analisar_sintaxe, (code, "off")),
+                               ("árvore", analisar_arvore, (code,))):
+        sem, t_sem = melhor_tempo(lambda: funcao(*args))
+        (com, dados), t_com = melhor_tempo(lambda: perfilar(funcao, *args))
+        if sem != com:
+            raise SystemExit(f"ERRO: {nome} muda com o perfil ligado")
+        print(f"  {nome:14} sem perfil {t_sem * 1000:8.1f} ms, com perfil {t_com * 1000:8.1f} ms "
+              f"(+{100 * (t_com / t_sem - 1):.0f}%)")
+    print()
+    print(relatorio(dados))
+
+
+if __name__ == "__main__":
+    main()
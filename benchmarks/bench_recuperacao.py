@@ -0,0 +1,65 @@
+# Benchmark do modo de recuperação de erros (ParserRecuperacao).
+#
+# Uso: python benchmarks/bench_recuperacao.py [comandos] [erros]
+#
+# Compara o ciclo "corrige o primeiro erro e reenvia" (uma análise completa
+# por erro, como acontece com /parse no modo normal) com uma única passada
+# em modo de recuperação, que devolve todos os diagnósticos de uma vez.
+
+import os
+import random
+import sys
+import time
+
+AQUI = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(AQUI, ".."))
+sys.path.insert(0, AQUI)
+
+from nucleo import analisar_diagnosticos, analisar_sintaxe
+from gerador import GeradorProgramas
+
+
+def com_erros(code, erros, seed=0):
+    # Quebra "erros" atribuições escolhidas ao acaso (":= x" vira ":= * x");
+    # devolve as versões do arquivo com os erros 1..n, 2..n, ... corrigidos
+    # em ordem, simulando o usuário que corrige um erro por vez
+    linhas = code.split("\n")
+    candidatas = [i for i, linha in enumerate(linhas) if ":=" in linha]
+    escolhidas = sorted(random.Random(seed).sample(candidatas, erros))
+    versoes = []
+    for k in range(erros + 1):
+        atual = list(linhas)
+        for i in escolhidas[k:]:
+            atual[i] = atual[i].replace(":=", ":= *", 1)
+        versoes.append("\n".join(atual))
+    return versoes
+
+
+def main():
+    comandos = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    erros = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    code = GeradorProgramas(11, profundidade=3).programa(comandos)
+    versoes = com_erros(code, erros)
+
+    inicio = time.perf_counter()
+    rodadas = 0
+    for versao in versoes:
+        rodadas += 1
+        if analisar_sintaxe(versao, trace="off")["valid"]:
+            break
+    ciclo = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    resultado = analisar_diagnosticos(versoes[0])
+    passada = time.perf_counter() - inicio
+
+    encontrados = len(resultado["errors"])
+    if encontrados != erros:
+        raise SystemExit(f"ERRO: esperava {erros} diagnósticos, vieram {encontrados}")
+    print(f"Entrada: {len(code) / 1024:.0f} KB, {erros} erros")
+    print(f"  um erro por análise: {rodadas:3} análises {ciclo * 1000:9.1f} ms")
+    print(f"  recuperação:           1 análise  {passada * 1000:9.1f} ms  ({ciclo / passada:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
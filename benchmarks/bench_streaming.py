@@ -0,0 +1,88 @@
+# Benchmark das respostas em fluxo de /analyze e /upload.
+#
+# Uso: python benchmarks/bench_streaming.py [tamanho_em_MB]
+#
+# Para a mesma entrada compara a resposta montada inteira (lista de tokens +
+# JSON completo antes do primeiro byte) com as respostas em fluxo (NDJSON,
+# JSON em partes e o formato compacto). Mede o tempo até o primeiro byte, o
+# tempo total, o tamanho da resposta e o pico de memória do servidor
+# (tracemalloc, medido em uma rodada separada porque deixa tudo mais lento).
+
+import gc
+import io
+import os
+import sys
+import time
+import tracemalloc
+
+AQUI = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(AQUI, ".."))
+sys.path.insert(0, AQUI)
+
+import app as servidor
+from bench_lexer import gerar_entrada
+
+CASOS = [
+    ("/analyze JSON inteiro", "analyze", {}),
+    ("/analyze ndjson", "analyze", {"stream": "ndjson"}),
+    ("/analyze ndjson compacto", "analyze", {"stream": "ndjson", "format": "compact"}),
+    ("/analyze json em partes", "analyze", {"stream": "json"}),
+    ("/upload inteiro (com content)", "upload", {}),
+    ("/upload ndjson sem content", "upload", {"stream": "ndjson", "include_content": "0"}),
+    ("/upload compacto sem content", "upload",
+     {"stream": "ndjson", "format": "compact", "include_content": "0"}),
+]
+
+
+def requisitar(cliente, rota, opcoes, dados):
+    # O corpo do /analyze vai como text/plain (opções na query string), o do
+    # /upload como arquivo .txt: nenhum dos dois passa por um JSON de entrada
+    if rota == "analyze":
+        consulta = "&".join(f"{k}={v}" for k, v in opcoes.items())
+        return cliente.post(f"/analyze?{consulta}", data=dados, content_type="text/plain",
+                            buffered=False)
+    return cliente.post("/upload", data={"file": (io.BytesIO(dados), "entrada.txt"), **opcoes},
+                        buffered=False)
+
+
+def consumir(cliente, rota, opcoes, dados):
+    inicio = time.perf_counter()
+    resposta = requisitar(cliente, rota, opcoes, dados)
+    partes = iter(resposta.response)
+    primeiro = next(partes)
+    ttfb = time.perf_counter() - inicio
+    tamanho = len(primeiro)
+    for parte in partes:
+        tamanho += len(parte)
+    total = time.perf_counter() - inicio
+    resposta.close()
+    return ttfb, total, tamanho
+
+
+def medir(cliente, rota, opcoes, dados):
+    # Tempos sem o tracemalloc; o pico de memória em uma segunda rodada
+    servidor.cache.clear()
+    ttfb, total, tamanho = consumir(cliente, rota, opcoes, dados)
+    servidor.cache.clear()
+    gc.collect()
+    tracemalloc.start()
+    consumir(cliente, rota, opcoes, dados)
+    pico = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return ttfb, total, tamanho, pico
+
+
+def main():
+    tamanho_mb = float(sys.argv[1]) if len(sys.argv) > 1 else 10
+    dados = gerar_entrada(tamanho_mb).encode("utf-8")
+    cliente = servidor.app.test_client()
+    print(f"Entrada: {len(dados) / 1024 / 1024:.1f} MB")
+    print(f"{'caso':32} {'1º byte':>9} {'total':>8} {'resposta':>10} {'pico mem':>10}")
+    for nome, rota, opcoes in CASOS:
+        ttfb, total, tamanho, pico = medir(cliente, rota, opcoes, dados)
+        print(f"{nome:32} {ttfb * 1000:7.0f}ms {total:7.2f}s "
+              f"{tamanho / 1024 / 1024:8.1f}MB {pico / 1024 / 1024:8.1f}MB")
+
+
+if __name__ == "__main__":
+    main()
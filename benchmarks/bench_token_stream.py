@@ -0,0 +1,86 @@
+# Benchmark: lista de tuplas (lexer) x TokenStream (tokenizar), em memória e
+# em tempo.
+#
+# Uso: python benchmarks/bench_token_stream.py [tamanho_em_MB] [comandos]
+#
+# Mede com tracemalloc a memória retida pelos tokens de uma entrada gerada
+# repetindo os programas de "testes/". Os tempos são medidos à parte, sem o
+# tracemalloc (que deixa cada alocação bem mais lenta): a tokenização dessa
+# entrada e a validação com o Parser de um programa gerado (gerador.py) a
+# partir de cada representação, com o rastro "off" e com o log de texto.
+
+import io
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from nucleo import ParserIterativo, lexer, tokenizar
+from bench_lexer import gerar_entrada
+from gerador import GeradorProgramas
+
+
+def medir_memoria(construir):
+    tracemalloc.start()
+    tokens = construir()
+    memoria, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return tokens, memoria
+
+
+def medir_tempo(funcao, rodadas=3):
+    melhor = float("inf")
+    for _ in range(rodadas):
+        inicio = time.perf_counter()
+        funcao()
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor
+
+
+def tokenizar_com_linhas(code):
+    # As linhas do TokenStream são calculadas no primeiro uso; aqui entram
+    # na conta, como a linha de cada tupla
+    tokens = tokenizar(code)
+    tokens.calcular_linhas()
+    return tokens
+
+
+def validar(gerar_tokens, code, trace):
+    # Tokenização + análise sintática, como no /parse
+    def rodar():
+        ParserIterativo(gerar_tokens(code), trace=trace, saida=io.StringIO()).parse_program()
+    return rodar
+
+
+def main():
+    tamanho_mb = float(sys.argv[1]) if len(sys.argv) > 1 else 2
+    comandos = int(sys.argv[2]) if len(sys.argv) > 2 else 12000
+    code = gerar_entrada(tamanho_mb)
+    tuplas = lambda c: list(lexer(c))
+
+    lista, mem_tuplas = medir_memoria(lambda: tuplas(code))
+    n = len(lista)
+    del lista
+    _, mem_stream = medir_memoria(lambda: tokenizar_com_linhas(code))
+
+    print(f"Entrada: {len(code) / 1024 / 1024:.1f} MB, {n} tokens")
+    print(f"{'':22}{'memória':>20}{'tempo':>10}")
+    print(f"{'lista de tuplas':22}{mem_tuplas / 1024 / 1024:8.1f} MB ({mem_tuplas / n:3.0f} B/token)"
+          f"{medir_tempo(lambda: tuplas(code)):9.2f}s")
+    print(f"{'TokenStream':22}{mem_stream / 1024 / 1024:8.1f} MB ({mem_stream / n:3.0f} B/token)"
+          f"{medir_tempo(lambda: tokenizar_com_linhas(code)):9.2f}s")
+    print(f"redução de memória: {mem_tuplas / mem_stream:.1f}x")
+
+    # Validação de um programa completo consumindo cada representação
+    programa = GeradorProgramas(1).programa(comandos)
+    print(f"\nPrograma gerado: {len(programa) / 1024 / 1024:.1f} MB ({comandos} comandos)")
+    for trace in ("off", "text"):
+        for nome, gerar in (("tuplas", tuplas), ("TokenStream", tokenizar)):
+            dt = medir_tempo(validar(gerar, programa, trace), rodadas=1 if trace == "text" else 3)
+            print(f"Parser {trace:4} ({nome}):{'':{12 - len(nome)}}{dt:8.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+# Benchmark dos modos de rastro do Parser: texto, estruturado e desligado.
+#
+# Uso: python benchmarks/bench_trace.py [comandos]
+#
+# Valida um programa com o número pedido de comandos no corpo principal e
+# mostra tokens/s em cada modo. O modo texto imprime em um StringIO, como o
+# endpoint /parse fazia.
+
+import contextlib
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from nucleo import Parser, tokenizar
+
+CORPO = """    x := (x + 1) * 2 - y / 3;
+    if x >= 10 then
+        begin
+            writeln('maior', x);
+            y := y + 1;
+        end
+    else
+        x := x + 1;
+    while y < 10 do
+        y := y + 1;
+"""
+
+
+def gerar_programa(comandos):
+    blocos = max(1, comandos // 3)
+    return "program bench;\nvar x, y: integer;\nbegin\n" + CORPO * blocos + "end.\n"
+
+
+def medir(tokens, trace, rodadas=3):
+    melhor = None
+    for _ in range(rodadas):
+        inicio = time.perf_counter()
+        if trace == "text":
+            with contextlib.redirect_stdout(io.StringIO()):
+                Parser(tokens, trace="text").parse_program()
+        else:
+            Parser(tokens, trace=trace).parse_program()
+        dt = time.perf_counter() - inicio
+        melhor = dt if melhor is None else min(melhor, dt)
+    return melhor
+
+
+def main():
+    comandos = int(sys.argv[1]) if len(sys.argv) > 1 else 30000
+    tokens = tokenizar(gerar_programa(comandos))
+    n = len(tokens)
+
+    # Confere que o rastro estruturado reproduz os logs do modo texto
+    buf = io.StringIO()
+    with contextlib.redirect_stdout(buf):
+        Parser(tokens).parse_program()
+    p = Parser(tokens, trace="struct")
+    p.parse_program()
+    if p.trace.render(tokens) != buf.getvalue().splitlines():
+        raise SystemExit("ERRO: o rastro estruturado não reproduz os logs de texto")
+
+    print(f"Programa com {n} tokens, {len(p.trace)} eventos de rastro")
+    base = None
+    for trace in ("text", "struct", "off"):
+        dt = medir(tokens, trace)
+        base = base or dt
+        print(f"{trace:>6}: {dt:.3f} s -> {n / dt:,.0f} tokens/s ({base / dt:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+# Teste de carga do endpoint /parse com requisições concorrentes.
+#
+# Uso: python benchmarks/carga_parse.py [requisicoes] [threads]
+#
+# Sobe o app em um servidor WSGI local com threads, dispara requisições
+# simultâneas com programas diferentes (cada um com identificadores
+# próprios) e confere que os logs devolvidos a cada cliente são exatamente
+# os do seu programa, sem pedaços de outras requisições. Depois compara
+# requisições/s com 1 thread cliente e com várias, e com um servidor sem
+# threads.
+
+import io
+import json
+import os
+import sys
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from werkzeug.serving import WSGIRequestHandler, make_server
+
+from app import Parser, app, tokenizar
+
+
+def programa(i):
+    return (f"program p{i};\nvar a{i}, b{i}: integer;\nbegin\n"
+            + f"    a{i} := {i};\n    b{i} := a{i} * 2 + (a{i} - 1);\n" * 20
+            + f"    while a{i} < b{i} do\n        a{i} := a{i} + 1;\n"
+            + "end.\n")
+
+
+def logs_esperados(code):
+    buf = io.StringIO()
+    Parser(tokenizar(code), saida=buf).parse_program()
+    return buf.getvalue().splitlines()
+
+
+def postar(url, code):
+    req = urllib.request.Request(url, data=json.dumps({"code": code}).encode(),
+                                 headers={"Content-Type": "application/json"})
+    with urllib.request.urlopen(req) as resp:
+        return json.loads(resp.read())
+
+
+class SemLog(WSGIRequestHandler):
+    def log_request(self, *args, **kwargs):
+        pass
+
+
+def rodar(threaded, requisicoes, clientes, esperados):
+    servidor = make_server("127.0.0.1", 0, app, threaded=threaded, request_handler=SemLog)
+    t = threading.Thread(target=servidor.serve_forever, daemon=True)
+    t.start()
+    url = f"http://127.0.0.1:{servidor.server_port}/parse"
+    erros = 0
+
+    def um(i):
+        code = programa(i % len(esperados))
+        resposta = postar(url, code)
+        return resposta["valid"] and resposta["logs"] == esperados[i % len(esperados)]
+
+    try:
+        inicio = time.perf_counter()
+        with ThreadPoolExecutor(clientes) as pool:
+            for ok in pool.map(um, range(requisicoes)):
+                erros += not ok
+        dt = time.perf_counter() - inicio
+    finally:
+        servidor.shutdown()
+    return requisicoes / dt, erros
+
+
+def main():
+    requisicoes = int(sys.argv[1]) if len(sys.argv) > 1 else 400
+    clientes = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    esperados = [logs_esperados(programa(i)) for i in range(32)]
+
+    for threaded, n in ((True, 1), (True, clientes), (False, clientes)):
+        rps, erros = rodar(threaded, requisicoes, n, esperados)
+        servidor = "com threads" if threaded else "sem threads"
+        print(f"servidor {servidor}, {n:2d} clientes: {rps:7.1f} req/s, "
+              f"{erros} respostas com logs trocados ou incompletos")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+# Teste de carga do modo de produção (pool de processos com fila limitada).
+#
+# Uso: python benchmarks/carga_servidor.py [requisicoes] [clientes] [fila]
+#
+# Dispara requisições /parse concorrentes, a maioria com programas pequenos e
+# algumas (1 em 20) com um programa enorme, que estoura o tempo limite. Mede
+# a latência das requisições pequenas (p50/p99), conta as recusas por fila
+# cheia (503, que o cliente repete depois de 0,1 s) e o status final de cada
+# requisição (504: tempo limite) em dois modos:
+#   - desenvolvimento: a análise roda na thread da requisição, sem limites;
+#   - produção: a análise roda no pool (trabalhos.py), com fila e tempo limite.
+# Cada requisição manda um programa diferente, para não cair no cache.
+
+import json
+import os
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from werkzeug.serving import WSGIRequestHandler, make_server
+
+import app as servidor_web
+
+TEMPO_LIMITE = 2.0
+A_CADA = 20   # uma requisição enorme a cada A_CADA
+ESPERA_503 = 0.1
+
+
+def programa(i, repeticoes=20):
+    return (f"program p{i};\nvar a{i}, b{i}: integer;\nbegin\n"
+            + f"    a{i} := {i};\n    b{i} := a{i} * 2 + (a{i} - 1);\n" * repeticoes
+            + f"    a{i} := 0\nend.\n")
+
+
+def postar(url, code):
+    req = urllib.request.Request(url, data=json.dumps({"code": code, "trace": "off"}).encode(),
+                                 headers={"Content-Type": "application/json"})
+    try:
+        with urllib.request.urlopen(req) as resp:
+            resp.read()
+            return resp.status
+    except urllib.error.HTTPError as e:
+        e.read()
+        return e.code
+
+
+class SemLog(WSGIRequestHandler):
+    def log_request(self, *args, **kwargs):
+        pass
+
+
+def percentil(valores, p):
+    valores = sorted(valores)
+    return valores[min(len(valores) - 1, int(len(valores) * p))]
+
+
+def rodar(producao, requisicoes, clientes):
+    servidor_web.app.config["ANALISADOR_PRODUCAO"] = producao
+    servidor_web.cache.clear()
+    servidor = make_server("127.0.0.1", 0, servidor_web.app, threaded=True, request_handler=SemLog)
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{servidor.server_port}/parse"
+    enorme = programa(-1, 50_000)
+
+    def um(i):
+        grande = i % A_CADA == A_CADA - 1
+        code = f"/* {i} */" + enorme if grande else programa(i)
+        inicio = time.perf_counter()
+        recusas = 0
+        # Fila cheia: o cliente tenta de novo um pouco depois (a latência
+        # conta desde a primeira tentativa)
+        while (status := postar(url, code)) == 503:
+            recusas += 1
+            time.sleep(ESPERA_503)
+        return grande, status, time.perf_counter() - inicio, recusas
+
+    try:
+        inicio = time.perf_counter()
+        with ThreadPoolExecutor(clientes) as pool:
+            resultados = list(pool.map(um, range(requisicoes)))
+        total = time.perf_counter() - inicio
+    finally:
+        servidor.shutdown()
+        servidor.server_close()
+    pequenas = [dt for grande, status, dt, _ in resultados if not grande and status == 200]
+    contagem = {}
+    for _, status, _, _ in resultados:
+        contagem[status] = contagem.get(status, 0) + 1
+    recusas = sum(r[3] for r in resultados)
+    return pequenas, contagem, recusas, total
+
+
+def main():
+    requisicoes = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    clientes = int(sys.argv[2]) if len(sys.argv) > 2 else 16
+    fila = int(sys.argv[3]) if len(sys.argv) > 3 else 8
+    gerenciador = servidor_web.trabalhos(max_fila=fila, tempo_limite=TEMPO_LIMITE)
+    print(f"{requisicoes} requisições, {clientes} clientes, {gerenciador.workers} workers, "
+          f"fila de {fila}, tempo limite de {TEMPO_LIMITE:g} s")
+    try:
+        for producao in (False, True):
+            pequenas, contagem, recusas, total = rodar(producao, requisicoes, clientes)
+            nome = "produção      " if producao else "desenvolvimento"
+            print(f"{nome}: p50 {percentil(pequenas, 0.5) * 1000:7.1f} ms, "
+                  f"p99 {percentil(pequenas, 0.99) * 1000:7.1f} ms, "
+                  f"status {dict(sorted(contagem.items()))}, {recusas} recusas (503), "
+                  f"{total:.1f} s no total")
+    finally:
+        gerenciador.fechar()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,229 @@
+# Suíte de benchmarks do lexer e do Parser com programas sintéticos.
+#
+# Uso:
+#   python benchmarks/suite.py                        (roda e grava o JSON)
+#   python benchmarks/suite.py --rapido               (entradas menores)
+#   python benchmarks/suite.py --comparar base.json   (compara com uma execução anterior)
+#
+# Para cada caso (programas gerados por gerador.py e entradas
+# adversariais) mede:
+#   - tokens/s de app.lexer (motores regex e dfa) e de analisador.lexer;
+#   - tempo do Parser e do ParserIterativo (trace="off") sobre os tokens
+#     já prontos;
+#   - pico de memória (tracemalloc, em uma rodada separada para não distorcer
+#     os tempos);
+#   - tempo por regra da gramática (acumulado e próprio, sem as sub-regras).
+# O resultado vai para benchmarks/resultados/<data>-<commit>.json, junto com a
+# versão do Python e o commit, para comparar versões diferentes do código.
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+AQUI = os.path.dirname(os.path.abspath(__file__))
+RAIZ = os.path.join(AQUI, "..")
+sys.path.insert(0, RAIZ)
+sys.path.insert(0, AQUI)
+
+import analisador
+from nucleo import Parser, ParserIterativo, lexer, tokenizar
+from perfil import perfilar
+from gerador import (GeradorProgramas, blocos_aninhados, comentario_gigante,
+                     identificadores_longos, parenteses_profundos)
+
+DIRETORIO_RESULTADOS = os.path.join(AQUI, "resultados")
+# Variação (em %) a partir da qual --comparar marca a métrica
+LIMIAR_PADRAO = 10.0
+
+
+def casos(rapido=False):
+    escala = 1 if rapido else 10
+    gerador = GeradorProgramas
+    return [
+        ("pequeno", gerador(1, profundidade=3).programa(50 * escala)),
+        ("medio", gerador(2, profundidade=4).programa(500 * escala)),
+        ("grande", gerador(3, profundidade=4).programa(5000 * escala)),
+        ("aninhado", gerador(4, profundidade=12).programa(200 * escala)),
+        ("comentario_gigante", comentario_gigante(200_000 * escala)),
+        ("ids_longos", identificadores_longos(2000, comandos=50 * escala)),
+        ("blocos_profundos", blocos_aninhados(100)),
+        ("parenteses_profundos", parenteses_profundos(2000)),
+    ]
+
+
+def melhor_tempo(funcao, rodadas):
+    melhor = None
+    resultado = None
+    for _ in range(rodadas):
+        inicio = time.perf_counter()
+        resultado = funcao()
+        dt = time.perf_counter() - inicio
+        melhor = dt if melhor is None else min(melhor, dt)
+    return resultado, melhor
+
+
+def pico_memoria(funcao):
+    tracemalloc.start()
+    try:
+        funcao()
+    except (SyntaxError, RecursionError):
+        pass
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return pico
+
+
+def tempo_por_regra(tokens):
+    # Perfil por regra da gramática (perfil.py): chamadas, tempo total e
+    # próprio (descontando as sub-regras) e tokens consumidos
+    _, dados = perfilar(lambda: Parser(tokens, trace="off").parse_program())
+    return {r.pop("rule"): r for r in dados["rules"]}
+
+
+def medir_caso(nome, code, rodadas):
+    resultado = {"bytes": len(code.encode("utf-8")), "lines": code.count("\n") + 1}
+
+    for engine in ("regex", "dfa"):
+        total, dt = melhor_tempo(lambda: sum(1 for _ in lexer(code, engine)), rodadas)
+        resultado[f"app_lexer_{engine}"] = {"tokens": total, "seconds": dt, "tokens_per_s": total / dt}
+    total, dt = melhor_tempo(lambda: sum(1 for _ in analisador.lexer(code)), rodadas)
+    resultado["analisador_lexer"] = {"tokens": total, "seconds": dt, "tokens_per_s": total / dt}
+
+    tokens, dt = melhor_tempo(lambda: tokenizar(code), rodadas)
+    resultado["tokenizar"] = {"tokens": len(tokens), "seconds": dt, "tokens_per_s": len(tokens) / dt}
+    resultado["lexer_peak_bytes"] = pico_memoria(lambda: tokenizar(code))
+
+    # Entradas adversariais podem estourar o limite de recursão: isso também é
+    # um resultado e fica registrado em vez de interromper a suíte
+    try:
+        _, dt = melhor_tempo(lambda: Parser(tokens, trace="off").parse_program(), rodadas)
+        resultado["parser"] = {"seconds": dt, "tokens_per_s": len(tokens) / dt}
+        resultado["parser_peak_bytes"] = pico_memoria(
+            lambda: Parser(tokenizar(code), trace="off").parse_program())
+        resultado["rules"] = tempo_por_regra(tokens)
+    except RecursionError as e:
+        resultado["parser"] = {"error": f"RecursionError: {e}"}
+    except SyntaxError as e:
+        resultado["parser"] = {"error": f"SyntaxError: {str(e).strip()}"}
+
+    try:
+        _, dt = melhor_tempo(lambda: ParserIterativo(tokens, trace="off").parse_program(), rodadas)
+        resultado["parser_iterativo"] = {"seconds": dt, "tokens_per_s": len(tokens) / dt}
+    except SyntaxError as e:
+        resultado["parser_iterativo"] = {"error": f"SyntaxError: {str(e).strip()}"}
+    return resultado
+
+
+def metadados():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=RAIZ,
+                                capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "date": datetime.datetime.now().isoformat(timespec="seconds"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+    }
+
+
+# --- Comparação entre execuções ---
+
+METRICAS = [
+    # (caminho no resultado, maior é melhor)
+    (("app_lexer_regex", "tokens_per_s"), True),
+    (("app_lexer_dfa", "tokens_per_s"), True),
+    (("analisador_lexer", "tokens_per_s"), True),
+    (("tokenizar", "tokens_per_s"), True),
+    (("parser", "tokens_per_s"), True),
+    (("parser_iterativo", "tokens_per_s"), True),
+    (("lexer_peak_bytes",), False),
+    (("parser_peak_bytes",), False),
+]
+
+
+def _valor(resultado, caminho):
+    for chave in caminho:
+        if not isinstance(resultado, dict) or chave not in resultado:
+            return None
+        resultado = resultado[chave]
+    return resultado
+
+
+def comparar(base, atual, limiar=LIMIAR_PADRAO):
+    regressoes = 0
+    print(f"\nComparação: {base['meta'].get('commit')} -> {atual['meta'].get('commit')}")
+    for caso, medidas in atual["cases"].items():
+        anterior = base["cases"].get(caso)
+        if anterior is None:
+            continue
+        for caminho, maior_melhor in METRICAS:
+            a, b = _valor(anterior, caminho), _valor(medidas, caminho)
+            if not a or b is None:
+                continue
+            variacao = (b - a) / a * 100
+            piorou = variacao < -limiar if maior_melhor else variacao > limiar
+            melhorou = variacao > limiar if maior_melhor else variacao < -limiar
+            marca = "REGRESSÃO" if piorou else ("melhora" if melhorou else "")
+            regressoes += piorou
+            print(f"  {caso:22} {'.'.join(caminho):32} {a:14.1f} -> {b:14.1f} {variacao:+7.1f}% {marca}")
+    return regressoes
+
+
+def imprimir(resultados):
+    print(f"{'caso':22} {'KB':>8} {'regex tok/s':>12} {'dfa tok/s':>12} "
+          f"{'analisador':>12} {'parser tok/s':>12} {'pico lexer':>11}")
+    for caso, r in resultados.items():
+        parser = r["parser"].get("tokens_per_s")
+        print(f"{caso:22} {r['bytes'] / 1024:8.0f} "
+              f"{r['app_lexer_regex']['tokens_per_s']:12,.0f} "
+              f"{r['app_lexer_dfa']['tokens_per_s']:12,.0f} "
+              f"{r['analisador_lexer']['tokens_per_s']:12,.0f} "
+              f"{(f'{parser:12,.0f}' if parser else r['parser']['error'][:12]):>12} "
+              f"{r['lexer_peak_bytes'] / 1024:9.0f}KB")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks do lexer e do Parser.")
+    parser.add_argument("--rapido", action="store_true", help="entradas menores")
+    parser.add_argument("--rodadas", type=int, default=3, help="rodadas por medida (vale a melhor)")
+    parser.add_argument("--saida", help="arquivo JSON de saída")
+    parser.add_argument("--comparar", metavar="BASE", help="JSON de uma execução anterior")
+    parser.add_argument("--limiar", type=float, default=LIMIAR_PADRAO,
+                        help="variação em %% considerada regressão")
+    args = parser.parse_args(argv)
+
+    resultados = {}
+    for nome, code in casos(args.rapido):
+        print(f"medindo {nome}...", file=sys.stderr)
+        resultados[nome] = medir_caso(nome, code, args.rodadas)
+    atual = {"meta": metadados(), "cases": resultados}
+    imprimir(resultados)
+
+    saida = args.saida
+    if saida is None:
+        os.makedirs(DIRETORIO_RESULTADOS, exist_ok=True)
+        data = datetime.datetime.now().strftime("%Y%m%d-%H%M%S")
+        saida = os.path.join(DIRETORIO_RESULTADOS, f"{data}-{atual['meta']['commit'] or 'local'}.json")
+    with open(saida, "w", encoding="utf-8") as f:
+        json.dump(atual, f, ensure_ascii=False, indent=2)
+    print(f"\nResultados gravados em {saida}")
+
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as f:
+            base = json.load(f)
+        if comparar(base, atual, args.limiar):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,149 @@
+import hashlib
+import importlib.util
+import json
+import os
+import threading
+from collections import OrderedDict
+
+# ==============================================================================
+# CACHE DE RESULTADOS ENDEREÇADO POR CONTEÚDO
+# ==============================================================================
+#
+# Guarda a resposta JSON já serializada de /analyze e /parse, indexada pelo
+# hash do texto-fonte (mais o endpoint e as opções da requisição). Reenvios
+# do mesmo código devolvem os bytes prontos, sem rodar lexer nem Parser.
+# A política de remoção é LRU, limitada por número de entradas e por bytes;
+# opcionalmente as entradas também são gravadas em disco e recarregadas
+# depois de um reinício.
+#
+# A chave inclui uma versão: o formato das entradas (FORMATO) mais o hash do
+# código que gera as respostas (versao_do_codigo). Entradas gravadas em disco
+# por uma versão anterior do analisador (outras mensagens de erro, outras
+# linhas, outro JSON) deixam de ser encontradas em vez de servir a resposta
+# antiga, como os autômatos compilados em linguagem.py.
+
+FORMATO = 1   # muda quando o conteúdo das entradas muda de formato
+
+
+def versao_do_codigo(*modulos):
+    """Hash de FORMATO e dos arquivos-fonte dos módulos (pelo nome, sem importá-los)."""
+    h = hashlib.sha256(str(FORMATO).encode('ascii'))
+    for nome in modulos:
+        spec = importlib.util.find_spec(nome)
+        with open(spec.origin, 'rb') as f:
+            h.update(f.read())
+        h.update(b'\0')
+    return h.hexdigest()[:16]
+
+
+class CacheResultados:
+    def __init__(self, max_entradas=1024, max_bytes=64 * 1024 * 1024, diretorio=None,
+                 versao=None):
+        self.versao = versao if versao is not None else versao_do_codigo()
+        self.max_entradas = max_entradas
+        self.max_bytes = max_bytes
+        self.diretorio = diretorio
+        self._dados = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+        self.evictions = 0
+        if diretorio:
+            os.makedirs(diretorio, exist_ok=True)
+
+    def chave(self, endpoint, code, *opcoes):
+        # Versão, rota e opções vão como uma lista JSON: cada parte fica
+        # delimitada (um \0 ou uma vírgula dentro de uma opção, como a entrada
+        # do /run, é escapado) e o JSON nunca contém o byte \0, então o
+        # primeiro \0 o separa da fonte, que entra no hash sem ser copiada
+        h = hashlib.sha256()
+        h.update(json.dumps([self.versao, endpoint, *opcoes], default=str).encode('ascii'))
+        h.update(b'\0')
+        h.update(code.encode('utf-8', errors='surrogatepass'))
+        return h.hexdigest()
+
+    def get(self, chave):
+        with self._lock:
+            corpo = self._dados.get(chave)
+            if corpo is not None:
+                self._dados.move_to_end(chave)
+                self.hits += 1
+                return corpo
+        corpo = self._ler_disco(chave)
+        with self._lock:
+            if corpo is None:
+                self.misses += 1
+                return None
+            self.disk_hits += 1
+            self._inserir(chave, corpo)
+        return corpo
+
+    def put(self, chave, corpo):
+        with self._lock:
+            self._inserir(chave, corpo)
+        self._gravar_disco(chave, corpo)
+
+    def _inserir(self, chave, corpo):
+        # Chamado com o lock adquirido
+        if len(corpo) > self.max_bytes:
+            return
+        antigo = self._dados.pop(chave, None)
+        if antigo is not None:
+            self._bytes -= len(antigo)
+        self._dados[chave] = corpo
+        self._bytes += len(corpo)
+        while len(self._dados) > self.max_entradas or self._bytes > self.max_bytes:
+            _, removido = self._dados.popitem(last=False)
+            self._bytes -= len(removido)
+            self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._dados.clear()
+            self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            consultas = self.hits + self.disk_hits + self.misses
+            return {
+                "entries": len(self._dados),
+                "bytes": self._bytes,
+                "max_entries": self.max_entradas,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": (self.hits + self.disk_hits) / consultas if consultas else 0.0,
+                "directory": self.diretorio,
+                "version": self.versao,
+            }
+
+    # --- Persistência opcional em disco ---
+    def _caminho(self, chave):
+        return os.path.join(self.diretorio, chave[:2], chave + ".json")
+
+    def _ler_disco(self, chave):
+        if not self.diretorio:
+            return None
+        try:
+            with open(self._caminho(chave), 'rb') as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def _gravar_disco(self, chave, corpo):
+        if not self.diretorio:
+            return
+        caminho = self._caminho(chave)
+        try:
+            os.makedirs(os.path.dirname(caminho), exist_ok=True)
+            temporario = f"{caminho}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(temporario, 'wb') as f:
+                f.write(corpo)
+            os.replace(temporario, caminho)
+        except OSError:
+            # O disco é só um complemento: falhas de escrita não derrubam a requisição
+            pass
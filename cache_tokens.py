@@ -0,0 +1,191 @@
+import contextlib
+import hashlib
+import mmap
+import os
+import shutil
+import struct
+import sys
+import tempfile
+from array import array
+
+# ==============================================================================
+# CACHE BINÁRIO DO FLUXO DE TOKENS
+# ==============================================================================
+#
+# Guarda, ao lado do arquivo-fonte, os tokens já reconhecidos: um cabeçalho
+# com o hash SHA-256 da fonte e a versão da especificação do lexer (8 bytes do
+# hash do dialeto, ver linguagem.py), a tabela de nomes dos tipos e, para cada
+# token, o código do tipo (1 byte) e os deslocamentos em bytes do início e do
+# fim do lexema na fonte. Numa nova execução, se o hash e a versão batem, o
+# arquivo é mapeado em memória (mmap) e os tokens saem direto dele, sem passar
+# pelo lexer.
+#
+# Layout: cabeçalho | nomes (UTF-8, separados por "\n") | tipos (n bytes) |
+# inícios (n inteiros) | fins (n inteiros), com as seções alinhadas em 8 bytes.
+
+EXTENSAO = ".tokens"
+MAGICO = b"TOKC"
+VERSAO_FORMATO = 1
+_CABECALHO = struct.Struct("<4sHBB8s32sQQI")
+_ORDEM = 0 if sys.byteorder == "little" else 1
+
+
+def hash_fonte(dados):
+    return hashlib.sha256(dados).digest()
+
+
+def _alinhar(n):
+    return (n + 7) & ~7
+
+
+class GravadorCache:
+    """Grava o cache em <caminho> à medida que os tokens chegam.
+
+    Os tipos vão direto para o arquivo temporário, logo depois do cabeçalho
+    e dos nomes; inícios e fins vão para dois temporários auxiliares, em
+    lotes. salvar() emenda os auxiliares ao arquivo (em blocos), regrava o
+    cabeçalho com o número de tokens e troca o arquivo no lugar do cache, então
+    a memória não cresce com a fonte. tamanho_fonte decide a largura dos
+    inteiros; se ainda não é conhecido (fonte lida em fluxo), usa 8 bytes.
+    """
+
+    LOTE = 1 << 16
+
+    def __init__(self, caminho, nomes, tamanho_fonte=None):
+        self.caminho = caminho
+        self.nomes = list(nomes)
+        self.codigos = {nome: i for i, nome in enumerate(self.nomes)}
+        self.largura = 4 if tamanho_fonte is not None and tamanho_fonte < (1 << 32) else 8
+        typecode = 'I' if self.largura == 4 else 'Q'
+        self.n = 0
+        self.kinds = array('B')
+        self.starts = array(typecode)
+        self.ends = array(typecode)
+        self._nomes = "\n".join(self.nomes).encode("utf-8")
+        self._temporario = f"{caminho}.{os.getpid()}.tmp"
+        self._arquivo = open(self._temporario, 'wb')
+        try:
+            diretorio = os.path.dirname(os.path.abspath(caminho))
+            self._inicios = tempfile.TemporaryFile(dir=diretorio)
+            self._fins = tempfile.TemporaryFile(dir=diretorio)
+            inicio = _CABECALHO.size + len(self._nomes)
+            self._arquivo.write(bytes(_CABECALHO.size))
+            self._arquivo.write(self._nomes)
+            self._arquivo.write(bytes(_alinhar(inicio) - inicio))
+        except BaseException:
+            self.descartar()
+            raise
+
+    def append(self, kind, start, end):
+        self.kinds.append(self.codigos[kind])
+        self.starts.append(start)
+        self.ends.append(end)
+        if len(self.kinds) >= self.LOTE:
+            self._descarregar()
+
+    def _descarregar(self):
+        self.n += len(self.kinds)
+        self.kinds.tofile(self._arquivo)
+        self.starts.tofile(self._inicios)
+        self.ends.tofile(self._fins)
+        del self.kinds[:], self.starts[:], self.ends[:]
+
+    def salvar(self, hash_da_fonte, versao, tamanho_fonte):
+        self._descarregar()
+        f = self._arquivo
+        tamanho = _alinhar(_CABECALHO.size + len(self._nomes)) + self.n
+        for auxiliar in (self._inicios, self._fins):
+            f.write(bytes(_alinhar(tamanho) - tamanho))
+            auxiliar.seek(0)
+            shutil.copyfileobj(auxiliar, f, 1 << 20)
+            tamanho = _alinhar(tamanho) + self.n * self.largura
+        f.seek(0)
+        f.write(_CABECALHO.pack(MAGICO, VERSAO_FORMATO, _ORDEM, self.largura, versao,
+                                hash_da_fonte, tamanho_fonte, self.n, len(self._nomes)))
+        f.close()
+        self._inicios.close()
+        self._fins.close()
+        os.replace(self._temporario, self.caminho)
+
+    def descartar(self):
+        # Análise interrompida (erro léxico, gerador abandonado): nada é gravado
+        for arquivo in (self._arquivo, getattr(self, '_inicios', None),
+                        getattr(self, '_fins', None)):
+            if arquivo is not None:
+                arquivo.close()
+        with contextlib.suppress(OSError):
+            os.remove(self._temporario)
+
+
+class TokensEmCache:
+    """Tokens lidos de um arquivo de cache mapeado em memória.
+
+    Os valores são fatiados (e decodificados) da fonte só quando pedidos.
+    """
+
+    def __init__(self, arquivo, fonte):
+        self._arquivo = arquivo
+        self._mm = mmap.mmap(arquivo.fileno(), 0, access=mmap.ACCESS_READ)
+        self.fonte = fonte
+        (_, _, _, largura, _, _, _, n, tamanho_nomes) = _CABECALHO.unpack_from(self._mm, 0)
+        pos = _CABECALHO.size
+        self.nomes = bytes(self._mm[pos:pos + tamanho_nomes]).decode("utf-8").split("\n")
+        pos = _alinhar(pos + tamanho_nomes)
+        visao = memoryview(self._mm)
+        self._visao = visao
+        self.kinds = visao[pos:pos + n]
+        pos = _alinhar(pos + n)
+        typecode = 'I' if largura == 4 else 'Q'
+        self.starts = visao[pos:pos + n * largura].cast(typecode)
+        pos = _alinhar(pos + n * largura)
+        self.ends = visao[pos:pos + n * largura].cast(typecode)
+
+    def __len__(self):
+        return len(self.kinds)
+
+    def kind(self, i):
+        return self.nomes[self.kinds[i]]
+
+    def value(self, i):
+        return self.fonte[self.starts[i]:self.ends[i]].decode("utf-8")
+
+    def __iter__(self):
+        nomes = self.nomes
+        fonte = self.fonte
+        for k, s, e in zip(self.kinds, self.starts, self.ends):
+            yield nomes[k], fonte[s:e].decode("utf-8")
+
+    def close(self):
+        # As visões precisam ser liberadas antes de fechar o mmap
+        for visao in (self.kinds, self.starts, self.ends, self._visao):
+            visao.release()
+        self._mm.close()
+        self._arquivo.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def carregar(caminho, fonte, hash_da_fonte, versao):
+    """Abre o cache se ele corresponde à fonte e à versão do lexer; senão None."""
+    try:
+        arquivo = open(caminho, 'rb')
+    except OSError:
+        return None
+    try:
+        cabecalho = arquivo.read(_CABECALHO.size)
+        if len(cabecalho) < _CABECALHO.size:
+            raise ValueError
+        (magico, formato, ordem, _, versao_cache, hash_cache, tamanho, _, _) = \
+            _CABECALHO.unpack(cabecalho)
+        if (magico != MAGICO or formato != VERSAO_FORMATO or ordem != _ORDEM
+                or versao_cache != versao or hash_cache != hash_da_fonte
+                or tamanho != len(fonte)):
+            raise ValueError
+        return TokensEmCache(arquivo, fonte)
+    except (ValueError, TypeError, struct.error):
+        arquivo.close()
+        return None
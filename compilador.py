@@ -0,0 +1,578 @@
+from array import array
+
+from arvore import (ATRIBUICAO, BINARIO, BLOCO, BOOLEANO, DECLARACAO, ENQUANTO, ESCRITA,
+                    LEITURA, NUMERO, PROGRAMA, SE, TEXTO, UNARIO, VARIAVEL)
+
+# ==============================================================================
+# COMPILADOR PARA BYTECODE E INTERPRETADOR
+# ==============================================================================
+#
+# compilar(arvore) traduz a AST de um programa válido (Parser com
+# trace="ast", ver arvore.py) para um Programa e executar(programa, entrada)
+# roda esse programa.
+#
+# O bytecode é de registradores: cada instrução tem uma operação e até três
+# operandos (a, b, c), guardados em arrays paralelos como os nós da AST. Os
+# operandos são índices de "registradores" em uma lista única: primeiro as
+# variáveis, depois as constantes e os temporários das expressões, na ordem
+# em que o compilador os criou. Assim "x := x + 1" é uma instrução só
+# (ADD x, x, <1>) e nenhuma variável é procurada pelo nome durante a execução.
+#
+# O compilador também confere o que o Parser não confere: variáveis
+# declaradas, tipos (integer/boolean) de atribuições, operações e condições,
+# e constantes dentro da faixa de 64 bits (ErroSemantico). Durante a execução,
+# divisão por zero, estouro de inteiro e entrada inválida param o programa
+# (ErroExecucao), assim como os limites para código não confiável
+# (LimiteExcedido):
+#   - max_instrucoes: instruções executadas. Um trecho sem desvios (de onde
+#     a execução chega até o próximo salto ou HALT, inclusive) sempre roda
+#     inteiro, então o interpretador cobra o tamanho do trecho ao entrar nele
+#     (Programa.trechos) e não a cada instrução. Um trecho que não cabe no
+#     que resta do limite nem começa: nenhum programa executa mais que
+#     max_instrucoes instruções, e a contagem é a exata;
+#   - max_saida: caracteres escritos.
+
+OPERACOES = (
+    "MOVE",         # a := b
+    "ADD",          # a := b + c
+    "SUB",          # a := b - c
+    "MUL",          # a := b * c
+    "DIV",          # a := b / c (inteira, truncada em direção a zero)
+    "NEG",          # a := -b
+    "JUMP",         # salta para c
+    "JFALSE",       # salta para c se a é falso
+    "JLT",          # salta para c se a < b
+    "JLE",
+    "JGT",
+    "JGE",
+    "JEQ",
+    "JNE",
+    "READ_INT",     # lê um inteiro para a
+    "READ_BOOL",    # lê true/false para a
+    "READLN",       # descarta o resto da linha de entrada
+    "WRITE",        # escreve a (inteiro ou texto)
+    "WRITE_BOOL",   # escreve a como TRUE/FALSE
+    "WRITELN",      # escreve a quebra de linha
+    "HALT",
+)
+(MOVE, ADD, SUB, MUL, DIV, NEG, JUMP, JFALSE, JLT, JLE, JGT, JGE, JEQ, JNE,
+ READ_INT, READ_BOOL, READLN, WRITE, WRITE_BOOL, WRITELN, HALT) = range(len(OPERACOES))
+# Operações depois das quais a execução pode não seguir para a próxima
+_DESVIOS = frozenset({JUMP, JFALSE, JLT, JLE, JGT, JGE, JEQ, JNE, HALT})
+
+INTEIRO = "integer"
+LOGICO = "boolean"
+_TEXTO = "texto"
+
+MIN_INTEIRO = -(1 << 63)
+MAX_INTEIRO = (1 << 63) - 1
+MAX_INSTRUCOES = 10_000_000
+MAX_SAIDA = 1 << 20
+
+# Operador relacional -> salto quando a relação é falsa
+_SALTO_SE_FALSO = {"<": JGE, "<=": JGT, ">": JLE, ">=": JLT, "=": JNE, "<>": JEQ}
+_ARITMETICA = {"+": ADD, "-": SUB, "*": MUL, "/": DIV}
+
+
+class ErroSemantico(Exception):
+    """Programa sintaticamente válido que não pode ser compilado."""
+
+    def __init__(self, mensagem, linha=None):
+        super().__init__(f"Erro semântico na linha {linha}: {mensagem}" if linha else mensagem)
+        self.linha = linha
+
+
+class ErroExecucao(Exception):
+    # linha: do comando que falhou; saida: o que o programa escreveu até ali;
+    # instrucoes: as executadas até ali (inclusive a que falhou)
+    linha = None
+    saida = ""
+    instrucoes = 0
+
+
+class LimiteExcedido(ErroExecucao):
+    pass
+
+
+def _div(x, y):
+    q = x // y
+    if q < 0 and q * y != x:
+        q += 1
+    return q
+
+
+class Programa:
+    def __init__(self):
+        self.ops = array('B')
+        self.a = array('i')
+        self.b = array('i')
+        self.c = array('i')
+        self.linhas = array('I')   # linha do fonte de cada instrução
+        self.trechos = array('I')  # instruções de cada posição até o próximo desvio, inclusive
+        self.registros = []        # valores iniciais (variáveis, constantes, temporários)
+        self.variaveis = {}        # nome (como declarado) -> (registro, tipo)
+
+    def __len__(self):
+        return len(self.ops)
+
+    def emitir(self, op, a=0, b=0, c=0, linha=0):
+        self.ops.append(op)
+        self.a.append(a)
+        self.b.append(b)
+        self.c.append(c)
+        self.linhas.append(linha)
+        return len(self.ops) - 1
+
+    def calcular_trechos(self):
+        # De trás para a frente: cada desvio fecha um trecho
+        ops = self.ops
+        trechos = [0] * len(ops)
+        seguinte = 0
+        for i in range(len(ops) - 1, -1, -1):
+            seguinte = 1 if ops[i] in _DESVIOS else seguinte + 1
+            trechos[i] = seguinte
+        self.trechos = array('I', trechos)
+
+    def desmontar(self):
+        """Listagem legível do bytecode (uma instrução por linha)."""
+        registros = self.registros
+        nomes = {r: nome for nome, (r, _) in self.variaveis.items()}
+
+        def reg(r):
+            if r in nomes:
+                return nomes[r]
+            valor = registros[r]
+            return repr(valor) if valor is not None else f"t{r}"
+
+        linhas = []
+        for i in range(len(self)):
+            op = self.ops[i]
+            a, b, c = self.a[i], self.b[i], self.c[i]
+            if op == JUMP:
+                operandos = f"-> {c}"
+            elif op == JFALSE:
+                operandos = f"{reg(a)} -> {c}"
+            elif JLT <= op <= JNE:
+                operandos = f"{reg(a)}, {reg(b)} -> {c}"
+            elif op in (MOVE, NEG):
+                operandos = f"{reg(a)}, {reg(b)}"
+            elif ADD <= op <= DIV:
+                operandos = f"{reg(a)}, {reg(b)}, {reg(c)}"
+            elif op in (READ_INT, READ_BOOL, WRITE, WRITE_BOOL):
+                operandos = reg(a)
+            else:
+                operandos = ""
+            linhas.append(f"{i:5}  linha {self.linhas[i]:<5} {OPERACOES[op]:<11}{operandos}")
+        return "\n".join(linhas)
+
+
+# ==============================================================================
+# COMPILADOR
+# ==============================================================================
+
+def compilar(arvore):
+    """Programa com o bytecode da AST; ErroSemantico se não puder ser compilado."""
+    return _Compilador(arvore).compilar()
+
+
+class _Compilador:
+    def __init__(self, arvore):
+        self.arvore = arvore
+        self.programa = Programa()
+        self.simbolos = {}      # nome em minúsculas -> (registro, tipo)
+        self.constantes = {}    # (tipo, valor) -> registro
+        self.inteiros = {}      # registro -> valor, das constantes integer
+        self.temporarios = set()
+        self.livres = []        # temporários que podem ser reaproveitados
+        self.linha = 0
+
+    def compilar(self):
+        arvore = self.arvore
+        if arvore.raiz < 0 or arvore.tipos[arvore.raiz] != PROGRAMA:
+            raise ErroSemantico("A árvore não é de um programa completo")
+        for no in arvore.filhos(arvore.raiz):
+            if arvore.tipos[no] == DECLARACAO:
+                self._declaracao(no)
+            else:
+                self._comando(no)
+        self.programa.emitir(HALT, linha=self.linha)
+        self.programa.calcular_trechos()
+        return self.programa
+
+    # --- Registradores ---
+    def _novo_registro(self, valor):
+        self.programa.registros.append(valor)
+        return len(self.programa.registros) - 1
+
+    def _constante(self, tipo, valor):
+        r = self.constantes.get((tipo, valor))
+        if r is None:
+            r = self.constantes[(tipo, valor)] = self._novo_registro(valor)
+            if tipo == INTEIRO:
+                self.inteiros[r] = valor
+        return r
+
+    def _temporario(self):
+        if self.livres:
+            return self.livres.pop()
+        r = self._novo_registro(None)
+        self.temporarios.add(r)
+        return r
+
+    def _liberar(self, r):
+        if r in self.temporarios:
+            self.livres.append(r)
+
+    def _erro(self, mensagem, no=None):
+        linha = self.arvore.linha(no) if no is not None else self.linha
+        return ErroSemantico(mensagem, linha)
+
+    def _variavel(self, no):
+        nome = self.arvore.valor(no)
+        try:
+            return self.simbolos[nome.lower()]
+        except KeyError:
+            raise self._erro(f"variável '{nome}' não declarada", no) from None
+
+    def _emitir(self, op, a=0, b=0, c=0):
+        return self.programa.emitir(op, a, b, c, self.linha)
+
+    # --- Declarações e comandos ---
+    def _declaracao(self, no):
+        arvore = self.arvore
+        tipo = arvore.valor(no).lower()
+        inicial = 0 if tipo == INTEIRO else False
+        for v in arvore.filhos(no):
+            nome = arvore.valor(v)
+            if nome.lower() in self.simbolos:
+                raise self._erro(f"variável '{nome}' declarada mais de uma vez", v)
+            self.simbolos[nome.lower()] = self.programa.variaveis[nome] = (
+                self._novo_registro(inicial), tipo)
+
+    def _comando(self, no):
+        arvore = self.arvore
+        tipo = arvore.tipos[no]
+        self.linha = arvore.linha(no) or self.linha
+        if tipo == BLOCO:
+            for filho in arvore.filhos(no):
+                self._comando(filho)
+        elif tipo == ATRIBUICAO:
+            destino, tipo_destino = self._variavel(no)
+            r, tipo_valor = self._expressao(arvore.filhos(no)[0], destino)
+            if tipo_valor != tipo_destino:
+                raise self._erro(f"atribuição de {tipo_valor} a '{arvore.valor(no)}' "
+                                 f"({tipo_destino})", no)
+            if r != destino:
+                self._emitir(MOVE, destino, r)
+                self._liberar(r)
+        elif tipo == SE:
+            filhos = arvore.filhos(no)
+            se_falso = self._condicao(filhos[0])
+            self._comando(filhos[1])
+            if len(filhos) > 2:
+                fim = self._emitir(JUMP)
+                self.programa.c[se_falso] = len(self.programa)
+                self._comando(filhos[2])
+                self.programa.c[fim] = len(self.programa)
+            else:
+                self.programa.c[se_falso] = len(self.programa)
+        elif tipo == ENQUANTO:
+            condicao, corpo = arvore.filhos(no)
+            inicio = len(self.programa)
+            sai = self._condicao(condicao)
+            self._comando(corpo)
+            self.linha = arvore.linha(no)
+            self._emitir(JUMP, 0, 0, inicio)
+            self.programa.c[sai] = len(self.programa)
+        elif tipo == LEITURA:
+            for v in arvore.filhos(no):
+                r, tipo_var = self._variavel(v)
+                self._emitir(READ_INT if tipo_var == INTEIRO else READ_BOOL, r)
+            if arvore.valor(no).upper() == "READLN":
+                self._emitir(READLN)
+        elif tipo == ESCRITA:
+            for filho in arvore.filhos(no):
+                if arvore.tipos[filho] == TEXTO:
+                    self._emitir(WRITE, self._constante(_TEXTO, arvore.valor(filho)[1:-1]))
+                    continue
+                r, tipo_valor = self._expressao(filho)
+                self._emitir(WRITE if tipo_valor == INTEIRO else WRITE_BOOL, r)
+                self._liberar(r)
+            if arvore.valor(no).upper() == "WRITELN":
+                self._emitir(WRITELN)
+        else:
+            raise self._erro(f"comando inesperado na árvore: {arvore.tipo(no)}", no)
+
+    def _condicao(self, no):
+        # Emite o teste e devolve o índice do salto "se falso", cujo destino
+        # (operando c) quem chamou preenche
+        arvore = self.arvore
+        operador = arvore.valor(no)
+        if arvore.tipos[no] == BINARIO and operador in _SALTO_SE_FALSO:
+            esquerda, direita = arvore.filhos(no)
+            a, tipo_a = self._expressao(esquerda)
+            b, tipo_b = self._expressao(direita)
+            if operador in ("=", "<>"):
+                if tipo_a != tipo_b:
+                    raise self._erro(f"comparação entre {tipo_a} e {tipo_b}", no)
+            elif tipo_a != INTEIRO or tipo_b != INTEIRO:
+                raise self._erro(f"operador '{operador}' exige operandos integer", no)
+            self._liberar(a)
+            self._liberar(b)
+            return self._emitir(_SALTO_SE_FALSO[operador], a, b)
+        r, tipo = self._expressao(no)
+        if tipo != LOGICO:
+            raise self._erro("a condição deve ser boolean", no)
+        self._liberar(r)
+        return self._emitir(JFALSE, r)
+
+    # --- Expressões ---
+    def _expressao(self, no, destino=None):
+        # (registro com o valor, tipo). Com destino, a última operação grava
+        # direto nele; variáveis e constantes voltam o próprio registro
+        arvore = self.arvore
+        tipo = arvore.tipos[no]
+        if tipo == VARIAVEL:
+            return self._variavel(no)
+        if tipo == NUMERO:
+            texto = arvore.valor(no)
+            if not texto.isdigit():
+                raise self._erro(f"número real não suportado: {texto}", no)
+            valor = int(texto)
+            if valor > MAX_INTEIRO:
+                raise self._erro(f"inteiro fora da faixa de 64 bits: {texto}", no)
+            return self._constante(INTEIRO, valor), INTEIRO
+        if tipo == BOOLEANO:
+            return self._constante(LOGICO, arvore.valor(no).upper() == "TRUE"), LOGICO
+        if tipo == UNARIO:
+            r, tipo_operando = self._expressao(arvore.filhos(no)[0])
+            if tipo_operando != INTEIRO:
+                raise self._erro(f"'{arvore.valor(no)}' unário exige operando integer", no)
+            if arvore.valor(no) == "+":
+                return r, INTEIRO
+            valor = self.inteiros.get(r)
+            if valor is not None and MIN_INTEIRO <= -valor <= MAX_INTEIRO:
+                return self._constante(INTEIRO, -valor), INTEIRO
+            self._liberar(r)
+            alvo = destino if destino is not None else self._temporario()
+            self._emitir(NEG, alvo, r)
+            return alvo, INTEIRO
+        if tipo == BINARIO:
+            operador = arvore.valor(no)
+            if operador not in _ARITMETICA:
+                raise self._erro(f"operador '{operador}' fora de uma condição", no)
+            esquerda, direita = arvore.filhos(no)
+            b, tipo_b = self._expressao(esquerda)
+            c, tipo_c = self._expressao(direita)
+            if tipo_b != INTEIRO or tipo_c != INTEIRO:
+                raise self._erro(f"operador '{operador}' exige operandos integer", no)
+            dobrado = self._dobrar(operador, b, c)
+            if dobrado is not None:
+                return self._constante(INTEIRO, dobrado), INTEIRO
+            self._liberar(b)
+            self._liberar(c)
+            alvo = destino if destino is not None else self._temporario()
+            self._emitir(_ARITMETICA[operador], alvo, b, c)
+            return alvo, INTEIRO
+        raise self._erro(f"expressão inesperada na árvore: {arvore.tipo(no)}", no)
+
+    def _dobrar(self, operador, b, c):
+        # Operação entre duas constantes: calculada aqui, se não der erro
+        # (divisão por zero e estouro ficam para a execução, se ela chegar lá)
+        x = self.inteiros.get(b)
+        y = self.inteiros.get(c)
+        if x is None or y is None:
+            return None
+        if operador == "+":
+            valor = x + y
+        elif operador == "-":
+            valor = x - y
+        elif operador == "*":
+            valor = x * y
+        elif y:
+            valor = _div(x, y)
+        else:
+            return None
+        return valor if MIN_INTEIRO <= valor <= MAX_INTEIRO else None
+
+
+# ==============================================================================
+# INTERPRETADOR
+# ==============================================================================
+
+class _Entrada:
+    # read() consome palavras separadas por espaço; readln descarta o resto
+    # da linha atual (ou a próxima linha, se nenhuma estiver aberta)
+    def __init__(self, texto):
+        self.linhas = texto.splitlines()
+        self.proxima = 0
+        self.palavras = []
+        self.aberta = False
+
+    def palavra(self):
+        while not self.palavras:
+            if self.proxima >= len(self.linhas):
+                raise ErroExecucao("fim da entrada")
+            self.palavras = self.linhas[self.proxima].split()[::-1]
+            self.proxima += 1
+            self.aberta = True
+        return self.palavras.pop()
+
+    def fim_de_linha(self):
+        if not self.aberta:
+            self.proxima += 1
+        self.palavras = []
+        self.aberta = False
+
+
+def executar(programa, entrada="", max_instrucoes=MAX_INSTRUCOES, max_saida=MAX_SAIDA):
+    """Roda o programa com a entrada (texto) dada.
+
+    Devolve {"output", "instructions", "variables"}: o texto escrito, as
+    instruções executadas e o valor final de cada variável. Erros levantam
+    ErroExecucao (ou LimiteExcedido) com a linha e a saída parcial.
+    """
+    ops, A, B, C, T = programa.ops, programa.a, programa.b, programa.c, programa.trechos
+    r = list(programa.registros)
+    leitura = _Entrada(entrada)
+    partes = []
+    escrever = partes.append
+    escritos = 0
+    limite = f"limite de {max_instrucoes} instruções excedido"
+    # restante já desconta o trecho em execução inteiro (ver o comentário do
+    # início do arquivo); cada desvio cobra o trecho para onde vai
+    i = 0
+    restante = max_instrucoes - T[0]
+    try:
+        if restante < 0:
+            raise LimiteExcedido(limite)
+        # Operações em ordem aproximada de frequência dentro de laços
+        while True:
+            op = ops[i]
+            if op == ADD:
+                v = r[B[i]] + r[C[i]]
+                if v > MAX_INTEIRO or v < MIN_INTEIRO:
+                    raise ErroExecucao("estouro de inteiro")
+                r[A[i]] = v
+                i += 1
+            elif op == SUB:
+                v = r[B[i]] - r[C[i]]
+                if v > MAX_INTEIRO or v < MIN_INTEIRO:
+                    raise ErroExecucao("estouro de inteiro")
+                r[A[i]] = v
+                i += 1
+            elif op == MOVE:
+                r[A[i]] = r[B[i]]
+                i += 1
+            elif op == JUMP:
+                i = C[i]
+                restante -= T[i]
+                if restante < 0:
+                    raise LimiteExcedido(limite)
+            elif op == JGE:
+                i = C[i] if r[A[i]] >= r[B[i]] else i + 1
+                restante -= T[i]
+                if restante < 0:
+                    raise LimiteExcedido(limite)
+            elif op == JLE:
+                i = C[i] if r[A[i]] <= r[B[i]] else i + 1
+                restante -= T[i]
+                if restante < 0:
+                    raise LimiteExcedido(limite)
+            elif op == JGT:
+                i = C[i] if r[A[i]] > r[B[i]] else i + 1
+                restante -= T[i]
+                if restante < 0:
+                    raise LimiteExcedido(limite)
+            elif op == JLT:
+                i = C[i] if r[A[i]] < r[B[i]] else i + 1
+                restante -= T[i]
+                if restante < 0:
+                    raise LimiteExcedido(limite)
+            elif op == JNE:
+                i = C[i] if r[A[i]] != r[B[i]] else i + 1
+                restante -= T[i]
+                if restante < 0:
+                    raise LimiteExcedido(limite)
+            elif op == JEQ:
+                i = C[i] if r[A[i]] == r[B[i]] else i + 1
+                restante -= T[i]
+                if restante < 0:
+                    raise LimiteExcedido(limite)
+            elif op == MUL:
+                v = r[B[i]] * r[C[i]]
+                if v > MAX_INTEIRO or v < MIN_INTEIRO:
+                    raise ErroExecucao("estouro de inteiro")
+                r[A[i]] = v
+                i += 1
+            elif op == JFALSE:
+                i = i + 1 if r[A[i]] else C[i]
+                restante -= T[i]
+                if restante < 0:
+                    raise LimiteExcedido(limite)
+            elif op == DIV:
+                y = r[C[i]]
+                if not y:
+                    raise ErroExecucao("divisão por zero")
+                v = _div(r[B[i]], y)
+                if v > MAX_INTEIRO:
+                    raise ErroExecucao("estouro de inteiro")
+                r[A[i]] = v
+                i += 1
+            elif op == NEG:
+                v = -r[B[i]]
+                if v > MAX_INTEIRO:
+                    raise ErroExecucao("estouro de inteiro")
+                r[A[i]] = v
+                i += 1
+            elif op == WRITE or op == WRITE_BOOL or op == WRITELN:
+                if op == WRITELN:
+                    texto = "\n"
+                elif op == WRITE:
+                    texto = str(r[A[i]])
+                else:
+                    texto = "TRUE" if r[A[i]] else "FALSE"
+                escritos += len(texto)
+                if escritos > max_saida:
+                    raise LimiteExcedido(f"limite de {max_saida} caracteres de saída excedido")
+                escrever(texto)
+                i += 1
+            elif op == READ_INT:
+                palavra = leitura.palavra()
+                try:
+                    v = int(palavra)
+                except ValueError:
+                    raise ErroExecucao(f"entrada inválida para integer: '{palavra}'") from None
+                if v > MAX_INTEIRO or v < MIN_INTEIRO:
+                    raise ErroExecucao(f"inteiro fora da faixa de 64 bits: {palavra}")
+                r[A[i]] = v
+                i += 1
+            elif op == READ_BOOL:
+                palavra = leitura.palavra()
+                if palavra.upper() not in ("TRUE", "FALSE"):
+                    raise ErroExecucao(f"entrada inválida para boolean: '{palavra}'")
+                r[A[i]] = palavra.upper() == "TRUE"
+                i += 1
+            elif op == READLN:
+                leitura.fim_de_linha()
+                i += 1
+            elif op == HALT:
+                break
+            else:
+                raise ErroExecucao(f"operação inválida: {op}")
+    except ErroExecucao as e:
+        e.linha = programa.linhas[i]
+        e.saida = "".join(partes)
+        if restante < 0:
+            # O trecho que começaria em i não coube no limite: nada dele rodou
+            e.instrucoes = max_instrucoes - restante - T[i]
+        else:
+            # Parou em i: o resto do trecho, já cobrado, não rodou
+            e.instrucoes = max_instrucoes - restante - (T[i] - 1)
+        raise
+
+    return {
+        "output": "".join(partes),
+        "instructions": max_instrucoes - restante,
+        "variables": {nome: r[registro] for nome, (registro, _) in programa.variaveis.items()},
+    }
@@ -0,0 +1,117 @@
+# Gerador de programas sintéticos para os benchmarks e os testes.
+#
+# Produz programas válidos para a gramática reconhecida pelo Parser de app.py
+# (declarações, blocos begin/end aninhados, if/else, while, read/write e
+# expressões), com tamanho e profundidade de aninhamento configuráveis, e
+# entradas adversariais (comentários enormes, identificadores longos,
+# parênteses profundos).
+#
+# Uso direto: python gerador.py [comandos] [profundidade] > programa.txt
+
+import random
+import sys
+
+OPS_ADITIVOS = ("+", "-")
+OPS_MULTIPLICATIVOS = ("*", "/")
+OPS_RELACIONAIS = ("<", "<=", ">", ">=", "=", "<>")
+
+
+class GeradorProgramas:
+    def __init__(self, seed=0, profundidade=4, variaveis=8, tamanho_id=0):
+        self.rnd = random.Random(seed)
+        self.profundidade = profundidade
+        # Identificadores nunca coincidem com palavras reservadas (prefixo "v")
+        sufixo = "x" * max(0, tamanho_id - 4)
+        self.variaveis = [f"v{sufixo}{i}" for i in range(variaveis)]
+
+    # --- Expressões ---
+    def fator(self, nivel=0):
+        r = self.rnd.random()
+        if nivel < 3 and r < 0.15:
+            return f"({self.expr(nivel + 1)})"
+        if r < 0.2:
+            return f"-{self.fator(nivel + 1)}" if nivel < 3 else "1"
+        if r < 0.6:
+            return self.rnd.choice(self.variaveis)
+        return str(self.rnd.randint(0, 999))
+
+    def termo(self, nivel=0):
+        partes = [self.fator(nivel)]
+        for _ in range(self.rnd.randint(0, 2)):
+            partes.append(self.rnd.choice(OPS_MULTIPLICATIVOS))
+            partes.append(self.fator(nivel))
+        return " ".join(partes)
+
+    def expr(self, nivel=0):
+        partes = [self.termo(nivel)]
+        for _ in range(self.rnd.randint(0, 2)):
+            partes.append(self.rnd.choice(OPS_ADITIVOS))
+            partes.append(self.termo(nivel))
+        return " ".join(partes)
+
+    def expr_boolean(self):
+        return f"{self.expr()} {self.rnd.choice(OPS_RELACIONAIS)} {self.expr()}"
+
+    # --- Comandos ---
+    def comando(self, nivel, indent):
+        pad = "    " * indent
+        escolhas = ["atribuicao"] * 5 + ["escrita", "leitura"]
+        if nivel < self.profundidade:
+            escolhas += ["composto", "condicional", "repeticao"] * 2
+        tipo = self.rnd.choice(escolhas)
+        if tipo == "atribuicao":
+            return f"{pad}{self.rnd.choice(self.variaveis)} := {self.expr()}"
+        if tipo == "escrita":
+            cmd = self.rnd.choice(("write", "writeln"))
+            return f"{pad}{cmd}('valor', {self.expr()})"
+        if tipo == "leitura":
+            return f"{pad}read({self.rnd.choice(self.variaveis)})"
+        if tipo == "composto":
+            return f"{pad}begin\n{self.lista_comandos(nivel + 1, indent + 1, self.rnd.randint(1, 3))}\n{pad}end"
+        if tipo == "condicional":
+            texto = f"{pad}if {self.expr_boolean()} then\n{self.comando(nivel + 1, indent + 1)}"
+            if self.rnd.random() < 0.5:
+                texto += f"\n{pad}else\n{self.comando(nivel + 1, indent + 1)}"
+            return texto
+        return f"{pad}while {self.expr_boolean()} do\n{self.comando(nivel + 1, indent + 1)}"
+
+    def lista_comandos(self, nivel, indent, quantidade):
+        return "\n".join(self.comando(nivel, indent) + ";" for _ in range(quantidade))
+
+    def programa(self, comandos):
+        declaracoes = ", ".join(self.variaveis)
+        corpo = self.lista_comandos(0, 1, max(1, comandos))
+        return f"program gerado;\nvar\n    {declaracoes} : integer;\nbegin\n{corpo}\nend.\n"
+
+
+# --- Entradas adversariais ---
+
+def comentario_gigante(tamanho, seed=0):
+    # Um comentário de "tamanho" caracteres (várias linhas) no meio do programa
+    linha = "comentario longo com * e / soltos, mas sem fechar antes da hora\n"
+    texto = (linha * (tamanho // len(linha) + 1))[:tamanho]
+    return ("program comentario;\nvar v0: integer;\nbegin\n    v0 := 1;\n"
+            f"/*{texto}*/\n    v0 := v0 + 1;\nend.\n")
+
+
+def identificadores_longos(tamanho, comandos=200, seed=0):
+    return GeradorProgramas(seed, profundidade=2, variaveis=16, tamanho_id=tamanho).programa(comandos)
+
+
+def parenteses_profundos(profundidade):
+    expr = "(" * profundidade + "1" + ")" * profundidade
+    return f"program parenteses;\nvar v0: integer;\nbegin\n    v0 := {expr};\nend.\n"
+
+
+def blocos_aninhados(profundidade):
+    # A indentação para de crescer depois de 16 níveis para o texto não
+    # crescer com o quadrado da profundidade
+    abre = "".join("    " * min(i, 16) + "begin\n" for i in range(profundidade))
+    fecha = "".join("    " * min(i, 16) + "end;\n" for i in reversed(range(profundidade)))
+    return f"program blocos;\nvar v0: integer;\nbegin\n{abre}v0 := 1;\n{fecha}end.\n"
+
+
+if __name__ == "__main__":
+    comandos = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    profundidade = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    sys.stdout.write(GeradorProgramas(profundidade=profundidade).programa(comandos))
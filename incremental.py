@@ -0,0 +1,327 @@
+import threading
+from bisect import bisect_right
+from collections import OrderedDict
+from operator import indexOf
+
+# ==============================================================================
+# RE-ANÁLISE LÉXICA INCREMENTAL
+# ==============================================================================
+#
+# O servidor guarda, para cada documento aberto pelo editor, o texto e a lista
+# de tokens visíveis (sem SKIP/COMMENT). Cada edição (offset, tamanho apagado,
+# texto inserido) é re-analisada só a partir do último token seguro antes da
+# edição até o ponto em que o novo fluxo volta a coincidir com o antigo; a
+# resposta traz apenas o trecho de tokens que mudou.
+#
+# Para que o custo de uma edição não dependa do tamanho do arquivo:
+# - os tokens ficam em um "gap buffer": os anteriores ao ponto da última
+#   edição guardam a posição a partir do início do texto, e os posteriores
+#   (em ordem invertida) guardam a distância até o fim do texto, que não muda
+#   quando se edita antes deles. Mover o gap custa a distância entre duas
+#   edições seguidas, que no editor é pequena;
+# - o texto fica dividido em blocos de até TAMANHO_BLOCO caracteres, e só o
+#   bloco editado é recriado. Cada bloco guarda quantas quebras de linha tem,
+#   então a linha de uma posição (na mensagem de erro) soma as contagens dos
+#   blocos anteriores e só percorre o bloco da posição.
+
+TAMANHO_BLOCO = 8192
+
+
+class _Texto:
+    # Texto dividido em blocos, com o início e as quebras de linha de cada bloco
+    def __init__(self, text):
+        self.blocos = [text[i:i + TAMANHO_BLOCO] for i in range(0, len(text), TAMANHO_BLOCO)] or [""]
+        self.inicios = [i * TAMANHO_BLOCO for i in range(len(self.blocos))]
+        self.quebras = [bloco.count('\n') for bloco in self.blocos]
+        self.tamanho = len(text)
+
+    def __str__(self):
+        return "".join(self.blocos)
+
+    def _bloco(self, pos):
+        return max(bisect_right(self.inicios, pos) - 1, 0)
+
+    def editar(self, offset, deleted, inserted):
+        b = self._bloco(offset)
+        fim = b
+        while fim + 1 < len(self.blocos) and self.inicios[fim + 1] < offset + deleted:
+            fim += 1
+        base = self.inicios[b]
+        trecho = "".join(self.blocos[b:fim + 1])
+        trecho = trecho[:offset - base] + inserted + trecho[offset - base + deleted:]
+        novos = [trecho[i:i + TAMANHO_BLOCO] for i in range(0, len(trecho), TAMANHO_BLOCO)] or [""]
+        self.blocos[b:fim + 1] = novos
+        self.inicios[b:fim + 1] = [base + i * TAMANHO_BLOCO for i in range(len(novos))]
+        self.quebras[b:fim + 1] = [bloco.count('\n') for bloco in novos]
+        delta = len(inserted) - deleted
+        for i in range(b + len(novos), len(self.inicios)):
+            self.inicios[i] += delta
+        self.tamanho += delta
+        # Remove um bloco vazio que não seja o único
+        if len(self.blocos) > 1 and not self.blocos[b]:
+            del self.blocos[b]
+            del self.inicios[b]
+            del self.quebras[b]
+
+    def posicao(self, pos):
+        # (linha, coluna) de pos, a partir de 1
+        b = self._bloco(pos)
+        i = pos - self.inicios[b]
+        bloco = self.blocos[b]
+        linha = sum(self.quebras[:b]) + bloco.count('\n', 0, i) + 1
+        anterior = bloco.rfind('\n', 0, i)
+        if anterior >= 0:
+            return linha, i - anterior
+        # A quebra anterior está no último bloco que tem alguma
+        while b > 0:
+            b -= 1
+            if self.quebras[b]:
+                return linha, pos - self.inicios[b] - self.blocos[b].rfind('\n')
+        return linha, pos + 1
+
+    def janela(self, pos, minimo=0):
+        # Trecho contínuo a partir de pos com pelo menos "minimo" caracteres
+        # (ou até o fim do texto)
+        b = self._bloco(pos)
+        partes = [self.blocos[b][pos - self.inicios[b]:]]
+        total = len(partes[0])
+        b += 1
+        while total < minimo and b < len(self.blocos):
+            partes.append(self.blocos[b])
+            total += len(self.blocos[b])
+            b += 1
+        return "".join(partes)
+
+    def fatia(self, inicio, fim):
+        return self.janela(inicio, fim - inicio)[:fim - inicio]
+
+
+class DocumentoIncremental:
+    def __init__(self, automato, palavras_reservadas, text):
+        self.automato = automato
+        self.palavras_reservadas = palavras_reservadas
+        self.lock = threading.Lock()
+        self.version = 0
+        self.texto = _Texto(text)
+        # Antes do gap: posição a partir do início; depois do gap (invertido):
+        # distância do início do token até o fim do texto
+        self.ant_kinds, self.ant_pos, self.ant_len = [], [], []
+        self.dep_kinds, self.dep_dist, self.dep_len = [], [], []
+        # Tokens cujo alcance passa do caractere seguinte ao fim: [início, alcance]
+        self.longos = []
+        self.erros = 0
+        kinds, starts, lengths, longos, _, _ = self._lexar(0, None)
+        self.ant_kinds, self.ant_pos, self.ant_len = kinds, starts, lengths
+        self.longos = longos
+        self.erros = kinds.count("MISMATCH")
+
+    @property
+    def text(self):
+        return str(self.texto)
+
+    def __len__(self):
+        return len(self.ant_kinds) + len(self.dep_kinds)
+
+    # --- Acesso aos tokens através do gap ---
+    def _inicio(self, i):
+        n = len(self.ant_pos)
+        if i < n:
+            return self.ant_pos[i]
+        return self.texto.tamanho - self.dep_dist[len(self.dep_dist) - 1 - (i - n)]
+
+    def _tamanho(self, i):
+        n = len(self.ant_len)
+        if i < n:
+            return self.ant_len[i]
+        return self.dep_len[len(self.dep_len) - 1 - (i - n)]
+
+    def _fim(self, i):
+        return self._inicio(i) + self._tamanho(i)
+
+    def _primeiro_afetado(self, offset):
+        # Primeiro token cujo fim é >= offset (busca binária)
+        lo, hi = 0, len(self)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._fim(mid) >= offset:
+                hi = mid
+            else:
+                lo = mid + 1
+        return lo
+
+    def _indice_de(self, start):
+        lo, hi = 0, len(self)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._inicio(mid) < start:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def _mover_gap(self, a):
+        tamanho = self.texto.tamanho
+        while len(self.ant_kinds) > a:
+            self.dep_kinds.append(self.ant_kinds.pop())
+            self.dep_dist.append(tamanho - self.ant_pos.pop())
+            self.dep_len.append(self.ant_len.pop())
+        while len(self.ant_kinds) < a:
+            self.ant_kinds.append(self.dep_kinds.pop())
+            self.ant_pos.append(tamanho - self.dep_dist.pop())
+            self.ant_len.append(self.dep_len.pop())
+
+    # --- Análise ---
+    def _lexar(self, pos, fim_novo):
+        """Analisa o texto a partir de pos.
+
+        Com fim_novo (fim da edição no texto novo), consome os tokens antigos
+        que estão logo depois do gap à medida que são ultrapassados e para no
+        primeiro token que começa depois da edição exatamente onde começava um
+        token antigo. Retorna os tokens novos, os registros de alcance longo,
+        os tipos dos tokens antigos descartados e o texto analisado.
+        """
+        texto = self.texto
+        n = texto.tamanho
+        scan = self.automato.scan
+        kind_index = self.automato.kind_index
+        kind_names = self.automato.kinds
+        skip = kind_index["SKIP"]
+        comment = kind_index["COMMENT"]
+        ident = kind_index["ID"]
+        reservadas = self.palavras_reservadas
+        dep_kinds, dep_dist, dep_len = self.dep_kinds, self.dep_dist, self.dep_len
+        kinds, starts, lengths, longos, descartados = [], [], [], [], []
+
+        base = pos
+        janela = texto.janela(pos, 512)
+        while pos < n:
+            i = pos - base
+            k, end, alcance = scan(janela, i, len(janela))
+            if alcance > len(janela) and base + len(janela) < n:
+                # O autômato chegou vivo ao fim da janela: amplia e repete
+                janela = texto.janela(base, 2 * len(janela))
+                continue
+            if k < 0:
+                raise SyntaxError(f"Caractere inválido na posição {pos}")
+            end += base
+            alcance += base
+            if k != skip and k != comment:
+                if fim_novo is not None:
+                    while dep_kinds and n - dep_dist[-1] < pos:
+                        descartados.append(dep_kinds.pop())
+                        dep_dist.pop()
+                        dep_len.pop()
+                    if pos >= fim_novo and dep_kinds and n - dep_dist[-1] == pos:
+                        return kinds, starts, lengths, longos, descartados, (base, janela)
+                kind = kind_names[k]
+                if k == ident:
+                    upper = janela[i:end - base].upper()
+                    kind = upper if upper in reservadas else "ID"
+                kinds.append(kind)
+                starts.append(pos)
+                lengths.append(end - pos)
+                if alcance > end + 1:
+                    longos.append([pos, alcance])
+            pos = end
+        if fim_novo is not None:
+            descartados.extend(reversed(dep_kinds))
+            dep_kinds.clear()
+            dep_dist.clear()
+            dep_len.clear()
+        return kinds, starts, lengths, longos, descartados, (base, janela)
+
+    def aplicar_edicao(self, offset, deleted, inserted):
+        """Aplica a edição e retorna (início, quantos tokens saíram, tokens novos)."""
+        tamanho = self.texto.tamanho
+        if not (0 <= offset <= tamanho) or deleted < 0 or offset + deleted > tamanho:
+            raise ValueError("Edição fora dos limites do documento")
+        delta = len(inserted) - deleted
+
+        # 1. Ponto seguro de recomeço: fim do token anterior ao primeiro afetado,
+        # recuando até tokens cujo alcance chega na edição ("/*" sem "*/" etc.)
+        a = self._primeiro_afetado(offset)
+        r = self._fim(a - 1) if a > 0 else 0
+        recuo = r
+        for inicio, alcance in self.longos:
+            if inicio < recuo and alcance >= offset:
+                recuo = inicio
+        if recuo < r:
+            r = recuo
+            a = self._indice_de(r)
+
+        # 2. Tokens a partir de "a" vão para depois do gap; o texto é editado e
+        # re-analisado a partir de r, consumindo os tokens antigos até ressincronizar
+        self._mover_gap(a)
+        self.texto.editar(offset, deleted, inserted)
+        kinds, starts, lengths, longos, descartados, (base, janela) = self._lexar(
+            r, offset + len(inserted))
+        self.ant_kinds.extend(kinds)
+        self.ant_pos.extend(starts)
+        self.ant_len.extend(lengths)
+
+        # 3. Registros de alcance longo: remove os do trecho trocado, desloca os
+        # seguintes e inclui os novos
+        if self.longos or longos:
+            # Início (no texto antigo) do primeiro token antigo mantido
+            ressinc = self._inicio(len(self.ant_kinds)) - delta if self.dep_kinds else None
+            novos_longos = []
+            for reg in self.longos:
+                if reg[0] < r:
+                    novos_longos.append(reg)
+                elif ressinc is not None and reg[0] >= ressinc:
+                    novos_longos.append([reg[0] + delta, reg[1] + delta])
+            novos_longos.extend(longos)
+            novos_longos.sort()
+            self.longos = novos_longos
+
+        self.erros += kinds.count("MISMATCH") - descartados.count("MISMATCH")
+        self.version += 1
+        valores = [[kind, janela[s - base:s - base + l]] for kind, s, l in zip(kinds, starts, lengths)]
+        return a, len(descartados), valores
+
+    def tokens(self):
+        text = self.text
+        return [[self.ant_kinds[i] if i < len(self.ant_kinds) else self.dep_kinds[len(self) - 1 - i],
+                 text[self._inicio(i):self._fim(i)]]
+                for i in range(len(self))]
+
+    def erro(self):
+        # Mesma mensagem do lexer para o primeiro caractere inválido, se houver
+        if not self.erros:
+            return None
+        # Antes do gap, o primeiro MISMATCH da lista; depois, o último da
+        # lista invertida (percorrida de trás para frente, sem copiá-la)
+        if "MISMATCH" in self.ant_kinds:
+            i = self.ant_kinds.index("MISMATCH")
+        else:
+            i = len(self.ant_kinds) + indexOf(reversed(self.dep_kinds), "MISMATCH")
+        inicio = self._inicio(i)
+        linha, coluna = self.texto.posicao(inicio)
+        return (f"Erro léxico: '{self.texto.fatia(inicio, self._fim(i))}' "
+                f"na linha {linha}, coluna {coluna}")
+
+
+class Documentos:
+    # Documentos abertos pelo editor, limitados em número (os menos usados saem)
+    def __init__(self, automato, palavras_reservadas, max_documentos=64):
+        self.automato = automato
+        self.palavras_reservadas = palavras_reservadas
+        self.max_documentos = max_documentos
+        self._docs = OrderedDict()
+        self._lock = threading.Lock()
+
+    def abrir(self, doc_id, text):
+        doc = DocumentoIncremental(self.automato(), self.palavras_reservadas, text)
+        with self._lock:
+            self._docs[doc_id] = doc
+            self._docs.move_to_end(doc_id)
+            while len(self._docs) > self.max_documentos:
+                self._docs.popitem(last=False)
+        return doc
+
+    def get(self, doc_id):
+        with self._lock:
+            doc = self._docs.get(doc_id)
+            if doc is not None:
+                self._docs.move_to_end(doc_id)
+            return doc
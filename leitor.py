@@ -0,0 +1,122 @@
+import codecs
+import contextlib
+import mmap
+import os
+import sys
+
+# ==============================================================================
+# LEITURA EM FLUXO (STREAMING) PARA O ANALISADOR LÉXICO
+# ==============================================================================
+#
+# Consome a fonte em blocos (objeto de arquivo texto/binário ou mmap) e usa o
+# autômato determinístico para decidir quando um token pode ser emitido: se o
+# autômato ainda está vivo ao chegar no fim do bloco (ex.: um "/* ..." sem o
+# "*/" ou um identificador cortado ao meio), o próximo bloco é lido antes de
+# decidir. Assim a memória fica limitada ao tamanho do bloco mais o maior
+# token, e os tokens saem à medida que o arquivo é lido.
+
+CHUNK_PADRAO = 1 << 20
+
+
+@contextlib.contextmanager
+def abrir_fonte(caminho, usar_mmap=True):
+    """Abre o arquivo para leitura em fluxo, mapeando-o em memória se possível.
+
+    "-" é a entrada padrão (lida em blocos, sem mmap).
+    """
+    if caminho == "-":
+        yield sys.stdin.buffer
+        return
+    with open(caminho, 'rb') as f:
+        if usar_mmap and os.fstat(f.fileno()).st_size > 0:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+                yield m
+        else:
+            yield f
+
+
+def blocos(fonte, chunk_size=CHUNK_PADRAO, encoding='utf-8'):
+    # Aceita str, arquivo texto, arquivo binário ou mmap. Bytes passam por um
+    # decodificador incremental para não quebrar caracteres multibyte.
+    if isinstance(fonte, str):
+        if fonte:
+            yield fonte
+        return
+    decoder = None
+    while True:
+        bloco = fonte.read(chunk_size)
+        if not bloco:
+            break
+        if not isinstance(bloco, str):
+            if decoder is None:
+                decoder = codecs.getincrementaldecoder(encoding)()
+            bloco = decoder.decode(bloco)
+            if not bloco:
+                continue
+        yield bloco
+    if decoder is not None:
+        resto = decoder.decode(b'', final=True)
+        if resto:
+            yield resto
+
+
+def varrer(automato, fonte, chunk_size=CHUNK_PADRAO, encoding='utf-8'):
+    """Gera (índice do tipo, lexema) para cada casamento do autômato.
+
+    Inclui SKIP, COMMENT e MISMATCH; cabe a quem chama aplicar a semântica
+    do seu analisador (contagem de linhas, palavras reservadas, erros).
+    """
+    entrada = blocos(fonte, chunk_size, encoding)
+    match = automato.match
+    buf = ''
+    pos = 0
+    base = 0        # deslocamento absoluto de buf[0] na fonte
+    eof = False
+    while True:
+        n = len(buf)
+        if pos >= n:
+            if eof:
+                return
+            proximo = next(entrada, None)
+            if proximo is None:
+                eof = True
+            else:
+                # Mantém um caractere antes de pos para o \b inicial
+                corte = max(pos - 1, 0)
+                base += corte
+                buf = buf[corte:] + proximo
+                pos -= corte
+            continue
+        k, end, esgotou = match(buf, pos, n)
+        if esgotou and not eof:
+            corte = max(pos - 1, 0)
+            base += corte
+            k, end, buf, eof = _atravessar(automato, entrada, buf[corte:], pos - corte)
+            pos -= corte
+        if k < 0:
+            raise SyntaxError(f"Caractere inválido na posição {base + pos}")
+        yield k, buf[pos:end]
+        pos = end
+
+
+def _atravessar(automato, entrada, buf, pos):
+    # O token que começa em buf[pos] chega vivo ao fim do bloco: o autômato
+    # continua nos blocos seguintes a partir do estado em que parou, sem
+    # reexaminar o que já viu (um "/*" sem "*/" no começo de um arquivo grande
+    # custaria o arquivo a cada bloco). Devolve (tipo, fim, texto, eof), com o
+    # texto lido juntado ao buffer e o fim relativo a ele.
+    continuar = automato.continuar
+    k, fim, estado = continuar(buf, pos, len(buf))
+    pedacos = [buf]
+    total = len(buf)
+    eof = False
+    while estado >= 0:
+        proximo = next(entrada, None)
+        if proximo is None:
+            eof = True
+            break
+        k, fim, estado = continuar(proximo, 0, len(proximo), estado, k, fim - total)
+        fim += total
+        pedacos.append(proximo)
+        total += len(proximo)
+    return k, fim, ''.join(pedacos), eof
@@ -0,0 +1,168 @@
+import posixpath
+import zipfile
+from xml.parsers import expat
+
+# ==============================================================================
+# EXTRAÇÃO RÁPIDA DE TEXTO DE .DOCX
+# ==============================================================================
+#
+# Um .docx é um zip; o texto fica em word/document.xml. Em vez de montar o
+# modelo de objetos inteiro do python-docx (e a árvore lxml por baixo dele), o
+# XML é descompactado em blocos direto do zip e passado a um parser expat
+# incremental, que só acompanha a pilha de elementos e junta o texto de cada
+# parágrafo. Nada além do parágrafo atual fica na memória.
+#
+# O texto é o mesmo de "\n".join(p.text for p in Document(f).paragraphs):
+# parágrafos filhos diretos de <w:body> (os de tabelas ficam de fora), runs
+# filhos diretos de <w:p>, e dentro de cada run <w:t>, <w:tab/> ("\t") e
+# <w:br/>/<w:cr/> ("\n"). Documentos fora do comum (parte principal em outro
+# caminho, outro namespace) são lidos pelo python-docx.
+
+W = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+_REL_DOCUMENTO = "http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument"
+_REL_NS = "http://schemas.openxmlformats.org/package/2006/relationships"
+PARTE_PRINCIPAL = "word/document.xml"
+BLOCO = 1 << 16
+
+_DOCUMENTO = W + " document"
+_CORPO = W + " body"
+_PARAGRAFO = W + " p"
+_RUN = W + " r"
+_TEXTO = W + " t"
+_QUEBRAS = {W + " tab": "\t", W + " br": "\n", W + " cr": "\n"}
+
+
+class DocumentoIncomum(Exception):
+    """O documento precisa do python-docx (ver paragrafos())."""
+
+
+def _parte_principal(z):
+    # Caminho da parte principal segundo _rels/.rels (None se não der para saber)
+    try:
+        dados = z.read("_rels/.rels")
+    except KeyError:
+        return None
+    alvos = []
+    parser = expat.ParserCreate(namespace_separator=" ")
+
+    def inicio(nome, atributos):
+        if nome == _REL_NS + " Relationship" and atributos.get("Type") == _REL_DOCUMENTO:
+            alvos.append(atributos.get("Target", ""))
+
+    parser.StartElementHandler = inicio
+    parser.Parse(dados, True)
+    if len(alvos) != 1:
+        return None
+    return posixpath.normpath(alvos[0].lstrip("/"))
+
+
+class _Extrator:
+    def __init__(self):
+        self.pilha = []
+        self.partes = None      # texto do parágrafo atual
+        self.no_texto = False   # dentro de <w:t> de um run do parágrafo
+        self.prontos = []
+        self.parser = expat.ParserCreate(namespace_separator=" ")
+        self.parser.buffer_text = True
+        self.parser.StartElementHandler = self.inicio
+        self.parser.EndElementHandler = self.fim
+        self.parser.CharacterDataHandler = self.texto
+
+    def inicio(self, nome, atributos):
+        pilha = self.pilha
+        pilha.append(nome)
+        n = len(pilha)
+        if n == 1:
+            if nome != _DOCUMENTO:
+                raise DocumentoIncomum(nome)
+        elif n == 3:
+            if nome == _PARAGRAFO and pilha[1] == _CORPO:
+                self.partes = []
+        elif n == 5 and self.partes is not None and pilha[3] == _RUN:
+            if nome == _TEXTO:
+                self.no_texto = True
+            elif nome in _QUEBRAS:
+                self.partes.append(_QUEBRAS[nome])
+
+    def fim(self, nome):
+        pilha = self.pilha
+        n = len(pilha)
+        if n == 5:
+            self.no_texto = False
+        elif n == 3 and self.partes is not None:
+            self.prontos.append("".join(self.partes))
+            self.partes = None
+        pilha.pop()
+
+    def texto(self, dados):
+        if self.no_texto:
+            self.partes.append(dados)
+
+
+def paragrafos(arquivo):
+    """Gera o texto de cada parágrafo do .docx (caminho ou arquivo binário)."""
+    with zipfile.ZipFile(arquivo) as z:
+        try:
+            if _parte_principal(z) != PARTE_PRINCIPAL:
+                raise DocumentoIncomum(PARTE_PRINCIPAL)
+            membro = z.open(PARTE_PRINCIPAL)
+        except (DocumentoIncomum, KeyError, expat.ExpatError):
+            membro = None
+        if membro is not None:
+            with membro:
+                extrator = _Extrator()
+                # A decisão de usar o python-docx é tomada no elemento raiz,
+                # antes de qualquer parágrafo sair daqui
+                try:
+                    while not extrator.pilha:
+                        bloco = membro.read(BLOCO)
+                        extrator.parser.Parse(bloco, not bloco)
+                        if not bloco:
+                            break
+                except DocumentoIncomum:
+                    membro = None
+                else:
+                    while bloco:
+                        yield from extrator.prontos
+                        extrator.prontos.clear()
+                        bloco = membro.read(BLOCO)
+                        extrator.parser.Parse(bloco, not bloco)
+                    yield from extrator.prontos
+                    return
+    # Fora do comum: python-docx (carregado só aqui)
+    from docx import Document
+    if hasattr(arquivo, "seek"):
+        arquivo.seek(0)
+    for p in Document(arquivo).paragraphs:
+        yield p.text
+
+
+def extrair_texto(arquivo):
+    """Igual a "\\n".join(p.text for p in Document(arquivo).paragraphs)."""
+    return "\n".join(paragrafos(arquivo))
+
+
+class FonteDocx:
+    """O texto do .docx como arquivo texto (read), para o lexer em fluxo.
+
+    Os parágrafos são entregues em blocos de pelo menos `tamanho` caracteres
+    à medida que o XML é lido, sem montar o texto inteiro.
+    """
+
+    def __init__(self, arquivo):
+        self._paragrafos = paragrafos(arquivo)
+        self._primeiro = True
+
+    def read(self, tamanho=BLOCO):
+        partes = []
+        total = 0
+        for texto in self._paragrafos:
+            if not self._primeiro:
+                partes.append("\n")
+                total += 1
+            self._primeiro = False
+            partes.append(texto)
+            total += len(texto)
+            if total >= tamanho:
+                break
+        return "".join(partes)
@@ -0,0 +1,252 @@
+import hashlib
+import json
+import os
+import re
+import threading
+
+# ==============================================================================
+# DEFINIÇÃO DA LINGUAGEM (DIALETOS)
+# ==============================================================================
+#
+# Um único lugar para a especificação léxica usada pelo app.py e pelo
+# analisador.py. Cada dialeto declara seus padrões de token, as palavras
+# reservadas e como elas aparecem no fluxo de tokens, e tem uma versão: o
+# hash de tudo isso identifica a especificação (cache de tokens, cache de
+# respostas e artefatos compilados).
+#
+# O regex e o autômato de cada dialeto são compilados uma vez por processo, no
+# primeiro uso. O autômato compilado também fica em disco, como dados em JSON,
+# em $ANALISADOR_COMPILADOS (padrão: ~/.cache/analisador-lexico), indexado pelo
+# hash: processos novos (workers, CLI) carregam em vez de recompilar.
+
+# Especificação da gramática aceita pelo Parser (app.py)
+_PALAVRAS_PADRAO = {
+    "PROGRAM", "VAR", "INTEGER", "BOOLEAN", "BEGIN", "END", "IF", "THEN",
+    "ELSE", "WHILE", "DO", "READ", "READLN", "WRITE", "WRITELN", "TRUE", "FALSE"
+}
+
+_ESPECIFICACAO_PADRAO = [
+    ("COMMENT",       r'/\*.*?\*/'),
+    ("STRING",        r"'[^']*'"),
+    ("NUMBER",        r'\d+(\.\d*)?'),
+    ("ASSIGN",        r':='),
+    ("LE_EQ",         r'<='),
+    ("GE_EQ",         r'>='),
+    ("NE_EQ",         r'<>'),
+    ("SEMI",          r';'),
+    ("COLON",         r':'),
+    ("COMMA",         r','),
+    ("DOT",           r'\.'),
+    ("LPAREN",        r'\('),
+    ("RPAREN",        r'\)'),
+    ("PLUS",          r'\+'),
+    ("MINUS",         r'-'),
+    ("TIMES",         r'\*'),
+    ("DIVIDE",        r'/'),
+    ("EQUAL",         r'='),
+    ("LESS",          r'<'),
+    ("GREATER",       r'>'),
+    ("ID",            r'[A-Za-z_]\w*'),
+    ("SKIP",          r'[ \t\n]+'),
+    ("MISMATCH",      r'.'),
+]
+
+# Especificação do analisador léxico estendido (analisador.py)
+_PALAVRAS_ESTENDIDO = {
+    "ABSOLUTE", "AND", "ARRAY", "BEGIN", "CASE", "CHAR", "CONST", "DIV", "DO",
+    "DOWNTO", "ELSE", "END", "EXTERNAL", "FILE", "FOR", "FORWARD", "FUNC",
+    "FUNCTION", "GOTO", "IF", "IMPLEMENTATION", "INTEGER", "INTERFACE",
+    "INTERRUPT", "LABEL", "MAIN", "NIL", "NIT", "NOT", "OF", "OR", "PACKED",
+    "PROC", "PROGRAM", "REAL", "RECORD", "REPEAT", "SET", "SHL", "SHR",
+    "STRING", "THEN", "TO", "TYPE", "UNIT", "UNTIL", "USES", "VAR",
+    "WHILE", "WITH", "XOR"
+}
+
+_ESPECIFICACAO_ESTENDIDO = [
+    ("COMMENT",       r'/\*.*?\*/'),                    # Comentarios
+    ("READ",          r'\bread\b'),                     # Comando de entrada
+    ("WRITE",         r'\bwrite\b'),                    # Comando de saída
+    ("WRITELN",       r'\bwriteln\b'),                  # Comando de saída com quebra de linha
+    ("STRING",        r'"[^"]*"'),                      # Strings delimitadas por aspas duplas
+    ("CHAR",          r"'[^']*'"),                      # Caracteres delimitados por aspas simples
+    ("NUMBER",        r'\d+(\.\d*)?([eE][+-]?\d+)?'),   # Numeros inteiros, decimais e com notacao cientifica
+    ("BEGIN",         r'\bbegin\b'),                    # Blocos de comandos
+    ("END",           r'\bend\b'),                      # Blocos de comandos
+    ("IF",            r'\bif\b'),                       # Condicionais
+    ("THEN",          r'\bthen\b'),                     # Condicionais
+    ("ELSE",          r'\belse\b'),                     # Condicionais
+    ("WHILE",         r'\bwhile\b'),                    # Estruturas de repetição
+    ("DO",            r'\bdo\b'),                       # Estruturas de repetição
+    ("REPEAT",        r'\brepeat\b'),                   # palavra reservada "repeat"
+    ("UNTIL",         r'\buntil\b'),                    # palavra reservada "until"
+    ("FOR",           r'\bfor\b'),                      # Estrutura de for-to-do
+    ("TO",            r'\bto\b'),                       # Estrutura de for-to-do
+    ("AND",           r'\band\b'),                      # Operadores logicos
+    ("OR",            r'\bor\b'),                       # Operadores logicos
+    ("NOT",           r'\bnot\b'),                      # Operadores logicos
+    ("MOD",           r'\bmod\b'),                      # Operadores
+    ("DIV",           r'\bdiv\b'),                      # Operadores
+    ("PLUS",          r'\+'),                           # Operadores
+    ("MINUS",         r'-'),                            # Operadores
+    ("DIVIDE",        r'/'),                            # Operadores
+    ("TIMES",         r'\*'),                           # Operadores
+    ("LESS_EQUAL",    r'<='),                           # Operadores relacionais
+    ("GREATER_EQUAL", r'>='),                           # Operadores relacionais
+    ("NOT_EQUAL",     r'<>'),                           # Operadores relacionais
+    ("LESS_THAN",     r'<'),                            # Operadores relacionais
+    ("GREATER_THAN",  r'>'),                            # Operadores relacionais
+    ("EQUAL",         r'='),                            # Operadores relacionais
+    ("ASSIGN",        r':='),                           # Atribuicao
+    ("ID",            r'[A-Za-z_]\w*'),                 # Identificadores
+    ("LPAREN",        r'\('),
+    ("RPAREN",        r'\)'),
+    ("SEMI",          r';'),
+    ("COLON",         r':'),
+    ("COMMA",         r','),
+    ("END_PROGRAM",   r'\.'),                           # Final de programa
+    ("SKIP",          r'[ \t]+'),                       # Espacos e tabulacoes
+    ("MISMATCH",      r'.'),                            # Qualquer coisa inesperada
+]
+
+
+def _diretorio_compilados():
+    diretorio = os.environ.get("ANALISADOR_COMPILADOS")
+    if diretorio:
+        return diretorio
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "analisador-lexico")
+
+
+def _hash_automato():
+    # A estrutura do autômato compilado depende do código de automato.py
+    import automato
+    with open(automato.__file__, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()[:16]
+
+
+class Dialeto:
+    """Especificação léxica de um dialeto e seus artefatos compilados.
+
+    reservada_como: None faz cada palavra reservada virar o próprio tipo
+    ("BEGIN", "VAR"...); um nome ("RESERVED_TOKEN") faz todas virarem esse
+    tipo. ignorar: tipos que não vão para o fluxo de tokens (se MISMATCH
+    estiver aqui, caracteres inválidos são descartados em vez de gerar erro).
+    analisavel: o Parser entende os tokens deste dialeto.
+    delimitadores: (tipo, abre, fecha) dos tokens que podem conter quebras de
+    linha (comentários, strings); o lexer paralelo só corta a fonte em
+    quebras de linha fora deles (ver paralelo.py) e os lexers em fluxo só
+    contam quebras nesses tipos, em SKIP e em MISMATCH.
+    """
+
+    def __init__(self, nome, versao, especificacao, palavras_reservadas,
+                 reservada_como=None, ignorar=("SKIP", "COMMENT"), analisavel=False,
+                 descricao="", delimitadores=(("COMMENT", "/*", "*/"),)):
+        self.nome = nome
+        self.versao = versao
+        self.especificacao = especificacao
+        self.palavras_reservadas = palavras_reservadas
+        self.reservada_como = reservada_como
+        self.ignorar = frozenset(ignorar)
+        self.analisavel = analisavel
+        self.descricao = descricao
+        self.delimitadores = tuple(delimitadores)
+        self.hash = hashlib.sha256(repr((
+            nome, versao, list(especificacao), sorted(palavras_reservadas),
+            reservada_como, sorted(self.ignorar),
+        )).encode('utf-8')).hexdigest()
+        self._lock = threading.Lock()
+        self._regex = None
+        self._tipos = None
+        self._automato = None
+
+    @property
+    def reservadas_no_automato(self):
+        # Com reservada_como=None as palavras entram no autômato como tipos
+        return self.reservada_como is None
+
+    def tipo_reservada(self, palavra):
+        return self.reservada_como or palavra
+
+    def tipos(self):
+        # Nomes dos tipos na ordem dos códigos do autômato (as palavras
+        # reservadas embutidas entram logo antes do ID), sem compilá-lo
+        if self._tipos is None:
+            from automato import tipos_da_especificacao
+            reservadas = self.palavras_reservadas if self.reservadas_no_automato else ()
+            self._tipos = tipos_da_especificacao(self.especificacao, reservadas)
+        return self._tipos
+
+    def regex(self):
+        # O grupo com o nome do tipo fica vazio, no fim de cada alternativa, em
+        # vez de envolver o padrão: assim cada alternativa começa pelo próprio
+        # padrão (um literal ou uma classe de caracteres, quase sempre) e o
+        # "re" descarta as que não casam olhando só o primeiro caractere, em
+        # vez de abrir o grupo de cada uma. O tipo continua em lastgroup (o
+        # grupo vazio é sempre o último a fechar) e o lexema é o casamento
+        # inteiro, group()
+        if self._regex is None:
+            tok_regex = "|".join(f"{pattern}(?P<{name}>)" for name, pattern in self.especificacao)
+            # re.DOTALL faz o r'.' aceitar também a quebra de linha (\n), para
+            # os comentários de múltiplas linhas
+            self._regex = re.compile(tok_regex, re.DOTALL)
+        return self._regex
+
+    def automato(self):
+        if self._automato is None:
+            with self._lock:
+                if self._automato is None:
+                    self._automato = self._carregar_ou_compilar()
+        return self._automato
+
+    # --- Artefato compilado em disco ---
+    def _caminho_compilado(self):
+        return os.path.join(_diretorio_compilados(),
+                            f"{self.nome}-{self.hash[:16]}-{_hash_automato()}.json")
+
+    def _carregar_ou_compilar(self):
+        # O arquivo tem só dados (JSON), conferidos por Automato.de_dados: um
+        # artefato adulterado no diretório de cache é recompilado, nunca executado
+        from automato import Automato
+
+        caminho = self._caminho_compilado()
+        try:
+            with open(caminho, encoding='utf-8') as f:
+                return Automato.de_dados(json.load(f), self.tipos())
+        except Exception:
+            # Ausente, corrompido, inválido ou de outra versão: recompila
+            pass
+        reservadas = self.palavras_reservadas if self.reservadas_no_automato else ()
+        automato = Automato(self.especificacao, reservadas)
+        try:
+            os.makedirs(os.path.dirname(caminho), exist_ok=True)
+            temporario = f"{caminho}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(temporario, 'w', encoding='utf-8') as f:
+                json.dump(automato.para_dados(), f, separators=(",", ":"))
+            os.replace(temporario, caminho)
+        except OSError:
+            # Sem onde gravar: o autômato continua valendo só para este processo
+            pass
+        return automato
+
+PADRAO = "padrao"
+
+DIALETOS = {
+    d.nome: d for d in (
+        Dialeto(PADRAO, 1, _ESPECIFICACAO_PADRAO, _PALAVRAS_PADRAO, analisavel=True,
+                delimitadores=(("COMMENT", "/*", "*/"), ("STRING", "'", "'")),
+                descricao="Gramática do analisador sintático (strings com aspas simples, true/false)"),
+        Dialeto("estendido", 1, _ESPECIFICACAO_ESTENDIDO, _PALAVRAS_ESTENDIDO,
+                reservada_como="RESERVED_TOKEN", ignorar=("SKIP", "COMMENT", "MISMATCH"),
+                delimitadores=(("COMMENT", "/*", "*/"), ("STRING", '"', '"'),
+                               ("CHAR", "'", "'")),
+                descricao="Léxico estendido do analisador.py (repeat/for/and/or, strings com aspas duplas)"),
+    )
+}
+
+
+def obter(nome=None):
+    """Dialeto pelo nome (None: o padrão); ValueError se não existir."""
+    dialeto = DIALETOS.get(nome or PADRAO)
+    if dialeto is None:
+        raise ValueError(f"Dialeto desconhecido: {nome}")
+    return dialeto
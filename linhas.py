@@ -0,0 +1,64 @@
+import re
+from array import array
+from bisect import bisect_left, bisect_right
+from itertools import repeat
+
+# ==============================================================================
+# ÍNDICE DE LINHAS (DESLOCAMENTO -> LINHA, COLUNA)
+# ==============================================================================
+#
+# Guarda o início de cada linha da fonte em um array, montado em uma passada
+# (re.finditer acha as quebras de linha em C). A linha de um deslocamento é
+# uma busca binária nesse array, então os lexers não precisam contar quebras
+# token a token e um token de várias linhas (comentário, string) não
+# desalinha a contagem dos seguintes. Serve para str (deslocamentos em
+# caracteres) e para bytes (deslocamentos em bytes).
+#
+# Linhas e colunas começam em 1.
+
+_QUEBRA = re.compile('\n')
+_QUEBRA_BYTES = re.compile(b'\n')
+
+
+class IndiceLinhas:
+    def __init__(self, texto):
+        quebra = _QUEBRA_BYTES if isinstance(texto, (bytes, bytearray, memoryview)) else _QUEBRA
+        n = len(texto)
+        self.tamanho = n
+        # inicios[i] é o início da linha i + 1; o último item (n + 1) é uma
+        # sentinela maior que qualquer deslocamento da fonte
+        self.inicios = array('I' if n < 0xFFFFFFFF else 'Q', [0])
+        self.inicios.extend(m.end() for m in quebra.finditer(texto))
+        self.inicios.append(n + 1)
+
+    def __len__(self):
+        # Número de linhas da fonte
+        return len(self.inicios) - 1
+
+    def linha(self, pos):
+        return bisect_right(self.inicios, pos)
+
+    def coluna(self, pos):
+        return pos - self.inicios[bisect_right(self.inicios, pos) - 1] + 1
+
+    def posicao(self, pos):
+        """(linha, coluna) do deslocamento pos."""
+        linha = bisect_right(self.inicios, pos)
+        return linha, pos - self.inicios[linha - 1] + 1
+
+    def linhas(self, posicoes):
+        """array('I') com a linha de cada deslocamento de posicoes (em ordem crescente).
+
+        Uma busca binária por linha que tem tokens, não por token: os tokens
+        de uma mesma linha entram de uma vez.
+        """
+        inicios = self.inicios
+        resultado = array('I')
+        feito = 0
+        total = len(posicoes)
+        while feito < total:
+            linha = bisect_right(inicios, posicoes[feito])
+            ate = bisect_left(posicoes, inicios[linha], feito)
+            resultado.extend(repeat(linha, ate - feito))
+            feito = ate
+        return resultado
@@ -0,0 +1,206 @@
+import argparse
+import glob
+import io
+import json
+import os
+import sys
+import threading
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+
+from trabalhos import contexto_processos
+
+# ==============================================================================
+# ANÁLISE EM LOTE (VÁRIOS ARQUIVOS EM PARALELO)
+# ==============================================================================
+#
+# Valida muitos programas de uma vez distribuindo lexer + Parser entre
+# processos (ProcessPoolExecutor). Cada resultado traz validade, mensagem,
+# linha do erro e tempo gasto. Usado pelo endpoint /batch_parse e pela linha
+# de comando:
+#
+#   python lote.py testes/                 (diretório: todos os .txt e .docx)
+#   python lote.py "programas/**/*.txt"    (glob)
+#   python lote.py alunos.zip --workers 4 --json
+
+EXTENSOES = ('.txt', '.docx')
+MAX_BYTES_ZIP = int(os.environ.get("ANALISADOR_LOTE_MAX_BYTES", 256 * 1024 * 1024))
+
+
+def texto_de(nome, dados):
+    # Converte o conteúdo bruto de um .txt ou .docx em texto
+    if nome.lower().endswith('.docx'):
+        from leitor_docx import extrair_texto
+        return extrair_texto(io.BytesIO(dados))
+    return dados.decode('utf-8', errors='ignore')
+
+
+def validar(nome, code):
+    """Roda lexer + Parser (sem logs) e devolve o resultado de um arquivo."""
+    from nucleo import ParserIterativo, tokenizar
+
+    inicio = time.perf_counter()
+    resultado = {"file": nome, "valid": True, "message": "Código válido", "line": None}
+    try:
+        tokens = tokenizar(code)
+        resultado["tokens"] = len(tokens)
+        ParserIterativo(tokens, trace="off").parse_program()
+    except SyntaxError as e:
+        resultado["valid"] = False
+        resultado["message"] = str(e).strip()
+        resultado["line"] = getattr(e, 'linha', None)
+    resultado["time_ms"] = (time.perf_counter() - inicio) * 1000
+    return resultado
+
+
+def _validar_item(item):
+    # item: (nome, caminho) para ler no próprio processo ou (nome, bytes)
+    nome, origem = item
+    try:
+        if isinstance(origem, str):
+            with open(origem, 'rb') as f:
+                origem = f.read()
+        return validar(nome, texto_de(nome, origem))
+    except Exception as e:
+        return {"file": nome, "valid": False, "message": f"Erro ao ler o arquivo: {e}",
+                "line": None, "time_ms": 0.0}
+
+
+# --- Entradas ---
+
+def itens_de_caminhos(padroes):
+    # Diretórios (recursivo), globs ou arquivos; .zip são expandidos
+    itens = []
+    for padrao in padroes:
+        if os.path.isdir(padrao):
+            caminhos = sorted(glob.glob(os.path.join(padrao, '**', '*'), recursive=True))
+        else:
+            caminhos = sorted(glob.glob(padrao, recursive=True)) or [padrao]
+        for caminho in caminhos:
+            if caminho.lower().endswith('.zip'):
+                with open(caminho, 'rb') as f:
+                    itens.extend(itens_de_zip(f.read(), prefixo=caminho + ':'))
+            elif caminho.lower().endswith(EXTENSOES) and os.path.isfile(caminho):
+                itens.append((caminho, caminho))
+    return itens
+
+
+def itens_de_zip(dados, prefixo=''):
+    with zipfile.ZipFile(io.BytesIO(dados)) as z:
+        membros = [m for m in z.infolist()
+                   if not m.is_dir() and m.filename.lower().endswith(EXTENSOES)]
+        if sum(m.file_size for m in membros) > MAX_BYTES_ZIP:
+            raise ValueError("Arquivo .zip grande demais depois de descompactado")
+        return [(prefixo + m.filename, z.read(m)) for m in membros]
+
+
+# --- Execução ---
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def pool(workers=None):
+    # Pool compartilhado pelas requisições do servidor, criado no primeiro
+    # uso. Os processos vêm do mesmo contexto (forkserver) do pool de
+    # trabalhos.py: o servidor tem várias threads e não deve ser copiado
+    # por fork
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(
+                workers or int(os.environ.get("ANALISADOR_WORKERS", 0)) or None,
+                mp_context=contexto_processos())
+        return _pool
+
+
+def fechar():
+    # Encerra o pool compartilhado, se foi criado (o servidor chama ao sair)
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(cancel_futures=True)
+            _pool = None
+
+
+def validar_itens(itens):
+    # Uma parte do lote, em sequência, como uma só tarefa
+    return [_validar_item(item) for item in itens]
+
+
+def analisar_lote(itens, executor=None, workers=None, mapear=None):
+    """Valida todos os itens, na ordem recebida, e devolve (resultados, resumo).
+
+    mapear(funcao, lista_de_args), se dado, roda as partes do lote no lugar
+    do pool deste módulo (o servidor em modo de produção passa o do pool
+    limitado, ver trabalhos.py): uma parte contígua por worker.
+    """
+    inicio = time.perf_counter()
+    if mapear is not None:
+        n = max(1, min(workers or os.cpu_count() or 1, len(itens)))
+        tamanho = -(-len(itens) // n)
+        partes = [(itens[i:i + tamanho],) for i in range(0, len(itens), tamanho)]
+        resultados = [r for parte in mapear(validar_itens, partes) for r in parte]
+    elif workers == 1:
+        resultados = [_validar_item(item) for item in itens]
+    else:
+        executor = executor or pool(workers)
+        # Lotes de vários arquivos por tarefa diluem o custo de comunicação
+        chunksize = max(1, len(itens) // ((workers or os.cpu_count() or 1) * 4))
+        resultados = list(executor.map(_validar_item, itens, chunksize=chunksize))
+    validos = sum(1 for r in resultados if r["valid"])
+    resumo = {
+        "total": len(resultados),
+        "valid": validos,
+        "invalid": len(resultados) - validos,
+        "elapsed_ms": (time.perf_counter() - inicio) * 1000,
+    }
+    return resultados, resumo
+
+
+def _inteiro_positivo(texto):
+    try:
+        valor = int(texto)
+    except ValueError:
+        valor = 0
+    if valor < 1:
+        raise argparse.ArgumentTypeError(f"deve ser um inteiro positivo: {texto!r}")
+    return valor
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Valida vários programas em paralelo.")
+    parser.add_argument("caminhos", nargs="+", help="arquivos, diretórios, globs ou .zip")
+    parser.add_argument("--workers", type=_inteiro_positivo, default=None,
+                        help="número de processos (padrão: número de CPUs)")
+    parser.add_argument("--json", action="store_true", help="saída em JSON")
+    args = parser.parse_args(argv)
+
+    itens = itens_de_caminhos(args.caminhos)
+    if not itens:
+        print("Nenhum arquivo .txt/.docx encontrado.", file=sys.stderr)
+        return 2
+    if args.workers == 1:
+        resultados, resumo = analisar_lote(itens, workers=1)
+    else:
+        with ProcessPoolExecutor(args.workers, mp_context=contexto_processos()) as executor:
+            resultados, resumo = analisar_lote(itens, executor=executor, workers=args.workers)
+
+    if args.json:
+        json.dump({"results": resultados, **resumo}, sys.stdout, ensure_ascii=False, indent=2)
+        print()
+    else:
+        for r in resultados:
+            status = "VÁLIDO  " if r["valid"] else "INVÁLIDO"
+            linha = f" (linha {r['line']})" if r["line"] is not None else ""
+            print(f"[{status}] {r['file']}{linha} {r['time_ms']:.1f} ms")
+            if not r["valid"]:
+                print("          " + r["message"].replace("\n", " | "))
+        print(f"\n{resumo['total']} arquivos: {resumo['valid']} válidos, "
+              f"{resumo['invalid']} inválidos em {resumo['elapsed_ms'] / 1000:.2f} s")
+    return 0 if resumo["invalid"] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
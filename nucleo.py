@@ -0,0 +1,1356 @@
+import io
+import sys
+from itertools import compress, islice
+from operator import attrgetter, methodcaller
+import linguagem
+from leitor import CHUNK_PADRAO, abrir_fonte, varrer
+from linhas import IndiceLinhas
+from token_stream import TokenStream
+from rastreamento import ENTER, EXIT, SHIFT, Rastro
+from arvore import ConstrutorArvore
+from perfil import perfil_ativo, perfilar
+
+# Núcleo do analisador: lexer, Parser e as análises prontas para JSON, sem
+# depender do Flask nem do python-docx. O app.py (interface web), o lote.py e
+# a linha de comando abaixo usam este módulo.
+
+# ==============================================================================
+# 1. ANALISADOR LÉXICO (Mantido, mas gera tokens para o parser)
+# ==============================================================================
+#
+# A especificação dos tokens fica em linguagem.py. Todas as funções abaixo
+# aceitam dialeto=<nome> (padrão: o dialeto que o Parser entende).
+#
+# A linha de cada token é a do seu primeiro caractere. Os lexers que têm a
+# fonte inteira tiram as linhas do índice de linhas (linhas.py) em vez de
+# contar quebras token a token; os em fluxo contam as quebras só nos tipos que
+# podem contê-las (SKIP, MISMATCH e os delimitadores do dialeto).
+
+_padrao = linguagem.obter()
+palavras_reservadas = _padrao.palavras_reservadas
+token_specification = _padrao.especificacao
+
+def erro_lexico(value, line_num, coluna=None):
+    # SyntaxError com a linha, a coluna (e o lexema) também em atributos, para
+    # quem precisa deles sem interpretar a mensagem (ex.: análise em lote,
+    # lexer paralelo)
+    onde = f"na linha {line_num}" if coluna is None else f"na linha {line_num}, coluna {coluna}"
+    erro = SyntaxError(f"Erro léxico: '{value}' {onde}")
+    erro.linha = line_num
+    erro.coluna = coluna
+    erro.valor = value
+    return erro
+
+def caractere_invalido(line_num, coluna):
+    # Nenhum padrão do dialeto casa (dialeto sem MISMATCH)
+    erro = SyntaxError(f"Caractere inválido na linha {line_num}, coluna {coluna}")
+    erro.linha = line_num
+    erro.coluna = coluna
+    return erro
+
+# Motor alternativo (engine="dfa"): autômato determinístico compilado a partir
+# da mesma especificação (palavras reservadas embutidas). É compilado (ou
+# carregado do disco) no primeiro uso de cada dialeto. Em Python puro ele não
+# ganha do regex, então os caminhos quentes (lexer(), tokenizar()) usam o
+# regex por padrão; o autômato fica para quem precisa do que só ele faz:
+# retomar um token entre blocos (lexer em fluxo) e saber até onde o lexer
+# examinou o texto (re-análise incremental).
+def get_automato(dialeto=None):
+    return linguagem.obter(dialeto).automato()
+
+def lexer(code, engine="regex", dialeto=None):
+    if engine == "dfa":
+        return lexer_dfa(code, dialeto)
+    if engine != "regex":
+        raise ValueError(f"Motor léxico desconhecido: {engine}")
+    return lexer_regex(code, dialeto)
+
+def lexer_dfa(code, dialeto=None):
+    d = linguagem.obter(dialeto)
+    automato = d.automato()
+    match = automato.match
+    kinds = automato.kinds
+    reservadas = d.palavras_reservadas
+    # Dialetos com as palavras reservadas fora do autômato conferem todo ID
+    conferir_ids = not d.reservadas_no_automato
+    ignorados = {automato.kind_index[k] for k in d.ignorar}
+    skip = automato.kind_index["SKIP"]
+    mismatch = automato.kind_index["MISMATCH"]
+    ident = automato.kind_index["ID"]
+    indice = IndiceLinhas(code)
+    inicios = indice.inicios
+    line_num = 1
+    proxima = inicios[1]   # início da linha seguinte
+    pos = 0
+    n = len(code)
+    while pos < n:
+        k, end, _ = match(code, pos, n)
+        if k < 0:
+            raise caractere_invalido(*indice.posicao(pos))
+        while pos >= proxima:
+            line_num += 1
+            proxima = inicios[line_num]
+        if k == skip or (k == mismatch and k in ignorados):
+            pass
+        elif k == ident:
+            value = code[pos:end]
+            # Identificadores não-ASCII podem virar palavra reservada no upper()
+            # (ex.: "ı".upper() == "I"), caso que o autômato não enxerga
+            if (conferir_ids or not value.isascii()) and value.upper() in reservadas:
+                yield d.tipo_reservada(value.upper()), value, line_num
+            else:
+                yield "ID", value, line_num
+        elif k == mismatch:
+            raise erro_lexico(code[pos:end], line_num, indice.coluna(pos))
+        elif k not in ignorados:
+            yield kinds[k], code[pos:end], line_num
+        pos = end
+
+    yield "EOF", "", len(indice)
+
+def nomes_tipos(dialeto=None):
+    # Tabela de tipos dos códigos de tokenizar() e lexer_stream_posicoes():
+    # os do autômato, EOF e o tipo único das palavras reservadas, se houver
+    d = linguagem.obter(dialeto)
+    nomes = d.tipos() + ["EOF"]
+    if d.reservada_como:
+        nomes.append(d.reservada_como)
+    return nomes
+
+def _casar_regex(d, codigos):
+    # Pattern.match no formato de Automato.match: (código do tipo, fim, _)
+    get_token = d.regex().match
+
+    def casar(code, pos, n):
+        match = get_token(code, pos)
+        if match is None:
+            return -1, pos, False
+        return codigos[match.lastgroup], match.end(), False
+    return casar
+
+# Casamentos do regex convertidos por lote em tokenizar(). Lotes pequenos: os
+# objetos Match de um lote são liberados antes de o coletor de lixo (limiar de
+# 700 alocações na geração 0) precisar percorrê-los
+LOTE_TOKENS = 512
+_tipo_do_casamento = attrgetter("lastindex")
+_fim_do_casamento = methodcaller("end")
+
+def tokenizar(code, recuperar=False, dialeto=None, engine="regex"):
+    # Como lexer(code, engine), mas guarda os tokens em um TokenStream
+    # (arrays de códigos e deslocamentos) em vez de gerar tuplas.
+    # recuperar=True: caracteres inválidos viram tokens MISMATCH no fluxo (os
+    # vizinhos são juntados em um só) em vez de interromper a análise
+    if engine not in ("regex", "dfa"):
+        raise ValueError(f"Motor léxico desconhecido: {engine}")
+    d = linguagem.obter(dialeto)
+    tokens = TokenStream(code, nomes_tipos(dialeto))
+    if engine == "regex" and perfil_ativo() is None:
+        _tokenizar_em_lotes(d, tokens, recuperar)
+    else:
+        # O perfil cronometra cada casamento, então precisa do laço por token
+        _tokenizar_por_token(d, tokens, recuperar, engine)
+    n = len(code)
+    tokens.append(tokens.kind_codes["EOF"], n, n)
+    return tokens
+
+def _tokenizar_em_lotes(d, tokens, recuperar):
+    # O regex casa os tokens em C; cada lote de casamentos vira códigos,
+    # inícios e fins com map/compress/translate, também em C, sem um laço
+    # Python por token. Os IDs que são palavras reservadas trocam de código
+    # pelo par (ID, lexema em maiúsculas) em um dicionário. Só um lote com
+    # caractere inválido, na recuperação de erros, é percorrido token a token
+    code = tokens.source
+    regex = d.regex()
+    codigos = tokens.kind_codes
+    grupo_tipo = [0] * (regex.groups + 1)
+    for nome, grupo in regex.groupindex.items():
+        grupo_tipo[grupo] = codigos[nome]
+    mismatch = codigos["MISMATCH"]
+    ident = codigos["ID"]
+    descartados = {codigos[k] for k in d.ignorar}
+    if recuperar:
+        descartados.discard(mismatch)
+    descartar = bytes(sorted(descartados))
+    manter = bytes(0 if k in descartados else 1 for k in range(256))
+    mismatch_e_erro = not recuperar and mismatch not in descartados
+    reservada = {(ident, palavra): codigos[d.tipo_reservada(palavra)]
+                 for palavra in d.palavras_reservadas}
+    # scanner().match casa sempre a partir do fim do anterior (não pula texto
+    # como o finditer), então o início de cada token é o fim do anterior e o
+    # primeiro caractere que nenhum padrão aceita encerra os casamentos
+    casamentos = iter(regex.scanner(code).match, None)
+    pos = 0
+    while True:
+        lote = list(islice(casamentos, LOTE_TOKENS))
+        if not lote:
+            break
+        ks = bytes(map(grupo_tipo.__getitem__, map(_tipo_do_casamento, lote)))
+        fins = list(map(_fim_do_casamento, lote))
+        inicios = [pos]
+        inicios += fins[:-1]
+        pos = fins[-1]
+        if mismatch in ks:
+            if mismatch_e_erro:
+                i = ks.index(mismatch)
+                raise erro_lexico(code[inicios[i]:fins[i]], *tokens.indice.posicao(inicios[i]))
+            if recuperar:
+                _lote_com_invalidos(tokens, ks, inicios, fins, manter, reservada, mismatch)
+                continue
+        if descartar:
+            selecao = ks.translate(manter)
+            ks = ks.translate(None, descartar)
+            inicios = list(compress(inicios, selecao))
+            fins = list(compress(fins, selecao))
+        lexemas = map(code.__getitem__, map(slice, inicios, fins))
+        ks = bytes(map(reservada.get, zip(ks, map(str.upper, lexemas)), ks))
+        tokens.extend(ks, inicios, fins)
+    if pos != len(code):
+        raise caractere_invalido(*tokens.indice.posicao(pos))
+
+def _lote_com_invalidos(tokens, ks, inicios, fins, manter, reservada, mismatch):
+    code = tokens.source
+    append = tokens.append
+    for k, inicio, fim in zip(ks, inicios, fins):
+        if k == mismatch:
+            if len(tokens) and tokens.kinds[-1] == mismatch and tokens.ends[-1] == inicio:
+                tokens.ends[-1] = fim
+            else:
+                append(k, inicio, fim)
+        elif manter[k]:
+            append(reservada.get((k, code[inicio:fim].upper()), k), inicio, fim)
+
+def _tokenizar_por_token(d, tokens, recuperar, engine):
+    code = tokens.source
+    kind_index = tokens.kind_codes
+    if engine == "dfa":
+        match = d.automato().match
+        # Dialetos com as palavras reservadas fora do autômato conferem todo ID
+        conferir_ids = not d.reservadas_no_automato
+    else:
+        match = _casar_regex(d, kind_index)
+        conferir_ids = True
+    perfil = perfil_ativo()
+    if perfil is not None:
+        match = perfil.cronometrar_automato(match, tokens.kind_names)
+    reservadas = d.palavras_reservadas
+    ignorados = {kind_index[k] for k in d.ignorar}
+    skip = kind_index["SKIP"]
+    mismatch = kind_index["MISMATCH"]
+    ident = kind_index["ID"]
+    append = tokens.append
+    ascii_only = code.isascii()
+    pos = 0
+    n = len(code)
+    while pos < n:
+        k, end, _ = match(code, pos, n)
+        if k < 0:
+            raise caractere_invalido(*tokens.indice.posicao(pos))
+        if k == skip:
+            pass
+        elif k == mismatch and (recuperar or k not in ignorados):
+            if not recuperar:
+                raise erro_lexico(code[pos:end], *tokens.indice.posicao(pos))
+            if len(tokens) and tokens.kinds[-1] == mismatch and tokens.ends[-1] == pos:
+                tokens.ends[-1] = end
+            else:
+                append(k, pos, end)
+        elif k not in ignorados:
+            if k == ident and (conferir_ids or not ascii_only):
+                upper = code[pos:end].upper()
+                if upper in reservadas:
+                    k = kind_index[d.tipo_reservada(upper)]
+            append(k, pos, end)
+        pos = end
+
+def _tipos_multilinha(d, automato):
+    # Códigos dos tipos cujo lexema pode ter quebras de linha
+    return ({automato.kind_index["SKIP"], automato.kind_index["MISMATCH"]}
+            | {automato.kind_index[tipo] for tipo, _, _ in d.delimitadores})
+
+def tokens_em_fluxo(fonte, chunk_size=CHUNK_PADRAO, dialeto=None, invalidos_como_tokens=False,
+                    em_bytes=False):
+    """Núcleo dos lexers em fluxo: gera (código, lexema, início, fim, linha).
+
+    Lê a fonte (arquivo ou mmap) em blocos com o autômato. O código indexa
+    nomes_tipos(dialeto); início e fim são deslocamentos em caracteres na
+    fonte, ou em bytes UTF-8 com em_bytes. O último token é o EOF. Com
+    invalidos_como_tokens, cada caractere inválido vira um token MISMATCH em
+    vez de erro léxico (analisador.py).
+    """
+    d = linguagem.obter(dialeto)
+    automato = d.automato()
+    codigos = {nome: i for i, nome in enumerate(nomes_tipos(dialeto))}
+    reservadas = d.palavras_reservadas
+    conferir_ids = not d.reservadas_no_automato
+    ignorados = {automato.kind_index[k] for k in d.ignorar}
+    skip = automato.kind_index["SKIP"]
+    mismatch = automato.kind_index["MISMATCH"]
+    ident = automato.kind_index["ID"]
+    multilinha = _tipos_multilinha(d, automato)
+    line_num = 1
+    inicio_linha = 0
+    pos = 0      # em caracteres (colunas dos erros)
+    fim = 0      # na unidade dos deslocamentos gerados
+    for k, value in varrer(automato, fonte, chunk_size):
+        inicio = pos
+        pos += len(value)
+        comeco = fim
+        fim += len(value) if not em_bytes or value.isascii() else len(value.encode('utf-8'))
+        if k == skip or (k == mismatch and k in ignorados):
+            pass
+        elif k == ident:
+            if (conferir_ids or not value.isascii()) and value.upper() in reservadas:
+                yield codigos[d.tipo_reservada(value.upper())], value, comeco, fim, line_num
+            else:
+                yield k, value, comeco, fim, line_num
+        elif k == mismatch and not invalidos_como_tokens:
+            raise erro_lexico(value, line_num, inicio - inicio_linha + 1)
+        elif k not in ignorados:
+            yield k, value, comeco, fim, line_num
+        if k in multilinha and '\n' in value:
+            line_num += value.count('\n')
+            inicio_linha = inicio + value.rfind('\n') + 1
+
+    yield codigos["EOF"], "", fim, fim, line_num
+
+def lexer_stream(fonte, chunk_size=CHUNK_PADRAO, dialeto=None):
+    # Mesma saída de lexer(), mas lendo a fonte (arquivo ou mmap) em blocos
+    nomes = nomes_tipos(dialeto)
+    for k, value, _, _, linha in tokens_em_fluxo(fonte, chunk_size, dialeto):
+        yield nomes[k], value, linha
+
+def lexer_stream_posicoes(fonte, chunk_size=CHUNK_PADRAO, dialeto=None):
+    # Como lexer_stream(), mas gera (código do tipo, início, fim, linha): o
+    # código indexa nomes_tipos(dialeto) e início/fim são deslocamentos em
+    # caracteres na fonte. Nenhum lexema é copiado para o chamador
+    for k, _, inicio, fim, linha in tokens_em_fluxo(fonte, chunk_size, dialeto):
+        yield k, inicio, fim, linha
+
+def lexer_regex(code, dialeto=None):
+    d = linguagem.obter(dialeto)
+    get_token = d.regex().match
+    perfil = perfil_ativo()
+    if perfil is not None:
+        get_token = perfil.cronometrar_regex(get_token)
+    reservadas = d.palavras_reservadas
+    ignorar = d.ignorar
+    indice = IndiceLinhas(code)
+    inicios = indice.inicios
+    line_num = 1
+    proxima = inicios[1]   # início da linha seguinte
+    pos = 0
+    while pos < len(code):
+        match = get_token(code, pos)
+        if not match:
+            raise caractere_invalido(*indice.posicao(pos))
+        
+        kind = match.lastgroup
+        value = match.group()
+        while pos >= proxima:
+            line_num += 1
+            proxima = inicios[line_num]
+        
+        if kind == "SKIP" or (kind == "MISMATCH" and kind in ignorar):
+            pass
+        elif kind == "ID":
+            if value.upper() in reservadas:
+                kind = d.tipo_reservada(value.upper())
+            yield kind, value, line_num
+        elif kind == "MISMATCH":
+            raise erro_lexico(value, line_num, indice.coluna(pos))
+        elif kind not in ignorar:
+            yield kind, value, line_num
+            
+        pos = match.end()
+    
+    yield "EOF", "", len(indice)
+
+# ==============================================================================
+# 2. ANALISADOR SINTÁTICO COM LOGS (Instrumentado)
+# ==============================================================================
+
+def _sem_log(*args):
+    pass
+
+# Conjuntos de tokens esperados, informados junto com o erro (erro.esperado)
+ESPERADO_COMANDO = ('ID', 'READ', 'READLN', 'WRITE', 'WRITELN', 'BEGIN', 'IF', 'WHILE')
+ESPERADO_FATOR = ('PLUS', 'MINUS', 'LPAREN', 'ID', 'NUMBER', 'TRUE', 'FALSE')
+ESPERADO_TIPO = ('INTEGER', 'BOOLEAN')
+
+class Parser:
+    # trace: "text" imprime os logs (padrão), "struct" grava registros
+    # compactos em self.trace (ver rastreamento.py), "ast" monta a árvore
+    # sintática em self.arvore (ver arvore.py) e "off" não registra nada.
+    # saida: destino dos logs de texto (qualquer objeto com write); se omitido,
+    # usa o sys.stdout. Cada instância escreve só no seu destino, então
+    # parsers em threads diferentes não misturam os logs.
+    def __init__(self, tokens, trace="text", saida=None):
+        # Um TokenStream é consumido diretamente, sem materializar tuplas: as
+        # regras olham só current_type, tirado do array de códigos, e a tupla
+        # do token (current_token) é montada apenas para erros e diagnósticos
+        if isinstance(tokens, TokenStream):
+            self.tokens = tokens
+            self._nomes, self._codigos = tokens.kind_names, tokens.kinds
+        else:
+            self.tokens = list(tokens)
+            self._nomes = [t[0] for t in self.tokens]
+            self._codigos = range(len(self.tokens))
+        self._total = len(self.tokens)
+        self.pos = 0
+        self.current_type = self._nomes[self._codigos[0]]
+        self.indent_level = 0 # Controla a indentação dos logs
+        self.saida = saida
+        self.trace = None
+        self.arvore = None
+        self.erro = None      # SyntaxError que interrompeu a análise
+        if trace == "off":
+            # Caminho rápido: nenhum log é formatado
+            self._enter_rule = self._exit_rule = self._shift_log = _sem_log
+        elif trace == "struct":
+            self.trace = Rastro(4 * len(self.tokens))
+            self._enter_rule = self._enter_struct
+            self._exit_rule = self._exit_struct
+            self._shift_log = self._shift_struct
+        elif trace == "ast":
+            # Os ganchos montam a árvore sintática em self.arvore (ver arvore.py)
+            construtor = ConstrutorArvore(self)
+            self.arvore = construtor.arvore
+            self._enter_rule = construtor.entrar
+            self._exit_rule = construtor.sair
+            self._shift_log = construtor.consumir
+        elif trace != "text":
+            raise ValueError(f"Modo de rastro desconhecido: {trace}")
+        # Com um perfil ativo (ver perfil.py) os ganchos acima são encadeados
+        # aos que medem cada regra
+        perfil = perfil_ativo()
+        if perfil is not None:
+            perfil.instrumentar(self, _sem_log)
+
+    # --- Helpers de Log estruturado ---
+    def _enter_struct(self, rule_name):
+        self.trace.registrar(ENTER, self.trace.codigo_regra(rule_name), self.pos, self.indent_level)
+        self.indent_level += 1
+
+    def _exit_struct(self, rule_name):
+        self.indent_level -= 1
+        self.trace.registrar(EXIT, self.trace.codigo_regra(rule_name), self.pos, self.indent_level)
+
+    def _shift_struct(self, token_type):
+        self.trace.registrar(SHIFT, 0, self.pos, self.indent_level)
+
+    # --- Helpers de Log ---
+    def _log(self, msg):
+        indent = "|   " * self.indent_level
+        print(f"{indent}{msg}", file=self.saida)
+
+    def _enter_rule(self, rule_name):
+        self._log(f"┌── ENTER <{rule_name}>")
+        self.indent_level += 1
+
+    def _exit_rule(self, rule_name):
+        self.indent_level -= 1
+        self._log(f"└── REDUCE <{rule_name}> (Regra validada)")
+
+    def _shift_log(self, token_type):
+        indent = "|   " * self.indent_level
+        value = self.current_token[1]
+        print(f"{indent}>> SHIFT: Consumiu '{value}' ({token_type})", file=self.saida)
+
+    # --- Controle de Fluxo ---
+    @property
+    def current_token(self):
+        # (tipo, valor, linha) do token atual; depois do EOF, continua no EOF
+        return self.tokens[min(self.pos, self._total - 1)]
+
+    def error(self, msg, esperado=()):
+        token_atual = self.current_token
+        erro = SyntaxError(
+            f"\n[ERRO SINTÁTICO] {msg}\n"
+            f"Linha: {token_atual[2]} | Encontrado: '{token_atual[1]}' ({token_atual[0]})"
+        )
+        erro.linha = token_atual[2]
+        erro.esperado = esperado
+        self.erro = erro
+        raise erro
+
+    def eat(self, token_type):
+        if self.current_type == token_type:
+            self._shift_log(token_type)
+            self.pos += 1
+            if self.pos < self._total:
+                self.current_type = self._nomes[self._codigos[self.pos]]
+        else:
+            self.error(f"Esperava token '{token_type}'", (token_type,))
+
+    # --- Regras da Gramática (Métodos) ---
+
+    def parse_program(self):
+        self._enter_rule("programa")
+        try:
+            self.eat('PROGRAM')
+            self.eat('ID')
+            self.eat('SEMI')
+            
+            if self.current_type == 'VAR':
+                self.parse_declaracoes()
+                
+            self.eat('BEGIN')
+            self.parse_lista_comandos()
+            self.eat('END')
+            self.eat('DOT')
+        finally:
+            self._exit_rule("programa")
+
+    def parse_declaracoes(self):
+        self._enter_rule("declarações")
+        try:
+            self.eat('VAR')
+            while self.current_type == 'ID':
+                self.parse_lista_ids()
+                self.eat('COLON')
+                self.parse_tipo()
+                self.eat('SEMI')
+        finally:
+            self._exit_rule("declarações")
+
+    def parse_lista_ids(self):
+        self._enter_rule("lista_ids")
+        try:
+            self.eat('ID')
+            while self.current_type == 'COMMA':
+                self.eat('COMMA')
+                self.eat('ID')
+        finally:
+            self._exit_rule("lista_ids")
+
+    def parse_tipo(self):
+        self._enter_rule("tipo")
+        try:
+            if self.current_type in ('INTEGER', 'BOOLEAN'):
+                self.eat(self.current_type)
+            else:
+                self.error("Esperado tipo 'integer' ou 'boolean'", ESPERADO_TIPO)
+        finally:
+            self._exit_rule("tipo")
+
+    def parse_lista_comandos(self):
+        self._enter_rule("lista_comandos")
+        try:
+            self.parse_comando()
+            self.eat('SEMI')
+            
+            first_comando = {'ID', 'READ', 'READLN', 'WRITE', 'WRITELN', 'BEGIN', 'IF', 'WHILE'}
+            while self.current_type in first_comando:
+                self.parse_comando()
+                self.eat('SEMI')
+        finally:
+            self._exit_rule("lista_comandos")
+
+    def parse_comando(self):
+        self._enter_rule("comando")
+        try:
+            token_type = self.current_type
+            if token_type == 'ID':
+                self.parse_atribuicao()
+            elif token_type in ('READ', 'READLN'):
+                self.parse_leitura()
+            elif token_type in ('WRITE', 'WRITELN'):
+                self.parse_escrita()
+            elif token_type == 'BEGIN':
+                self.parse_composto()
+            elif token_type == 'IF':
+                self.parse_condicional()
+            elif token_type == 'WHILE':
+                self.parse_repeticao()
+            else:
+                self.error("Comando não reconhecido", ESPERADO_COMANDO)
+        finally:
+            self._exit_rule("comando")
+
+    def parse_atribuicao(self):
+        self._enter_rule("atribuição")
+        try:
+            self.eat('ID')
+            self.eat('ASSIGN')
+            self.parse_expr()
+        finally:
+            self._exit_rule("atribuição")
+
+    def parse_leitura(self):
+        self._enter_rule("leitura")
+        try:
+            if self.current_type == 'READ':
+                self.eat('READ')
+                self.eat('LPAREN')
+                self.parse_lista_ids()
+                self.eat('RPAREN')
+            elif self.current_type == 'READLN':
+                self.eat('READLN')
+                if self.current_type == 'LPAREN':
+                    self.eat('LPAREN')
+                    self.parse_lista_ids()
+                    self.eat('RPAREN')
+        finally:
+            self._exit_rule("leitura")
+
+    def parse_escrita(self):
+        self._enter_rule("escrita")
+        cmd = self.current_type
+        try:
+            self.eat(cmd)
+            if self.current_type == 'LPAREN':
+                self.eat('LPAREN')
+                self.parse_lista_stringvar()
+                self.eat('RPAREN')
+        finally:
+            self._exit_rule("escrita")
+
+    def parse_lista_stringvar(self):
+        self._enter_rule("lista_stringvar")
+        try:
+            self.parse_stringvar()
+            while self.current_type == 'COMMA':
+                self.eat('COMMA')
+                self.parse_stringvar()
+        finally:
+            self._exit_rule("lista_stringvar")
+
+    def parse_stringvar(self):
+        # Não logaremos enter/exit aqui para não poluir muito, pois é muito simples
+        if self.current_type == 'STRING':
+            self.eat('STRING')
+        else:
+            self.parse_expr()
+
+    def parse_composto(self):
+        self._enter_rule("composto")
+        try:
+            self.eat('BEGIN')
+            self.parse_lista_comandos()
+            self.eat('END')
+        finally:
+            self._exit_rule("composto")
+
+    def parse_condicional(self):
+        self._enter_rule("condicional")
+        try:
+            self.eat('IF')
+            self.parse_exprboolean()
+            self.eat('THEN')
+            self.parse_comando()
+            if self.current_type == 'ELSE':
+                self.eat('ELSE')
+                self.parse_comando()
+        finally:
+            self._exit_rule("condicional")
+
+    def parse_repeticao(self):
+        self._enter_rule("repetição")
+        try:
+            self.eat('WHILE')
+            self.parse_exprboolean()
+            self.eat('DO')
+            self.parse_comando()
+        finally:
+            self._exit_rule("repetição")
+
+    def parse_exprboolean(self):
+        self._enter_rule("expr_boolean")
+        try:
+            self.parse_expr()
+            ops_relacionais = {'LESS', 'LE_EQ', 'GREATER', 'GE_EQ', 'EQUAL', 'NE_EQ'}
+            if self.current_type in ops_relacionais:
+                self.eat(self.current_type)
+                self.parse_expr()
+        finally:
+            self._exit_rule("expr_boolean")
+
+    def parse_expr(self):
+        self._enter_rule("expressão")
+        try:
+            self.parse_termo()
+            while self.current_type in ('PLUS', 'MINUS'):
+                self.eat(self.current_type)
+                self.parse_termo()
+        finally:
+            self._exit_rule("expressão")
+
+    def parse_termo(self):
+        self._enter_rule("termo")
+        try:
+            self.parse_fator()
+            while self.current_type in ('TIMES', 'DIVIDE'):
+                self.eat(self.current_type)
+                self.parse_fator()
+        finally:
+            self._exit_rule("termo")
+
+    def parse_fator(self):
+        self._enter_rule("fator")
+        try:
+            token_type = self.current_type
+            if token_type in ('PLUS', 'MINUS'):
+                self.eat(token_type)
+                self.parse_fator()
+            elif token_type == 'LPAREN':
+                self.eat('LPAREN')
+                self.parse_expr()
+                self.eat('RPAREN')
+            elif token_type == 'ID':
+                self.eat('ID')
+            elif token_type == 'NUMBER':
+                self.eat('NUMBER')
+            elif token_type in ('TRUE', 'FALSE'):
+                self.eat(token_type)
+            else:
+                self.error("Fator inesperado", ESPERADO_FATOR)
+        finally:
+            self._exit_rule("fator")
+
+# --- Motor com pilha explícita ---
+#
+# Mesma gramática, mesmos eventos de log e mesmas mensagens de erro do Parser
+# acima, mas cada regra é um gerador que devolve (yield) a sub-regra que quer
+# chamar; parse_program empilha os geradores em uma lista em vez de usar a
+# pilha do Python. Regras que não chamam outras (declarações, leitura,
+# fatores simples) continuam sendo os métodos do Parser. Assim o aninhamento
+# ("((((...))))", begin/end, if/while) fica limitado só pela memória, sem
+# RecursionError.
+
+class ParserIterativo(Parser):
+    first_comando = frozenset({'ID', 'READ', 'READLN', 'WRITE', 'WRITELN', 'BEGIN', 'IF', 'WHILE'})
+    ops_relacionais = frozenset({'LESS', 'LE_EQ', 'GREATER', 'GE_EQ', 'EQUAL', 'NE_EQ'})
+    # Fatores sem sub-regras: o método recursivo do Parser resolve em um
+    # nível só, sem criar gerador
+    fatores_simples = frozenset({'ID', 'NUMBER', 'TRUE', 'FALSE'})
+
+    def parse_program(self):
+        topo = self._programa()
+        pilha = [topo]
+        empilhar = pilha.append
+        desempilhar = pilha.pop
+        erro = None
+        while True:
+            try:
+                regra = next(topo, None) if erro is None else topo.throw(erro)
+            except StopIteration:
+                regra = None
+            except BaseException as e:
+                # A regra do topo não tratou o erro: ele é repassado (throw) à
+                # regra que a chamou, como no desempilhar do Parser recursivo;
+                # o "finally" de cada uma registra o REDUCE
+                desempilhar()
+                if not pilha:
+                    raise
+                topo = pilha[-1]
+                erro = e
+                continue
+            erro = None
+            if regra is None:
+                # Regra terminou: volta para quem a chamou
+                desempilhar()
+                if not pilha:
+                    break
+                topo = pilha[-1]
+            else:
+                topo = regra()
+                empilhar(topo)
+
+    def _programa(self):
+        self._enter_rule("programa")
+        try:
+            self.eat('PROGRAM')
+            self.eat('ID')
+            self.eat('SEMI')
+            if self.current_type == 'VAR':
+                self.parse_declaracoes()
+            self.eat('BEGIN')
+            yield self._lista_comandos
+            self.eat('END')
+            self.eat('DOT')
+        finally:
+            self._exit_rule("programa")
+
+    def _lista_comandos(self):
+        self._enter_rule("lista_comandos")
+        try:
+            yield self._comando
+            self.eat('SEMI')
+            while self.current_type in self.first_comando:
+                yield self._comando
+                self.eat('SEMI')
+        finally:
+            self._exit_rule("lista_comandos")
+
+    def _comando(self):
+        self._enter_rule("comando")
+        try:
+            token_type = self.current_type
+            if token_type == 'ID':
+                yield self._atribuicao
+            elif token_type in ('READ', 'READLN'):
+                self.parse_leitura()
+            elif token_type in ('WRITE', 'WRITELN'):
+                yield self._escrita
+            elif token_type == 'BEGIN':
+                yield self._composto
+            elif token_type == 'IF':
+                yield self._condicional
+            elif token_type == 'WHILE':
+                yield self._repeticao
+            else:
+                self.error("Comando não reconhecido", ESPERADO_COMANDO)
+        finally:
+            self._exit_rule("comando")
+
+    def _atribuicao(self):
+        self._enter_rule("atribuição")
+        try:
+            self.eat('ID')
+            self.eat('ASSIGN')
+            yield self._expr
+        finally:
+            self._exit_rule("atribuição")
+
+    def _escrita(self):
+        self._enter_rule("escrita")
+        cmd = self.current_type
+        try:
+            self.eat(cmd)
+            if self.current_type == 'LPAREN':
+                self.eat('LPAREN')
+                yield self._lista_stringvar
+                self.eat('RPAREN')
+        finally:
+            self._exit_rule("escrita")
+
+    def _lista_stringvar(self):
+        self._enter_rule("lista_stringvar")
+        try:
+            yield self._stringvar
+            while self.current_type == 'COMMA':
+                self.eat('COMMA')
+                yield self._stringvar
+        finally:
+            self._exit_rule("lista_stringvar")
+
+    def _stringvar(self):
+        if self.current_type == 'STRING':
+            self.eat('STRING')
+        else:
+            yield self._expr
+
+    def _composto(self):
+        self._enter_rule("composto")
+        try:
+            self.eat('BEGIN')
+            yield self._lista_comandos
+            self.eat('END')
+        finally:
+            self._exit_rule("composto")
+
+    def _condicional(self):
+        self._enter_rule("condicional")
+        try:
+            self.eat('IF')
+            yield self._exprboolean
+            self.eat('THEN')
+            yield self._comando
+            if self.current_type == 'ELSE':
+                self.eat('ELSE')
+                yield self._comando
+        finally:
+            self._exit_rule("condicional")
+
+    def _repeticao(self):
+        self._enter_rule("repetição")
+        try:
+            self.eat('WHILE')
+            yield self._exprboolean
+            self.eat('DO')
+            yield self._comando
+        finally:
+            self._exit_rule("repetição")
+
+    def _exprboolean(self):
+        self._enter_rule("expr_boolean")
+        try:
+            yield self._expr
+            if self.current_type in self.ops_relacionais:
+                self.eat(self.current_type)
+                yield self._expr
+        finally:
+            self._exit_rule("expr_boolean")
+
+    def _expr(self):
+        self._enter_rule("expressão")
+        try:
+            yield self._termo
+            while self.current_type in ('PLUS', 'MINUS'):
+                self.eat(self.current_type)
+                yield self._termo
+        finally:
+            self._exit_rule("expressão")
+
+    def _termo(self):
+        self._enter_rule("termo")
+        try:
+            if self.current_type in self.fatores_simples:
+                self.parse_fator()
+            else:
+                yield self._fator
+            while self.current_type in ('TIMES', 'DIVIDE'):
+                self.eat(self.current_type)
+                if self.current_type in self.fatores_simples:
+                    self.parse_fator()
+                else:
+                    yield self._fator
+        finally:
+            self._exit_rule("termo")
+
+    def _fator(self):
+        self._enter_rule("fator")
+        try:
+            token_type = self.current_type
+            if token_type in ('PLUS', 'MINUS'):
+                self.eat(token_type)
+                yield self._fator
+            elif token_type == 'LPAREN':
+                self.eat('LPAREN')
+                yield self._expr
+                self.eat('RPAREN')
+            elif token_type == 'ID':
+                self.eat('ID')
+            elif token_type == 'NUMBER':
+                self.eat('NUMBER')
+            elif token_type in ('TRUE', 'FALSE'):
+                self.eat(token_type)
+            else:
+                self.error("Fator inesperado", ESPERADO_FATOR)
+        finally:
+            self._exit_rule("fator")
+
+# --- Modo de recuperação de erros ---
+#
+# Em vez de parar no primeiro erro, registra um diagnóstico (linha, coluna,
+# tokens esperados, token encontrado) e se ressincroniza em modo pânico:
+# descarta tokens até um ";" (consumido), "begin" ou "end" e continua a
+# lista de comandos de onde der. Erros léxicos chegam como tokens MISMATCH
+# (tokenizar(code, recuperar=True)) e também viram diagnósticos. Assim um
+# arquivo com vários erros é analisado uma vez só.
+
+SINCRONIZACAO = frozenset({'SEMI', 'BEGIN', 'END', 'EOF'})
+
+
+class _Sincronizar(Exception):
+    # Interrompe a regra atual até o ponto de ressincronização mais próximo
+    pass
+
+
+class ParserRecuperacao(ParserIterativo):
+    def __init__(self, tokens, trace="off", saida=None, max_erros=100):
+        if trace == "ast":
+            # As regras interrompidas pela recuperação deixariam nós pela metade
+            raise ValueError("A recuperação de erros não monta a árvore sintática")
+        super().__init__(tokens, trace=trace, saida=saida)
+        self.diagnosticos = []
+        self.max_erros = max_erros
+        self._pos_ultimo_erro = -1
+        # Sem tokens MISMATCH no fluxo, eat() fica sendo o do Parser
+        if isinstance(self.tokens, TokenStream):
+            codigo = self.tokens.kind_codes.get('MISMATCH')
+            invalidos = codigo is not None and codigo in self.tokens.kinds
+        else:
+            invalidos = any(t[0] == 'MISMATCH' for t in self.tokens)
+        if invalidos:
+            self.eat = self._eat_pulando
+        self._pular_invalidos()
+
+    def _diagnostico(self, tipo, mensagem, esperado):
+        i = self.pos
+        if isinstance(self.tokens, TokenStream):
+            coluna = self.tokens.column(i)
+        else:
+            coluna = None
+        self.diagnosticos.append({
+            "type": tipo,
+            "line": self.current_token[2],
+            "column": coluna,
+            "expected": list(esperado),
+            "found": self.current_token[1],
+            "found_kind": self.current_type,
+            "message": mensagem,
+        })
+
+    def _avancar(self):
+        self.pos += 1
+        if self.pos < self._total:
+            self.current_type = self._nomes[self._codigos[self.pos]]
+
+    def _pular_invalidos(self):
+        while self.current_type == 'MISMATCH':
+            coluna = self.tokens.column(self.pos) if isinstance(self.tokens, TokenStream) else None
+            _, valor, linha = self.current_token
+            mensagem = erro_lexico(valor, linha, coluna).msg
+            self._diagnostico("lexico", mensagem, ())
+            self._avancar()
+
+    def _eat_pulando(self, token_type):
+        Parser.eat(self, token_type)
+        self._pular_invalidos()
+
+    def error(self, msg, esperado=()):
+        # Só um diagnóstico por posição: os erros em cascata de quem espera um
+        # token logo depois de uma recuperação não são repetidos
+        if self.pos != self._pos_ultimo_erro:
+            self._pos_ultimo_erro = self.pos
+            self._diagnostico("sintatico", msg, esperado)
+            if len(self.diagnosticos) >= self.max_erros:
+                raise SyntaxError(f"Análise interrompida depois de {self.max_erros} erros")
+        raise _Sincronizar()
+
+    def _pular_ate(self, tipos):
+        while self.current_type not in tipos and self.current_type != 'EOF':
+            self._avancar()
+            self._pular_invalidos()
+
+    def _sincronizar(self):
+        # Retorna True se a lista de comandos pode continuar
+        self._pular_ate(SINCRONIZACAO)
+        tipo = self.current_type
+        if tipo == 'SEMI':
+            self.eat('SEMI')
+            return True
+        return tipo == 'BEGIN'
+
+    def parse_program(self):
+        super().parse_program()
+        # Erros léxicos depois do fim do programa também são reportados
+        while self.current_type != 'EOF':
+            self._avancar()
+            self._pular_invalidos()
+        return self.diagnosticos
+
+    def _programa(self):
+        self._enter_rule("programa")
+        try:
+            try:
+                self.eat('PROGRAM')
+                self.eat('ID')
+                self.eat('SEMI')
+            except _Sincronizar:
+                self._pular_ate({'VAR', 'BEGIN'})
+            if self.current_type == 'VAR':
+                self.parse_declaracoes()
+            try:
+                self.eat('BEGIN')
+            except _Sincronizar:
+                pass
+            while True:
+                yield self._lista_comandos
+                try:
+                    self.eat('END')
+                    self.eat('DOT')
+                    break
+                except _Sincronizar:
+                    # "end" sobrando no meio do programa (ou outro token que
+                    # não começa comando): descarta o token e continua
+                    if self.current_type == 'EOF':
+                        break
+                    self._avancar()
+                    self._pular_invalidos()
+        finally:
+            self._exit_rule("programa")
+
+    def parse_declaracoes(self):
+        self._enter_rule("declarações")
+        try:
+            self.eat('VAR')
+            while self.current_type == 'ID':
+                try:
+                    self.parse_lista_ids()
+                    self.eat('COLON')
+                    self.parse_tipo()
+                    self.eat('SEMI')
+                except _Sincronizar:
+                    self._pular_ate({'SEMI', 'BEGIN'})
+                    if self.current_type == 'SEMI':
+                        self.eat('SEMI')
+        finally:
+            self._exit_rule("declarações")
+
+    def _lista_comandos(self):
+        self._enter_rule("lista_comandos")
+        try:
+            primeiro = True
+            while primeiro or self.current_type in self.first_comando:
+                primeiro = False
+                try:
+                    yield self._comando
+                    self.eat('SEMI')
+                except _Sincronizar:
+                    if not self._sincronizar():
+                        break
+        finally:
+            self._exit_rule("lista_comandos")
+
+# ==============================================================================
+# 3. ANÁLISES (resultado como dicionário pronto para JSON)
+# ==============================================================================
+
+def analisar_lexico(code, dialeto=None, formato="full"):
+    # formato="compact": em vez de [tipo, valor] por token, uma lista plana
+    # [código, distância, comprimento, código, distância, comprimento, ...]
+    # com os tipos em "kinds". distância é o número de caracteres entre o fim
+    # do token anterior (ou o início do código) e o início deste, então o
+    # início de cada token é o fim do anterior + distância
+    if formato == "compact":
+        tokens = tokenizar(code, dialeto=dialeto)
+        n = len(tokens) - 1  # sem o EOF
+        starts = tokens.starts[:n].tolist()
+        ends = tokens.ends[:n].tolist()
+        plana = [0] * (3 * n)
+        plana[0::3] = tokens.kinds[:n].tolist()
+        plana[1::3] = [s - e for s, e in zip(starts, [0] + ends)]
+        plana[2::3] = [e - s for s, e in zip(starts, ends)]
+        return {"kinds": list(tokens.kind_names), "tokens": plana}
+    if formato != "full":
+        raise ValueError(f"Formato desconhecido: {formato}")
+    tokens = []
+    for t in lexer(code, dialeto=dialeto):
+        if t[0] == 'EOF':
+            continue
+        tokens.append([t[0], t[1]])
+    return {"tokens": tokens}
+
+def analisar_sintaxe(code, trace='text', dialeto=None):
+    # trace: "text" devolve os logs prontos, "compact" devolve os registros do
+    # rastro estruturado para o navegador montar os logs quando precisar e
+    # "off" só valida
+    buf = io.StringIO()
+    valid = True
+    message = ""
+    p = None
+    
+    try:
+        tokens = tokenizar(code, dialeto=dialeto)
+        if trace == 'text':
+            p = ParserIterativo(tokens, saida=buf)
+            p.parse_program()
+        else:
+            p = ParserIterativo(tokens, trace="struct" if trace == 'compact' else "off")
+            p.parse_program()
+        message = "Código válido"
+    except SyntaxError as e:
+        valid = False
+        message = str(e)
+
+    if trace == 'compact':
+        resposta = {"valid": valid, "message": message, "trace": None}
+        if p is not None:
+            resposta["trace"] = {
+                "records": p.trace.compacto(),
+                "rules": p.trace.regras,
+                "tokens": [[p.tokens.kind(i), p.tokens.value(i)]
+                           for i in range(min(p.pos + 1, len(p.tokens)))],
+            }
+        return resposta
+    if trace == 'off':
+        return {"valid": valid, "message": message}
+
+    logs = buf.getvalue().splitlines()
+    
+    if not valid:
+        logs.append("-" * 40)
+        logs.append("FALHA ENCONTRADA:")
+        logs.extend(message.split('\n'))
+        logs.append("-" * 40)
+    return {"valid": valid, "message": message, "logs": logs}
+
+def analisar_diagnosticos(code, dialeto=None):
+    # Análise com recuperação de erros: devolve todos os diagnósticos léxicos
+    # e sintáticos de uma vez
+    p = ParserRecuperacao(tokenizar(code, recuperar=True, dialeto=dialeto))
+    try:
+        p.parse_program()
+        message = None
+    except SyntaxError as e:
+        # Limite de erros atingido
+        message = str(e)
+    erros = p.diagnosticos
+    if not erros:
+        return {"valid": True, "message": "Código válido", "errors": []}
+    return {"valid": False, "message": message or f"{len(erros)} erro(s) encontrado(s)",
+            "errors": erros}
+
+def analisar_arvore(code, dialeto=None):
+    # Valida e devolve a árvore sintática na forma plana de Arvore.para_json()
+    try:
+        p = ParserIterativo(tokenizar(code, dialeto=dialeto), trace="ast")
+        p.parse_program()
+    except SyntaxError as e:
+        return {"valid": False, "message": str(e), "ast": None}
+    return {"valid": True, "message": "Código válido", "ast": p.arvore.para_json()}
+
+def analisar_execucao(code, entrada="", dialeto=None, max_instrucoes=None):
+    # Valida, compila para bytecode e roda o programa (ver compilador.py).
+    # "valid" diz se o programa foi aceito (sintaxe, declarações e tipos);
+    # "completed" se a execução chegou ao fim sem erro nem limite excedido
+    from compilador import MAX_INSTRUCOES, ErroExecucao, ErroSemantico, compilar, executar
+    try:
+        p = ParserIterativo(tokenizar(code, dialeto=dialeto), trace="ast")
+        p.parse_program()
+        programa = compilar(p.arvore)
+    except (SyntaxError, ErroSemantico) as e:
+        return {"valid": False, "message": str(e), "output": None}
+    try:
+        resultado = executar(programa, entrada, max_instrucoes or MAX_INSTRUCOES)
+    except ErroExecucao as e:
+        return {"valid": True, "completed": False,
+                "message": f"Erro de execução na linha {e.linha}: {e}", "line": e.linha,
+                "output": e.saida, "instructions": e.instrucoes}
+    return {"valid": True, "completed": True, "message": "Execução concluída", **resultado}
+
+# ==============================================================================
+# 4. LINHA DE COMANDO
+# ==============================================================================
+#
+#   python nucleo.py programa.txt            (ou python app.py --cli programa.txt)
+#   cat programa.txt | python nucleo.py -
+#   python nucleo.py programa.txt --logs     (rastro do Parser)
+#   python nucleo.py programa.txt --todos    (todos os erros, com recuperação)
+#   python nucleo.py programa.txt --json
+#   python nucleo.py programa.txt --perfil   (tempo por regra e por tipo de token)
+#   python nucleo.py grande.txt --paralelo 8 (lexer em 8 processos, ver paralelo.py)
+#   python nucleo.py programa.txt --executar --entrada dados.txt
+#
+# Código de saída: 0 se o programa é válido, 1 se é inválido, 2 para erro de
+# uso ou de leitura do arquivo e 3 se a execução (--executar) parou com erro
+# ou por um limite.
+
+def _ler_texto(caminho):
+    with abrir_fonte(caminho) as fonte:
+        return fonte.read().decode('utf-8', errors='ignore')
+
+def main(argv=None, prog=None):
+    # argparse e json só são carregados aqui, não na importação do núcleo
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(prog=prog, description="Valida um programa (lexer + Parser).")
+    parser.add_argument("arquivo", help='arquivo-fonte ("-" lê da entrada padrão)')
+    parser.add_argument("--dialeto", default=None,
+                        help=f"dialeto da linguagem (padrão: {linguagem.PADRAO})")
+    modo = parser.add_mutually_exclusive_group()
+    modo.add_argument("--logs", action="store_true", help="mostra o rastro do Parser")
+    modo.add_argument("--todos", action="store_true",
+                      help="relata todos os erros em vez de parar no primeiro")
+    modo.add_argument("--executar", action="store_true",
+                      help="compila o programa para bytecode e o executa (ver compilador.py)")
+    parser.add_argument("--entrada", default=None, metavar="ARQUIVO",
+                        help="entrada do programa com --executar (padrão: nenhuma)")
+    parser.add_argument("--max-instrucoes", type=int, default=None, metavar="N",
+                        help="limite de instruções da execução (padrão: 10 milhões)")
+    parser.add_argument("--json", action="store_true", help="resultado em JSON")
+    parser.add_argument("--perfil", action="store_true",
+                        help="mede o tempo por regra da gramática e por tipo de token "
+                             "e mostra o relatório depois do resultado")
+    parser.add_argument("--paralelo", type=int, default=0, metavar="N",
+                        help="roda o lexer em N processos (fontes grandes; lê o arquivo "
+                             "inteiro para a memória)")
+    parser.add_argument("-q", "--silencioso", action="store_true",
+                        help="não escreve nada, só devolve o código de saída")
+    args = parser.parse_args(argv)
+    try:
+        dialeto = linguagem.obter(args.dialeto)
+    except ValueError as e:
+        parser.error(str(e))
+    if not dialeto.analisavel:
+        parser.error(f"o dialeto '{dialeto.nome}' não tem analisador sintático")
+    if args.paralelo and (args.json or args.todos or args.perfil or args.executar):
+        parser.error("--paralelo não pode ser usado com --json, --todos, --perfil ou --executar")
+    if (args.entrada is not None or args.max_instrucoes is not None) and not args.executar:
+        parser.error("--entrada e --max-instrucoes só valem com --executar")
+
+    dados_perfil = None
+    try:
+        if args.json or args.todos or args.perfil or args.executar:
+            code = _ler_texto(args.arquivo)
+            if args.todos:
+                funcao, opcoes = analisar_diagnosticos, (code, dialeto.nome)
+            elif args.executar:
+                entrada = _ler_texto(args.entrada) if args.entrada is not None else ""
+                funcao, opcoes = analisar_execucao, (code, entrada, dialeto.nome,
+                                                     args.max_instrucoes)
+            else:
+                funcao, opcoes = analisar_sintaxe, (code, 'text' if args.logs else 'off', dialeto.nome)
+            if args.perfil:
+                resultado, dados_perfil = perfilar(funcao, *opcoes)
+            else:
+                resultado = funcao(*opcoes)
+        else:
+            # Os tokens vêm do arquivo em fluxo, sem ler tudo para a memória
+            resultado = {"valid": True, "message": "Código válido"}
+            saida = io.StringIO() if args.silencioso else sys.stdout
+            try:
+                if args.paralelo:
+                    from paralelo import tokenizar_paralelo
+                    tokens = tokenizar_paralelo(_ler_texto(args.arquivo), args.paralelo,
+                                                dialeto=dialeto.nome)
+                    p = ParserIterativo(tokens, trace="text" if args.logs else "off", saida=saida)
+                    p.parse_program()
+                else:
+                    with abrir_fonte(args.arquivo) as fonte:
+                        p = ParserIterativo(lexer_stream(fonte, dialeto=dialeto.nome),
+                                            trace="text" if args.logs else "off", saida=saida)
+                        p.parse_program()
+            except SyntaxError as e:
+                resultado = {"valid": False, "message": str(e)}
+    except OSError as e:
+        print(f"Erro ao ler '{args.arquivo}': {e.strerror or e}", file=sys.stderr)
+        return 2
+
+    if args.silencioso:
+        pass
+    elif args.json:
+        if dados_perfil is not None:
+            resultado["profile"] = dados_perfil
+        json.dump(resultado, sys.stdout, ensure_ascii=False)
+        print()
+    elif args.todos:
+        for erro in resultado["errors"]:
+            print(f"linha {erro['line']}, coluna {erro['column']}: {erro['message']}")
+        print(resultado["message"])
+    elif args.executar:
+        saida = resultado["output"] or ""
+        sys.stdout.write(saida)
+        if saida and not saida.endswith("\n"):
+            print()
+        if not resultado["valid"]:
+            print("\n[FALHA NA ANÁLISE] O código é INVÁLIDO.")
+            print(resultado["message"])
+        elif not resultado["completed"]:
+            print("\n[FALHA NA EXECUÇÃO] O programa parou antes do fim.")
+            print(resultado["message"])
+    elif resultado["valid"]:
+        if resultado.get("logs"):
+            # Com --perfil o texto foi lido inteiro: os logs vêm no resultado
+            print("\n".join(resultado["logs"]))
+        print("RESULTADO: O CÓDIGO FONTE É VÁLIDO.")
+    else:
+        # Com --perfil os logs vêm no resultado, já terminando com a falha
+        logs = resultado.get("logs", [])[:-4 - resultado["message"].count("\n")]
+        if logs:
+            print("\n".join(logs))
+        print("\n[FALHA NA ANÁLISE] O código é INVÁLIDO.")
+        print(resultado["message"])
+    if dados_perfil is not None and not args.silencioso and not args.json:
+        from perfil import relatorio
+        print()
+        print(relatorio(dados_perfil))
+    if not resultado["valid"]:
+        return 1
+    return 0 if resultado.get("completed", True) else 3
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,168 @@
+import contextlib
+import os
+import re
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import resource_tracker, shared_memory
+
+import linguagem
+from nucleo import caractere_invalido, erro_lexico, nomes_tipos, tokenizar
+from token_stream import TokenStream
+
+# ==============================================================================
+# LEXER PARALELO PARA FONTES GRANDES
+# ==============================================================================
+#
+# tokenizar_paralelo(code) devolve o mesmo TokenStream de tokenizar(code),
+# mas divide a fonte em partes e roda o lexer de cada uma em um processo:
+#
+#   1. Pré-varredura: a fonte só pode ser cortada logo depois de uma quebra de
+#      linha que não esteja dentro de um comentário ou de uma string (os
+#      delimitadores de cada dialeto, ver linguagem.py). Nesses pontos nenhum
+#      token atravessa o corte. A varredura só procura delimitadores e quebras
+#      de linha com str.find/re.search, sem rodar o autômato.
+#   2. A fonte vai em UTF-8 para um bloco de memória compartilhada; cada
+#      processo decodifica só a sua parte e roda tokenizar() nela, já
+#      somando aos deslocamentos o início da parte.
+#   3. As linhas são corrigidas na ordem: a parte i começa depois das quebras
+#      de linha de todas as anteriores (cada processo conta as da sua parte
+#      no índice de linhas que o tokenizar() já montou). Um erro léxico é o
+#      da primeira parte que falhou, com a linha corrigida, como na análise
+#      sequencial; a coluna não muda, porque toda parte começa uma linha.
+
+MIN_PARTE = 1 << 18   # partes menores que isso não compensam um processo
+
+
+def fronteiras(code, partes, delimitadores):
+    """Até partes - 1 posições de corte seguras, perto de len(code) * i / partes."""
+    if partes < 2 or not code:
+        return []
+    abre = re.compile("|".join(re.escape(a) for _, a, _ in delimitadores))
+    fecha = {a: f for _, a, f in delimitadores}
+    cortes = []
+    pos = 0   # posição fora de qualquer comentário ou string
+    for i in range(1, partes):
+        alvo = len(code) * i // partes
+        if alvo <= pos:
+            continue
+        while True:
+            m = abre.search(code, pos)
+            livre_ate = m.start() if m else len(code)
+            # [pos, livre_ate) não tem delimitadores: qualquer quebra de linha
+            # ali a partir do alvo serve
+            if livre_ate > alvo:
+                nl = code.find('\n', max(pos, alvo), livre_ate)
+                if nl >= 0:
+                    pos = nl + 1
+                    if pos < len(code):
+                        cortes.append(pos)
+                    break
+            if m is None:
+                return cortes
+            fim = code.find(fecha[m.group()], m.end())
+            if fim < 0:
+                # Delimitador sem fechamento: não há corte seguro depois dele
+                return cortes
+            pos = fim + len(fecha[m.group()])
+    return cortes
+
+
+def _anexar(nome):
+    # Quem apaga o bloco é o processo que o criou. Até o Python 3.12 anexar
+    # também registra o bloco no resource_tracker; um processo do pool que não
+    # herdou o rastreador do criador (pool criado antes dele, com fork) teria
+    # um rastreador próprio, que apagaria o bloco quando o processo saísse
+    try:
+        return shared_memory.SharedMemory(name=nome, track=False)
+    except TypeError:
+        pass
+    herdado = resource_tracker._resource_tracker._fd is not None
+    memoria = shared_memory.SharedMemory(name=nome)
+    if not herdado:
+        resource_tracker.unregister(memoria._name, "shared_memory")
+    return memoria
+
+
+def _lexar_parte(nome, inicio, fim, deslocamento, recuperar, dialeto):
+    # Roda em um processo do pool: tokens de uma parte da fonte, com os
+    # deslocamentos já na fonte inteira e as linhas a partir de 1, e o número
+    # de quebras de linha da parte
+    memoria = _anexar(nome)
+    try:
+        texto = bytes(memoria.buf[inicio:fim]).decode('utf-8')
+    finally:
+        memoria.close()
+    try:
+        tokens = tokenizar(texto, recuperar, dialeto)
+    except SyntaxError as e:
+        return None, (getattr(e, 'valor', None), getattr(e, 'linha', None),
+                      getattr(e, 'coluna', None), str(e))
+    n = len(tokens) - 1  # sem o EOF
+    starts = tokens.starts[:n]
+    ends = tokens.ends[:n]
+    if deslocamento:
+        starts = array('I', map(deslocamento.__add__, starts))
+        ends = array('I', map(deslocamento.__add__, ends))
+    return (tokens.kinds[:n], starts, ends, tokens.lines[:n], len(tokens.indice) - 1), None
+
+
+def tokenizar_paralelo(code, workers=None, executor=None, recuperar=False, dialeto=None,
+                       min_parte=MIN_PARTE):
+    """Como tokenizar(code, recuperar, dialeto), com o lexer em vários processos."""
+    d = linguagem.obter(dialeto)
+    d.regex()  # compilado antes do fork: os processos herdam
+    workers = workers or os.cpu_count() or 1
+    cortes = fronteiras(code, min(workers, len(code) // max(min_parte, 1)), d.delimitadores)
+    if not cortes:
+        return tokenizar(code, recuperar, d.nome)
+    limites = list(zip([0, *cortes], [*cortes, len(code)]))
+
+    # Fonte em UTF-8 na memória compartilhada, parte por parte (só uma cópia
+    # codificada de uma parte existe fora dela por vez)
+    if code.isascii():
+        tamanhos = [b - a for a, b in limites]
+    else:
+        tamanhos = [len(code[a:b].encode('utf-8')) for a, b in limites]
+    memoria = shared_memory.SharedMemory(create=True, size=max(sum(tamanhos), 1))
+    try:
+        tarefas = []
+        posicao = 0
+        for (a, b), tamanho in zip(limites, tamanhos):
+            memoria.buf[posicao:posicao + tamanho] = code[a:b].encode('utf-8')
+            tarefas.append((posicao, posicao + tamanho, a))
+            posicao += tamanho
+        with (contextlib.nullcontext(executor) if executor is not None
+              else ProcessPoolExecutor(min(workers, len(tarefas)))) as pool:
+            futuros = [pool.submit(_lexar_parte, memoria.name, inicio, fim, deslocamento,
+                                   recuperar, d.nome)
+                       for inicio, fim, deslocamento in tarefas]
+            resultados = [f.result() for f in futuros]
+    finally:
+        memoria.close()
+        memoria.unlink()
+
+    tokens = TokenStream(code, nomes_tipos(d.nome))
+    mismatch = tokens.kind_codes["MISMATCH"]
+    linha_base = 0   # quebras de linha nas partes anteriores
+    for parte, erro in resultados:
+        if erro is not None:
+            valor, linha, coluna, mensagem = erro
+            if linha is None:
+                raise SyntaxError(mensagem)
+            if valor is None:
+                raise caractere_invalido(linha + linha_base, coluna)
+            raise erro_lexico(valor, linha + linha_base, coluna)
+        kinds, starts, ends, lines, quebras = parte
+        if linha_base:
+            lines = array('I', map(linha_base.__add__, lines))
+        if (recuperar and len(tokens) and len(kinds) and kinds[0] == mismatch
+                and tokens.kinds[-1] == mismatch and tokens.ends[-1] == starts[0]):
+            # Caracteres inválidos dos dois lados do corte viram um token só,
+            # como no lexer sequencial
+            tokens.ends[-1] = ends[0]
+            kinds, starts, ends, lines = kinds[1:], starts[1:], ends[1:], lines[1:]
+        tokens.extend(kinds, starts, ends, lines)
+        linha_base += quebras
+    n = len(code)
+    tokens.append(tokens.kind_codes["EOF"], n, n, linha_base + 1)
+    return tokens
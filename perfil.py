@@ -0,0 +1,181 @@
+import threading
+import time
+
+# ==============================================================================
+# PERFIL POR REGRA DA GRAMÁTICA E POR TIPO DE TOKEN
+# ==============================================================================
+#
+# perfilar(funcao, *args) roda uma análise do nucleo.py com um Perfil ativo
+# na thread atual. Enquanto ele está ativo, tokenizar() e lexer_regex()
+# cronometram cada casamento do lexer (tempo e contagem por tipo de token) e
+# todo Parser criado encadeia os próprios ganchos (_enter_rule, _exit_rule,
+# _shift_log) aos do perfil, que soma por regra: chamadas, tempo total e
+# próprio (sem as sub-regras) e tokens consumidos.
+#
+# Sem perfil ativo nada muda no caminho quente: o lexer e o Parser só
+# consultam perfil_ativo() uma vez, ao começar, e seguem com as funções de
+# sempre.
+#
+# O tempo total de uma regra recursiva (expressão dentro de fator dentro de
+# expressão) é contado só na ativação mais externa, como no cProfile; o tempo
+# próprio é contado em todas.
+
+_local = threading.local()
+
+
+def perfil_ativo():
+    return getattr(_local, "perfil", None)
+
+
+def perfilar(funcao, *args):
+    """Roda funcao(*args) com um Perfil ativo; devolve (resultado, perfil.dados())."""
+    perfil = Perfil()
+    anterior = perfil_ativo()
+    _local.perfil = perfil
+    try:
+        resultado = funcao(*args)
+    finally:
+        _local.perfil = anterior
+    perfil.execucoes = 1
+    return resultado, perfil.dados()
+
+
+class Perfil:
+    def __init__(self):
+        # regra -> [chamadas, total_ns, próprio_ns, tokens, tokens_próprios]
+        self.regras = {}
+        # tipo de token -> [casamentos, ns]
+        self.lexer = {}
+        self.parser_ns = 0
+        self.execucoes = 0
+
+    # --- Lexer ---
+    def cronometrar_automato(self, match, nomes):
+        # Envolve Automato.match (ou a função no mesmo formato que tokenizar()
+        # monta sobre o regex): o tipo casado é o primeiro item do resultado
+        agora = time.perf_counter_ns
+        lexer = self.lexer
+
+        def medido(code, pos, n):
+            inicio = agora()
+            r = match(code, pos, n)
+            dt = agora() - inicio
+            if r[0] >= 0:
+                e = lexer.get(nomes[r[0]])
+                if e is None:
+                    e = lexer[nomes[r[0]]] = [0, 0]
+                e[0] += 1
+                e[1] += dt
+            return r
+        return medido
+
+    def cronometrar_regex(self, match):
+        # Envolve Pattern.match: o tipo casado é o grupo nomeado
+        agora = time.perf_counter_ns
+        lexer = self.lexer
+
+        def medido(code, pos):
+            inicio = agora()
+            r = match(code, pos)
+            dt = agora() - inicio
+            if r is not None:
+                e = lexer.get(r.lastgroup)
+                if e is None:
+                    e = lexer[r.lastgroup] = [0, 0]
+                e[0] += 1
+                e[1] += dt
+            return r
+        return medido
+
+    # --- Parser ---
+    def instrumentar(self, parser, sem_log):
+        agora = time.perf_counter_ns
+        regras = self.regras
+        pilha = []    # [início_ns, sub-regras_ns, tokens próprios, posição inicial]
+        ativas = {}   # regra -> ativações em aberto (recursão)
+        entrar_antes = parser._enter_rule
+        sair_antes = parser._exit_rule
+        consumir_antes = parser._shift_log
+        perfil = self
+
+        def entrar(nome):
+            if entrar_antes is not sem_log:
+                entrar_antes(nome)
+            ativas[nome] = ativas.get(nome, 0) + 1
+            pilha.append([agora(), 0, 0, parser.pos])
+
+        def sair(nome):
+            fim = agora()
+            if pilha:
+                inicio, filhos, proprios, pos = pilha.pop()
+                total = fim - inicio
+                r = regras.get(nome)
+                if r is None:
+                    r = regras[nome] = [0, 0, 0, 0, 0]
+                r[0] += 1
+                r[2] += total - filhos
+                r[4] += proprios
+                ativas[nome] -= 1
+                if not ativas[nome]:
+                    r[1] += total
+                    r[3] += parser.pos - pos
+                if pilha:
+                    pilha[-1][1] += total
+                else:
+                    perfil.parser_ns += total
+            if sair_antes is not sem_log:
+                sair_antes(nome)
+
+        def consumir(token_type):
+            if pilha:
+                pilha[-1][2] += 1
+            if consumir_antes is not sem_log:
+                consumir_antes(token_type)
+
+        parser._enter_rule = entrar
+        parser._exit_rule = sair
+        parser._shift_log = consumir
+
+    # --- Resultado ---
+    def dados(self):
+        regras = [{"rule": nome, "calls": r[0], "total_ns": r[1], "self_ns": r[2],
+                   "tokens": r[3], "self_tokens": r[4]}
+                  for nome, r in self.regras.items()]
+        regras.sort(key=lambda r: r["self_ns"], reverse=True)
+        lexer = [{"kind": nome, "tokens": e[0], "ns": e[1]} for nome, e in self.lexer.items()]
+        lexer.sort(key=lambda e: e["ns"], reverse=True)
+        return {"runs": self.execucoes, "parser_ns": self.parser_ns,
+                "lexer_ns": sum(e[1] for e in self.lexer.values()),
+                "rules": regras, "lexer": lexer}
+
+    def somar(self, dados):
+        # Acumula os dados() de outro perfil (ex.: de cada requisição)
+        self.execucoes += dados["runs"]
+        self.parser_ns += dados["parser_ns"]
+        for r in dados["rules"]:
+            atual = self.regras.setdefault(r["rule"], [0, 0, 0, 0, 0])
+            for i, campo in enumerate(("calls", "total_ns", "self_ns", "tokens", "self_tokens")):
+                atual[i] += r[campo]
+        for e in dados["lexer"]:
+            atual = self.lexer.setdefault(e["kind"], [0, 0])
+            atual[0] += e["tokens"]
+            atual[1] += e["ns"]
+
+
+def relatorio(dados):
+    """Texto do perfil, com as regras e os tipos de token em ordem de tempo."""
+    ms = 1e-6
+    linhas = [f"Perfil ({dados['runs']} execução(ões)): parser {dados['parser_ns'] * ms:.2f} ms, "
+              f"lexer {dados['lexer_ns'] * ms:.2f} ms", "",
+              f"{'regra':<18}{'chamadas':>10}{'total ms':>11}{'próprio ms':>12}"
+              f"{'% próprio':>11}{'tokens':>10}{'próprios':>10}"]
+    parser_ns = dados["parser_ns"] or 1
+    for r in dados["rules"]:
+        linhas.append(f"{r['rule']:<18}{r['calls']:>10}{r['total_ns'] * ms:>11.2f}"
+                      f"{r['self_ns'] * ms:>12.2f}{100 * r['self_ns'] / parser_ns:>10.1f}%"
+                      f"{r['tokens']:>10}{r['self_tokens']:>10}")
+    linhas += ["", f"{'tipo de token':<18}{'tokens':>10}{'ms':>11}{'ns/token':>12}"]
+    for e in dados["lexer"]:
+        linhas.append(f"{e['kind']:<18}{e['tokens']:>10}{e['ns'] * ms:>11.2f}"
+                      f"{e['ns'] / max(e['tokens'], 1):>12.0f}")
+    return "\n".join(linhas)
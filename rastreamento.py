@@ -0,0 +1,67 @@
+from array import array
+
+# ==============================================================================
+# RASTRO ESTRUTURADO DO ANALISADOR SINTÁTICO
+# ==============================================================================
+#
+# Em vez de formatar e imprimir uma linha de log por evento, o Parser (modo
+# trace="struct") grava registros compactos (evento, regra, índice do token,
+# nível) em um array pré-alocado. O texto só é montado se alguém pedir, com
+# render(), que reproduz exatamente os logs do modo texto.
+
+ENTER, EXIT, SHIFT = 0, 1, 2
+EVENTOS = ("ENTER", "EXIT", "SHIFT")
+CAMPOS = 4
+
+
+class Rastro:
+    def __init__(self, capacidade=4096):
+        self.buf = array('I', bytes(array('I').itemsize * CAMPOS * max(capacidade, 1)))
+        self.n = 0
+        self.regras = []
+        self._codigos = {}
+
+    def codigo_regra(self, nome):
+        codigo = self._codigos.get(nome)
+        if codigo is None:
+            codigo = self._codigos[nome] = len(self.regras)
+            self.regras.append(nome)
+        return codigo
+
+    def registrar(self, evento, regra, token, nivel):
+        buf = self.buf
+        i = self.n * CAMPOS
+        if i >= len(buf):
+            # Capacidade esgotada: dobra o buffer
+            buf.frombytes(bytes(buf.itemsize * len(buf)))
+        buf[i] = evento
+        buf[i + 1] = regra
+        buf[i + 2] = token
+        buf[i + 3] = nivel
+        self.n += 1
+
+    def __len__(self):
+        return self.n
+
+    def registros(self):
+        buf = self.buf
+        for i in range(0, self.n * CAMPOS, CAMPOS):
+            yield buf[i], buf[i + 1], buf[i + 2], buf[i + 3]
+
+    def compacto(self):
+        # Lista plana [evento, regra, token, nível, ...] para enviar como JSON
+        return self.buf[:self.n * CAMPOS].tolist()
+
+    def render(self, tokens):
+        linhas = []
+        regras = self.regras
+        for evento, regra, token, nivel in self.registros():
+            indent = "|   " * nivel
+            if evento == ENTER:
+                linhas.append(f"{indent}┌── ENTER <{regras[regra]}>")
+            elif evento == EXIT:
+                linhas.append(f"{indent}└── REDUCE <{regras[regra]}> (Regra validada)")
+            else:
+                tipo, valor = tokens[token][0], tokens[token][1]
+                linhas.append(f"{indent}>> SHIFT: Consumiu '{valor}' ({tipo})")
+        return linhas
@@ -60,6 +60,18 @@ const tokenColors = {
 // Variáveis globais
 let currentFile = null;
 
+// Análise incremental: o servidor guarda os tokens do documento e cada edição
+// envia só o trecho alterado para /analyze_incremental
+const incremental = {
+    docId: `doc-${Date.now()}-${Math.random().toString(36).slice(2)}`,
+    version: null,      // null = documento ainda não aberto no servidor
+    text: '',
+    tokens: [],
+    error: null,
+    pending: 0,
+    queue: Promise.resolve()
+};
+
 // Inicialização quando o DOM estiver carregado
 document.addEventListener('DOMContentLoaded', function() {
     initializeApp();
@@ -81,6 +93,7 @@ function setupEventListeners() {
     
     if (codeInput) {
         codeInput.addEventListener('input', updateCounters);
+        codeInput.addEventListener('input', syncIncremental);
         codeInput.addEventListener('keydown', handleTabKey);
     }
     
@@ -321,6 +334,73 @@ function handleKeyboardShortcuts(e) {
     }
 }
 
+// Calcula a edição (offset, apagados, inseridos) entre dois textos pelo
+// maior prefixo e sufixo em comum
+function diffEdit(oldText, newText) {
+    const max = Math.min(oldText.length, newText.length);
+    let prefix = 0;
+    while (prefix < max && oldText[prefix] === newText[prefix]) prefix++;
+    let suffix = 0;
+    while (suffix < max - prefix &&
+           oldText[oldText.length - 1 - suffix] === newText[newText.length - 1 - suffix]) suffix++;
+    return {
+        offset: prefix,
+        deleted: oldText.length - prefix - suffix,
+        inserted: newText.slice(prefix, newText.length - suffix)
+    };
+}
+
+async function postIncremental(body) {
+    const response = await fetch('/analyze_incremental', {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify(body)
+    });
+    if (response.status === 409) return null;
+    const data = await response.json();
+    if (!response.ok) throw new Error(data.error || 'Erro na análise incremental');
+    return data;
+}
+
+// Envia ao servidor a edição feita desde a última sincronização. As edições
+// são enviadas em ordem, uma por vez; várias teclas digitadas enquanto uma
+// requisição está em andamento viram uma única edição.
+function syncIncremental() {
+    incremental.pending++;
+    incremental.queue = incremental.queue.then(async () => {
+        const newText = codeInput.value;
+        const docId = incremental.docId;
+        try {
+            let data = null;
+            // Offsets do servidor contam caracteres Unicode, os do JS contam
+            // unidades UTF-16: com pares substitutos, reenvia o texto inteiro
+            const full = incremental.version === null || /[\uD800-\uDFFF]/.test(newText);
+            if (!full) {
+                const edit = diffEdit(incremental.text, newText);
+                if (!edit.deleted && !edit.inserted) return;
+                data = await postIncremental({ doc_id: docId, version: incremental.version, edit });
+            }
+            if (data === null) {
+                data = await postIncremental({ doc_id: docId, code: newText });
+                incremental.tokens = data.tokens;
+            } else if (data.tokens.length < 10000) {
+                incremental.tokens.splice(data.start, data.deleted, ...data.tokens);
+            } else {
+                incremental.tokens = incremental.tokens.slice(0, data.start)
+                    .concat(data.tokens, incremental.tokens.slice(data.start + data.deleted));
+            }
+            incremental.text = newText;
+            incremental.version = data.version;
+            incremental.error = data.error;
+        } catch (error) {
+            console.error('Erro na análise incremental:', error);
+            incremental.version = null;
+        } finally {
+            incremental.pending--;
+        }
+    });
+}
+
 // Analisar código
 async function analyzeCode() {
     const code = codeInput.value.trim();
@@ -329,6 +409,15 @@ async function analyzeCode() {
         showError('Por favor, digite algum código para analisar.');
         return;
     }
+
+    // Tokens já mantidos em dia pela análise incremental: não precisa reenviar
+    if (incremental.version !== null && incremental.pending === 0 &&
+        incremental.text === codeInput.value && !incremental.error) {
+        currentTokens = incremental.tokens.slice();
+        analysisResults = { tokens: currentTokens };
+        displayResults(currentTokens);
+        return;
+    }
     
     showLoading(true);
     analyzeBtn.disabled = true;
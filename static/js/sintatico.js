@@ -89,15 +89,44 @@ document.addEventListener('DOMContentLoaded', function () {
         resultsContainer.appendChild(pre);
     }
 
+    // Monta as linhas de log a partir do rastro compacto devolvido por /parse
+    // (registros planos: evento, regra, índice do token, nível)
+    function renderTrace(data) {
+        const logs = [];
+        const trace = data.trace;
+        if (trace) {
+            const r = trace.records;
+            for (let i = 0; i < r.length; i += 4) {
+                const indent = '|   '.repeat(r[i + 3]);
+                if (r[i] === 0) {
+                    logs.push(`${indent}┌── ENTER <${trace.rules[r[i + 1]]}>`);
+                } else if (r[i] === 1) {
+                    logs.push(`${indent}└── REDUCE <${trace.rules[r[i + 1]]}> (Regra validada)`);
+                } else {
+                    const token = trace.tokens[r[i + 2]];
+                    logs.push(`${indent}>> SHIFT: Consumiu '${token[1]}' (${token[0]})`);
+                }
+            }
+        }
+        if (!data.valid) {
+            logs.push('-'.repeat(40));
+            logs.push('FALHA ENCONTRADA:');
+            logs.push(...(data.message || '').split('\n'));
+            logs.push('-'.repeat(40));
+        }
+        return logs;
+    }
+
     async function parseCode(code) {
         showLoading(true); parseBtn.disabled = true;
         try {
             const response = await fetch('/parse', {
-                method: 'POST', headers: { 'Content-Type': 'application/json' }, body: JSON.stringify({ code })
+                method: 'POST', headers: { 'Content-Type': 'application/json' }, body: JSON.stringify({ code, trace: 'compact' })
             });
             const data = await response.json();
             if (!response.ok) throw new Error(data.error || 'Erro na análise sintática');
-            renderLogs(data.logs || []);
+            data.logs = renderTrace(data);
+            renderLogs(data.logs);
             statusSintatico.textContent = data.valid ? 'Código válido' : 'Código inválido';
             downloadBtn.style.display = 'inline-flex';
             downloadBtn.onclick = () => downloadResults(data);
@@ -0,0 +1,68 @@
+import glob
+import os
+import random
+import sys
+import tempfile
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+# Autômatos compilados em um diretório do próprio teste, não no cache do usuário
+os.environ.setdefault("ANALISADOR_COMPILADOS", tempfile.mkdtemp(prefix="analisador-testes-"))
+
+import pytest
+
+from gerador import GeradorProgramas, comentario_gigante
+
+# Trechos que quebram a estrutura (ou o léxico) de um programa gerado
+_ESTRAGOS = ["begin", "end", ";", "(", ")", "if", "then", ":=", "@", "$", "'texto'",
+             "'sem fim", "/*", "*/", "{ chave }", "//", "\n", "é", "var", "."]
+
+
+def exemplos(com_erro):
+    # Programas de exemplo em testes/ (os de erro têm "Erro" no nome)
+    programas = []
+    for caminho in sorted(glob.glob(os.path.join(RAIZ, "testes", "*.txt"))):
+        if ("Erro" in os.path.basename(caminho)) == com_erro:
+            with open(caminho, encoding="utf-8") as f:
+                programas.append(f.read())
+    return programas
+
+
+def programas_validos():
+    programas = [GeradorProgramas(seed, profundidade=1 + seed % 5).programa(1 + seed % 12)
+                 for seed in range(40)]
+    programas.append(comentario_gigante(5000))
+    return programas + exemplos(com_erro=False)
+
+
+def programas_estragados(quantidade=120, seed=7):
+    # Programas gerados com alguns trechos inseridos ou apagados: exercitam os
+    # caminhos de erro léxico e sintático
+    rnd = random.Random(seed)
+    programas = exemplos(com_erro=True)
+    for i in range(quantidade):
+        partes = GeradorProgramas(i, profundidade=rnd.randint(1, 4)).programa(rnd.randint(1, 10)).split(" ")
+        for _ in range(rnd.randint(1, 4)):
+            j = rnd.randrange(len(partes))
+            if rnd.random() < 0.4:
+                del partes[j]
+            else:
+                partes.insert(j, rnd.choice(_ESTRAGOS))
+        programas.append(" ".join(partes))
+    return programas
+
+
+@pytest.fixture(scope="session")
+def validos():
+    return programas_validos()
+
+
+@pytest.fixture(scope="session")
+def estragados():
+    return programas_estragados()
+
+
+@pytest.fixture(scope="session")
+def todos(validos, estragados):
+    return validos + estragados
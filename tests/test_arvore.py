@@ -0,0 +1,50 @@
+import pytest
+
+import arvore
+from nucleo import Parser, ParserIterativo, ParserRecuperacao, tokenizar
+
+
+def analisar(classe, code):
+    p = classe(tokenizar(code), trace="ast")
+    try:
+        p.parse_program()
+        return True, p
+    except SyntaxError:
+        return False, p
+
+
+def test_arvore_igual_nos_dois_motores(validos):
+    for code in validos:
+        valido_r, recursivo = analisar(Parser, code)
+        valido_i, iterativo = analisar(ParserIterativo, code)
+        assert valido_r and valido_i
+        assert iterativo.arvore.para_bytes() == recursivo.arvore.para_bytes()
+
+
+def test_arvore_descartada_no_erro_de_sintaxe(estragados):
+    for code in estragados:
+        try:
+            tokens = tokenizar(code)
+        except SyntaxError:
+            continue
+        p = ParserIterativo(tokens, trace="ast")
+        try:
+            p.parse_program()
+        except SyntaxError:
+            assert p.arvore.raiz < 0
+
+
+def test_erro_em_redutor_nao_e_engolido(monkeypatch):
+    def quebrado(self, itens):
+        raise KeyError("redutor quebrado")
+
+    monkeypatch.setattr(arvore.ConstrutorArvore, "_atribuicao", quebrado)
+    code = "program p; var x: integer; begin x := 1; end."
+    for classe in (Parser, ParserIterativo):
+        with pytest.raises(KeyError):
+            classe(tokenizar(code), trace="ast").parse_program()
+
+
+def test_recuperacao_nao_monta_arvore():
+    with pytest.raises(ValueError):
+        ParserRecuperacao(tokenizar("program p; begin end."), trace="ast")
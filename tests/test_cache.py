@@ -0,0 +1,87 @@
+import pytest
+
+from cache import CacheResultados, versao_do_codigo
+
+
+def test_miss_depois_hit():
+    cache = CacheResultados()
+    chave = cache.chave("/parse", "program p;", "text")
+    assert cache.get(chave) is None
+    cache.put(chave, b"{}")
+    assert cache.get(chave) == b"{}"
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 1, 1)
+
+
+def test_chave_separa_endpoint_opcoes_e_fonte():
+    cache = CacheResultados()
+    base = cache.chave("/parse", "program p;", "text")
+    assert base == cache.chave("/parse", "program p;", "text")
+    assert base != cache.chave("/analyze", "program p;", "text")
+    assert base != cache.chave("/parse", "program p;", "off")
+    assert base != cache.chave("/parse", "program q;", "text")
+
+
+def test_chave_sem_colisao_entre_partes():
+    # Opções com \0 (a entrada do /run pode ter qualquer caractere)
+    cache = CacheResultados()
+    assert cache.chave("/run", "x", "a\0b", "c") != cache.chave("/run", "x", "a", "b\0c")
+    assert cache.chave("/run", "\0x", "a") != cache.chave("/run", "x", "a\0")
+    assert cache.chave("/run", "x", None) != cache.chave("/run", "x", "None")
+
+
+def test_chave_muda_com_a_versao():
+    assert (CacheResultados(versao="1").chave("/parse", "x")
+            != CacheResultados(versao="2").chave("/parse", "x"))
+    assert versao_do_codigo("nucleo") != versao_do_codigo("nucleo", "arvore")
+
+
+def test_remocao_lru_por_entradas():
+    cache = CacheResultados(max_entradas=2)
+    for chave in ("a", "b"):
+        cache.put(chave, b"1")
+    cache.get("a")
+    cache.put("c", b"1")
+    assert cache.get("b") is None
+    assert cache.get("a") == b"1" and cache.get("c") == b"1"
+    assert cache.stats()["evictions"] == 1
+
+
+def test_remocao_por_bytes_e_entrada_grande_demais():
+    cache = CacheResultados(max_bytes=10)
+    cache.put("a", b"12345")
+    cache.put("b", b"12345")
+    cache.put("c", b"123")
+    assert cache.get("a") is None
+    assert cache.stats()["bytes"] <= 10
+    cache.put("d", b"x" * 11)
+    assert cache.get("d") is None
+
+
+def test_disco_sobrevive_a_um_novo_cache(tmp_path):
+    primeiro = CacheResultados(diretorio=str(tmp_path), versao="v1")
+    chave = primeiro.chave("/parse", "program p;")
+    primeiro.put(chave, b"resposta")
+    segundo = CacheResultados(diretorio=str(tmp_path), versao="v1")
+    assert segundo.get(chave) == b"resposta"
+    assert segundo.stats()["disk_hits"] == 1
+    # Outra versão do código não enxerga a entrada antiga
+    terceiro = CacheResultados(diretorio=str(tmp_path), versao="v2")
+    assert terceiro.get(terceiro.chave("/parse", "program p;")) is None
+
+
+def test_rota_parse_usa_o_cache():
+    flask = pytest.importorskip("flask")  # noqa: F841
+    import app
+
+    app.cache.clear()
+    cliente = app.app.test_client()
+    corpo = {"code": "program p; var x: integer; begin x := 1; end.", "trace": "off"}
+    antes = app.cache.stats()
+    primeira = cliente.post("/parse", json=corpo)
+    segunda = cliente.post("/parse", json=corpo)
+    depois = app.cache.stats()
+    assert primeira.status_code == segunda.status_code == 200
+    assert primeira.get_data() == segunda.get_data()
+    assert depois["misses"] == antes["misses"] + 1
+    assert depois["hits"] == antes["hits"] + 1
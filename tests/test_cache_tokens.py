@@ -0,0 +1,85 @@
+import io
+import os
+
+import pytest
+
+import analisador
+import cache_tokens
+from leitor import abrir_fonte
+
+
+def tokens_do_arquivo(caminho, **opcoes):
+    with abrir_fonte(caminho, **opcoes) as fonte:
+        return list(analisador.tokens_do_arquivo(caminho, fonte))
+
+
+@pytest.fixture
+def fonte(tmp_path, validos):
+    caminho = tmp_path / "programa.txt"
+    caminho.write_text(validos[0] + "\n/* comentário com acentos: é ç */\n", encoding="utf-8")
+    return str(caminho)
+
+
+def test_cache_de_tokens_gravado_e_lido(fonte):
+    esperado = list(analisador.lexer(open(fonte, encoding="utf-8").read()))
+    assert tokens_do_arquivo(fonte) == esperado
+    assert os.path.exists(fonte + cache_tokens.EXTENSAO)
+    # Segunda leitura: os tokens vêm do cache, não do lexer
+    with abrir_fonte(fonte) as dados:
+        carregado = cache_tokens.carregar(fonte + cache_tokens.EXTENSAO, dados,
+                                          cache_tokens.hash_fonte(dados),
+                                          analisador.versao_especificacao())
+        assert carregado is not None
+        with carregado:
+            assert list(carregado) == esperado
+    assert tokens_do_arquivo(fonte) == esperado
+
+
+def test_cache_de_tokens_invalidado_quando_a_fonte_muda(fonte):
+    tokens_do_arquivo(fonte)
+    with open(fonte, "a", encoding="utf-8") as f:
+        f.write("x := 2;\n")
+    with abrir_fonte(fonte) as dados:
+        assert cache_tokens.carregar(fonte + cache_tokens.EXTENSAO, dados,
+                                     cache_tokens.hash_fonte(dados),
+                                     analisador.versao_especificacao()) is None
+    esperado = list(analisador.lexer(open(fonte, encoding="utf-8").read()))
+    assert tokens_do_arquivo(fonte) == esperado
+
+
+def test_cache_de_tokens_gravado_em_fluxo_sem_mmap(fonte):
+    esperado = tokens_do_arquivo(fonte, usar_mmap=False)
+    with abrir_fonte(fonte) as dados:
+        carregado = cache_tokens.carregar(fonte + cache_tokens.EXTENSAO, dados,
+                                          cache_tokens.hash_fonte(dados),
+                                          analisador.versao_especificacao())
+        assert carregado is not None
+        with carregado:
+            assert list(carregado) == esperado
+
+
+def test_analise_interrompida_nao_deixa_cache(fonte, tmp_path):
+    with abrir_fonte(fonte) as dados:
+        tokens = analisador.tokens_do_arquivo(fonte, dados)
+        next(tokens)
+        tokens.close()
+    assert os.listdir(tmp_path) == ["programa.txt"]
+
+
+@pytest.mark.parametrize("dialeto, esperado", [
+    # Caracteres inválidos viram tokens em vez de interromper a análise
+    ("padrao", [("PROGRAM", "program"), ("ID", "p"), ("SEMI", ";"), ("BEGIN", "begın"),
+                ("ID", "x"), ("ASSIGN", ":="), ("FALSE", "falſe"), ("SEMI", ";"),
+                ("MISMATCH", "@"), ("MISMATCH", "é"), ("END", "end"), ("DOT", ".")]),
+    ("estendido", [("RESERVED_TOKEN", "program"), ("ID", "p"), ("SEMI", ";"),
+                   ("RESERVED_TOKEN", "begın"), ("ID", "x"), ("ASSIGN", ":="),
+                   ("ID", "falſe"), ("SEMI", ";"), ("END", "end"), ("END_PROGRAM", ".")]),
+])
+def test_stream_posicoes_usa_a_semantica_do_nucleo(dialeto, esperado):
+    # IDs não-ASCII cujo upper() é uma palavra reservada ("begın" -> BEGIN,
+    # "falſe" -> FALSE) são conferidos como no nucleo; deslocamentos em bytes
+    dados = "program p; begın x := falſe; @ é end.".encode("utf-8")
+    tokens = list(analisador.lexer_stream_posicoes(io.BytesIO(dados), 5, dialeto))
+    assert [(tipo, valor) for tipo, valor, _, _ in tokens] == esperado
+    for _, valor, inicio, fim in tokens:
+        assert dados[inicio:fim].decode("utf-8") == valor
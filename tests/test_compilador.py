@@ -0,0 +1,163 @@
+import pytest
+
+from compilador import (MAX_INTEIRO, MIN_INTEIRO, ErroExecucao, ErroSemantico, LimiteExcedido,
+                        compilar, executar)
+from nucleo import ParserIterativo, analisar_execucao, tokenizar
+
+
+def compilado(code):
+    p = ParserIterativo(tokenizar(code), trace="ast")
+    p.parse_program()
+    return compilar(p.arvore)
+
+
+def programa(corpo, variaveis="x, y: integer"):
+    return f"program p; var {variaveis}; begin {corpo} end."
+
+
+def rodar(corpo, entrada="", **opcoes):
+    return executar(compilado(programa(corpo)), entrada, **opcoes)
+
+
+# --- Aritmética ---
+
+
+@pytest.mark.parametrize("x, y, quociente", [
+    (7, 2, 3), (-7, 2, -3), (7, -2, -3), (-7, -2, 3), (6, -3, -2), (0, 5, 0),
+    (MIN_INTEIRO, 2, MIN_INTEIRO // 2),
+])
+def test_divisao_trunca_em_direcao_a_zero(x, y, quociente):
+    # Os operandos vêm da entrada, para a divisão acontecer na execução
+    resultado = rodar("read(x, y); x := x / y;", f"{x} {y}")
+    assert resultado["variables"]["x"] == quociente
+    if x > MIN_INTEIRO:
+        # E com constantes, calculada pelo compilador
+        assert rodar(f"x := ({x}) / ({y});")["variables"]["x"] == quociente
+
+
+def test_divisao_por_zero():
+    with pytest.raises(ErroExecucao, match="divisão por zero"):
+        rodar("read(x); x := 1 / x;", "0")
+    with pytest.raises(ErroExecucao, match="divisão por zero"):
+        rodar("x := 1 / 0;")
+
+
+@pytest.mark.parametrize("corpo, entrada", [
+    ("read(x); x := x + 1;", str(MAX_INTEIRO)),
+    ("read(x); x := x - 1;", str(MIN_INTEIRO)),
+    ("read(x); x := x * 2;", str(MAX_INTEIRO // 2 + 1)),
+    ("read(x); x := -x;", str(MIN_INTEIRO)),
+    ("read(x); x := x / -1;", str(MIN_INTEIRO)),
+    (f"x := {MAX_INTEIRO}; x := x + 1;", ""),
+    (f"x := {MAX_INTEIRO} + 1;", ""),
+])
+def test_estouro_de_inteiro(corpo, entrada):
+    with pytest.raises(ErroExecucao, match="estouro de inteiro"):
+        rodar(corpo, entrada)
+
+
+def test_limites_de_64_bits_sem_estouro():
+    resultado = rodar(f"x := {MAX_INTEIRO}; y := -x - 1;")
+    assert resultado["variables"] == {"x": MAX_INTEIRO, "y": MIN_INTEIRO}
+
+
+def test_constante_fora_da_faixa():
+    with pytest.raises(ErroSemantico):
+        compilado(programa(f"x := {MAX_INTEIRO + 1};"))
+
+
+# --- Limite de instruções ---
+
+
+def test_contagem_de_trecho_sem_desvios():
+    prog = compilado(programa("x := 1; y := 2; x := 3;"))
+    assert executar(prog)["instructions"] == len(prog)
+
+
+@pytest.mark.parametrize("limite", [1, 2, 3, 1000, 1001])
+def test_laco_infinito_para_sem_passar_do_limite(limite):
+    with pytest.raises(LimiteExcedido) as e:
+        rodar("x := 0; while true do x := x + 1;", max_instrucoes=limite)
+    assert e.value.instrucoes <= limite
+    assert e.value.instrucoes >= limite - 2
+
+
+LACOS = [
+    "x := 0; while x < 50 do x := x + 1;",
+    "x := 0; while x < 20 do begin y := 0; while y < x do y := y + 1; x := x + 1; end;",
+    "x := 0; y := 0; while x < 40 do begin if x / 3 * 3 = x then y := y + x else y := y - 1;"
+    " x := x + 1; end;",
+    "read(x); while x > 0 do begin write(x, ' '); x := x - 7; end;",
+]
+
+
+@pytest.mark.parametrize("corpo", LACOS)
+def test_limite_nunca_excedido(corpo):
+    prog = compilado(programa(corpo))
+    total = executar(prog, "100", max_instrucoes=1_000_000)["instructions"]
+    # Com o limite exato o programa ainda termina; com qualquer limite menor,
+    # para sem ter executado mais que o limite
+    assert executar(prog, "100", max_instrucoes=total)["instructions"] == total
+    anterior = 0
+    for limite in list(range(0, min(total, 60))) + list(range(60, total, 7)) + [total - 1]:
+        with pytest.raises(LimiteExcedido) as e:
+            executar(prog, "100", max_instrucoes=limite)
+        assert anterior <= e.value.instrucoes <= limite
+        # Nem para antes do necessário: o que sobrou não cabia no trecho seguinte
+        assert limite - e.value.instrucoes < max(prog.trechos)
+        anterior = e.value.instrucoes
+
+
+def test_contagem_inclui_a_instrucao_que_falhou():
+    prog = compilado(programa("x := 0; y := 1; y := y / x;"))
+    with pytest.raises(ErroExecucao) as e:
+        executar(prog)
+    # As duas atribuições e a divisão; o HALT não chega a rodar
+    assert e.value.instrucoes == len(prog) - 1
+
+
+def test_limite_de_saida():
+    with pytest.raises(LimiteExcedido, match="saída") as e:
+        rodar("while true do write('abc');", max_saida=100)
+    assert len(e.value.saida) <= 100
+
+
+# --- Verificações do compilador ---
+
+
+@pytest.mark.parametrize("corpo, mensagem", [
+    ("z := 1;", "não declarada"),
+    ("x := true;", "atribuição de boolean"),
+    ("if x then x := 1;", "boolean"),
+    ("x := x + true;", "exige operandos integer"),
+])
+def test_erros_semanticos(corpo, mensagem):
+    with pytest.raises(ErroSemantico, match=mensagem):
+        compilado(programa(corpo))
+
+
+def test_variavel_declarada_duas_vezes():
+    with pytest.raises(ErroSemantico, match="mais de uma vez"):
+        compilado(programa("x := 1;", variaveis="x: integer; x: boolean"))
+
+
+# --- Entrada e saída, pela interface do núcleo ---
+
+
+def test_leitura_e_escrita():
+    code = programa("read(x); readln; read(y, b); write(x / y, ' ', x); writeln; write(b);",
+                    variaveis="x, y: integer; b: boolean")
+    resultado = analisar_execucao(code, "-7 9\n2 true\n")
+    assert resultado["valid"] and resultado["completed"]
+    assert resultado["output"] == "-3 -7\nTRUE"
+    assert resultado["variables"] == {"x": -7, "y": 2, "b": True}
+
+
+def test_analisar_execucao_relata_erros():
+    invalido = analisar_execucao(programa("x := true;"))
+    assert invalido["valid"] is False and invalido["output"] is None
+    parado = analisar_execucao(programa("write('a'); read(x);"))
+    assert parado["valid"] and not parado["completed"]
+    assert parado["output"] == "a" and "fim da entrada" in parado["message"]
+    limitado = analisar_execucao(programa("while true do x := 1;"), max_instrucoes=500)
+    assert not limitado["completed"] and limitado["instructions"] <= 500
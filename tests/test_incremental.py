@@ -0,0 +1,112 @@
+import random
+
+import pytest
+
+from incremental import DocumentoIncremental, Documentos, TAMANHO_BLOCO
+from nucleo import analisar_lexico, get_automato, palavras_reservadas, tokenizar
+from gerador import GeradorProgramas
+
+TRECHOS = ["x", " ", "\n", ";", ":=", "begin", "end", "/*", "*/", "'", "'texto'", "123",
+           "@", "<", "=", ">", "(", ")", "program", "é", "/* comentário\nde duas linhas */"]
+
+
+def documento(text):
+    return DocumentoIncremental(get_automato(), palavras_reservadas, text)
+
+
+def editar_aleatorio(rnd, doc):
+    tamanho = len(doc.text)
+    offset = rnd.randint(0, tamanho)
+    deleted = rnd.randint(0, min(8, tamanho - offset)) if rnd.random() < 0.5 else 0
+    inserted = "".join(rnd.choice(TRECHOS) for _ in range(rnd.randint(0, 3)))
+    return offset, deleted, inserted
+
+
+@pytest.mark.parametrize("seed", range(6))
+def test_edicoes_iguais_a_reanalise_completa(seed):
+    rnd = random.Random(seed)
+    code = GeradorProgramas(seed).programa(40)
+    if seed % 2:
+        # Texto maior que um bloco, para as edições cruzarem blocos
+        code = code * (TAMANHO_BLOCO // len(code) + 2)
+    doc = documento(code)
+    for _ in range(150):
+        antes = doc.tokens()
+        versao = doc.version
+        offset, deleted, inserted = editar_aleatorio(rnd, doc)
+        start, removidos, novos = doc.aplicar_edicao(offset, deleted, inserted)
+        code = code[:offset] + inserted + code[offset + deleted:]
+        completo = documento(code)
+        assert doc.text == code
+        assert doc.version == versao + 1
+        assert doc.tokens() == completo.tokens()
+        assert doc.erro() == completo.erro()
+        # O trecho devolvido, aplicado aos tokens anteriores, dá os atuais
+        assert antes[:start] + novos + antes[start + removidos:] == doc.tokens()
+
+
+def test_tokens_e_erro_iguais_ao_lexer():
+    rnd = random.Random(1)
+    code = GeradorProgramas(3).programa(30)
+    doc = documento(code)
+    for _ in range(200):
+        offset, deleted, inserted = editar_aleatorio(rnd, doc)
+        doc.aplicar_edicao(offset, deleted, inserted)
+        code = doc.text
+        try:
+            tokenizar(code)
+        except SyntaxError as e:
+            assert doc.erro() == str(e)
+            continue
+        assert doc.erro() is None
+        assert doc.tokens() == analisar_lexico(code)["tokens"]
+
+
+def test_erro_em_texto_de_varios_blocos():
+    # A linha e a coluna saem das quebras contadas por bloco; inclui uma
+    # linha mais longa que um bloco, para a coluna vir de blocos anteriores
+    rnd = random.Random(7)
+    code = GeradorProgramas(5).programa(200) + "x" * (3 * TAMANHO_BLOCO) + "\nend."
+    assert len(code) > 4 * TAMANHO_BLOCO
+    doc = documento(code)
+    for _ in range(60):
+        offset = rnd.randint(0, len(doc.text))
+        doc.aplicar_edicao(offset, 0, rnd.choice(["@", "\n", "x@", "\n\n"]))
+        if rnd.random() < 0.3 and "@" in doc.text:
+            # Remove o primeiro erro, para o próximo aparecer em outro lugar
+            doc.aplicar_edicao(doc.text.index("@"), 1, "")
+        try:
+            tokenizar(doc.text)
+            esperado = None
+        except SyntaxError as e:
+            esperado = str(e)
+        assert doc.erro() == esperado
+
+
+def test_comentario_aberto_e_fechado_longe_da_edicao():
+    code = "program p;\n" + "x := 1;\n" * 500 + "end."
+    doc = documento(code)
+    doc.aplicar_edicao(len("program p;\n"), 0, "/*")
+    assert doc.tokens() == documento(doc.text).tokens()
+    doc.aplicar_edicao(len(doc.text) - len("end."), 0, "*/")
+    assert doc.tokens() == documento(doc.text).tokens()
+    doc.aplicar_edicao(len("program p;\n"), 2, "")
+    assert doc.tokens() == documento(doc.text).tokens()
+
+
+def test_edicao_fora_dos_limites():
+    doc = documento("program p;")
+    with pytest.raises(ValueError):
+        doc.aplicar_edicao(5, 10, "")
+    with pytest.raises(ValueError):
+        doc.aplicar_edicao(-1, 0, "x")
+
+
+def test_documentos_limitados_descartam_os_menos_usados():
+    docs = Documentos(get_automato, palavras_reservadas, max_documentos=2)
+    docs.abrir("a", "x")
+    docs.abrir("b", "y")
+    docs.get("a")
+    docs.abrir("c", "z")
+    assert docs.get("b") is None
+    assert docs.get("a") is not None and docs.get("c") is not None
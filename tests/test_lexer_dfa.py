@@ -0,0 +1,56 @@
+import random
+
+import pytest
+
+import linguagem
+from nucleo import get_automato, lexer_dfa, lexer_regex, tokenizar
+
+DIALETOS = sorted(linguagem.DIALETOS)
+
+
+def tokens_ou_erro(gerar):
+    # Lista de tokens, ou o erro léxico (mensagem, linha, coluna) se houver
+    try:
+        return list(gerar())
+    except SyntaxError as e:
+        return ("erro", str(e), getattr(e, "linha", None), getattr(e, "coluna", None))
+
+
+@pytest.mark.parametrize("dialeto", DIALETOS)
+def test_dfa_igual_ao_regex(todos, dialeto):
+    for code in todos:
+        esperado = tokens_ou_erro(lambda: lexer_regex(code, dialeto))
+        assert tokens_ou_erro(lambda: lexer_dfa(code, dialeto)) == esperado
+
+
+@pytest.mark.parametrize("dialeto", DIALETOS)
+def test_tokenizar_igual_nos_dois_motores(todos, dialeto):
+    def arrays(engine):
+        tokens = tokenizar(code, dialeto=dialeto, engine=engine)
+        return tokens.kinds, tokens.starts, tokens.ends, tokens.lines
+
+    for code in todos:
+        assert tokens_ou_erro(lambda: arrays("dfa")) == tokens_ou_erro(lambda: arrays("regex"))
+
+
+def test_motor_desconhecido():
+    with pytest.raises(ValueError):
+        tokenizar("x", engine="lr")
+
+
+def test_continuar_e_scan_iguais_a_match(todos):
+    automato = get_automato()
+    rnd = random.Random(5)
+    for code in todos[:60]:
+        for _ in range(20):
+            pos = rnd.randrange(len(code))
+            k, fim, _ = automato.match(code, pos)
+            k_scan, fim_scan, alcance = automato.scan(code, pos)
+            assert (k_scan, fim_scan) == (k, fim) and fim <= alcance <= len(code) + 1
+            # Retomando o casamento em um corte qualquer depois de pos
+            corte = rnd.randint(pos, len(code))
+            k1, fim1, estado = automato.continuar(code, pos, corte)
+            if estado >= 0:
+                k1, fim1, _ = automato.continuar(code[corte:], 0, None, estado, k1, fim1 - corte)
+                fim1 += corte
+            assert (k1, fim1) == (k, fim)
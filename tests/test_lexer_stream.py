@@ -0,0 +1,46 @@
+import io
+
+import pytest
+
+import linguagem
+from nucleo import lexer_regex, lexer_stream, lexer_stream_posicoes, tokenizar
+
+DIALETOS = sorted(linguagem.DIALETOS)
+
+
+def tokens_ou_erro(gerar):
+    try:
+        return list(gerar())
+    except SyntaxError as e:
+        return ("erro", str(e), getattr(e, "linha", None), getattr(e, "coluna", None))
+
+
+@pytest.mark.parametrize("dialeto", DIALETOS)
+@pytest.mark.parametrize("chunk_size", [1, 3, 64, 1 << 20])
+def test_stream_igual_ao_regex(todos, dialeto, chunk_size):
+    for code in todos:
+        esperado = tokens_ou_erro(lambda: lexer_regex(code, dialeto))
+        texto = tokens_ou_erro(lambda: lexer_stream(io.StringIO(code), chunk_size, dialeto))
+        assert texto == esperado
+        # Em bytes, os blocos cortam caracteres multibyte ao meio
+        binario = tokens_ou_erro(
+            lambda: lexer_stream(io.BytesIO(code.encode("utf-8")), chunk_size, dialeto))
+        assert binario == esperado
+
+
+def test_stream_comentario_sem_fim_atravessa_blocos():
+    # Um "/*" sem "*/" faz o autômato atravessar todos os blocos seguintes
+    code = "program p; begin /* " + "x := 1;\n" * 2000 + " end."
+    esperado = tokens_ou_erro(lambda: lexer_regex(code))
+    assert tokens_ou_erro(lambda: lexer_stream(io.StringIO(code), 16)) == esperado
+
+
+@pytest.mark.parametrize("dialeto", DIALETOS)
+def test_stream_posicoes_iguais_ao_token_stream(validos, dialeto):
+    for code in validos:
+        tokens = tokenizar(code, dialeto=dialeto)
+        posicoes = list(lexer_stream_posicoes(io.StringIO(code), 7, dialeto))
+        assert [p[0] for p in posicoes] == list(tokens.kinds)
+        assert [p[1] for p in posicoes] == list(tokens.starts)
+        assert [p[2] for p in posicoes] == list(tokens.ends)
+        assert [p[3] for p in posicoes] == list(tokens.lines)
@@ -0,0 +1,72 @@
+import json
+import pickle
+
+import pytest
+
+import linguagem
+from automato import Automato
+
+
+class _Marcador:
+    # Se o arquivo fosse lido com pickle, criaria o arquivo "caminho"
+    def __init__(self, caminho):
+        self.caminho = caminho
+
+    def __reduce__(self):
+        return (open, (self.caminho, "w"))
+
+
+def dialeto_novo(nome=linguagem.PADRAO):
+    # Outra instância, sem o autômato já carregado neste processo
+    d = linguagem.obter(nome)
+    return linguagem.Dialeto(d.nome, d.versao, d.especificacao, d.palavras_reservadas,
+                             d.reservada_como, d.ignorar, d.analisavel)
+
+
+@pytest.fixture
+def compilados(monkeypatch, tmp_path):
+    monkeypatch.setenv("ANALISADOR_COMPILADOS", str(tmp_path))
+    return tmp_path
+
+
+@pytest.mark.parametrize("nome", sorted(linguagem.DIALETOS))
+def test_carregado_igual_ao_compilado(compilados, todos, nome):
+    compilado = dialeto_novo(nome).automato()
+    carregado = dialeto_novo(nome).automato()
+    assert carregado is not compilado
+    assert carregado.para_dados() == compilado.para_dados()
+    for code in todos[:40]:
+        for pos in range(0, len(code), 7):
+            assert carregado.match(code, pos) == compilado.match(code, pos)
+
+
+def test_pickle_no_lugar_do_artefato_nao_executa(compilados):
+    d = dialeto_novo()
+    marcador = compilados / "executou"
+    caminho = d._caminho_compilado()
+    with open(caminho, "wb") as f:
+        pickle.dump(_Marcador(str(marcador)), f)
+    automato = d.automato()
+    assert not marcador.exists()
+    assert automato.match("begin", 0)[0] == automato.kind_index["BEGIN"]
+    # O artefato foi regravado, válido
+    with open(caminho, encoding="utf-8") as f:
+        assert Automato.de_dados(json.load(f), d.tipos()).para_dados() == automato.para_dados()
+
+
+@pytest.mark.parametrize("campo, valor", [
+    ("table", [10 ** 9]),
+    ("start", -1),
+    ("accept", "x"),
+    ("ascii_class", [0] * 127),
+    ("kinds", ["ID"]),
+    ("uses_boundary", 1),
+])
+def test_artefato_adulterado_e_recompilado(compilados, campo, valor):
+    d = dialeto_novo()
+    dados = d.automato().para_dados()
+    with pytest.raises(ValueError):
+        Automato.de_dados({**dados, campo: valor}, d.tipos())
+    with open(d._caminho_compilado(), "w", encoding="utf-8") as f:
+        json.dump({**dados, campo: valor}, f)
+    assert dialeto_novo().automato().para_dados() == dados
@@ -0,0 +1,23 @@
+import pytest
+
+import lote
+
+
+@pytest.mark.parametrize("workers", ["0", "-2", "dois"])
+def test_workers_invalido(capsys, workers):
+    with pytest.raises(SystemExit) as e:
+        lote.main(["testes/", "--workers", workers])
+    assert e.value.code == 2
+    assert "inteiro positivo" in capsys.readouterr().err
+
+
+def test_pool_compartilhado_e_fechar():
+    itens = [("ok.txt", b"program p; var x: integer; begin x := 1; end."), ("erro.txt", b"program p; begin x end.")]
+    try:
+        resultados, resumo = lote.analisar_lote(itens, workers=2)
+        assert [r["valid"] for r in resultados] == [True, False]
+        assert resumo["valid"] == 1
+        assert lote.pool()._mp_context.get_start_method() in ("forkserver", "spawn")
+    finally:
+        lote.fechar()
+    assert lote._pool is None
@@ -0,0 +1,51 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+import linguagem
+from nucleo import tokenizar
+from paralelo import fronteiras, tokenizar_paralelo
+
+DIALETOS = sorted(linguagem.DIALETOS)
+
+
+def tokens_ou_erro(gerar):
+    try:
+        return list(gerar())
+    except SyntaxError as e:
+        return ("erro", str(e), getattr(e, "linha", None), getattr(e, "coluna", None))
+
+
+@pytest.fixture(scope="module")
+def pool():
+    with ProcessPoolExecutor(2) as executor:
+        yield executor
+
+
+@pytest.mark.parametrize("dialeto", DIALETOS)
+def test_paralelo_igual_ao_sequencial(todos, pool, dialeto):
+    # Várias fontes emendadas: cortes caem entre e dentro de comentários e strings
+    for inicio in range(0, len(todos), 20):
+        code = "\n".join(todos[inicio:inicio + 20])
+        esperado = tokens_ou_erro(lambda: tokenizar(code, dialeto=dialeto))
+        obtido = tokens_ou_erro(
+            lambda: tokenizar_paralelo(code, workers=4, executor=pool, dialeto=dialeto, min_parte=64))
+        assert obtido == esperado
+
+
+def test_paralelo_recuperando_erros(estragados, pool):
+    code = "\n".join(estragados)
+    esperado = tokenizar(code, recuperar=True)
+    obtido = tokenizar_paralelo(code, workers=4, executor=pool, recuperar=True, min_parte=64)
+    assert list(obtido) == list(esperado)
+
+
+def test_fronteiras_fora_de_comentarios_e_strings():
+    code = "a\n/* um\ncomentário\n*/\nb 'x\ny'\nc\n" * 50
+    delimitadores = linguagem.obter().delimitadores
+    cortes = fronteiras(code, 8, delimitadores)
+    assert cortes and cortes == sorted(cortes)
+    for corte in cortes:
+        assert code[corte - 1] == "\n"
+        antes = code[:corte]
+        assert antes.count("/*") == antes.count("*/")
@@ -0,0 +1,50 @@
+import io
+
+import pytest
+
+from nucleo import Parser, ParserIterativo, tokenizar
+from gerador import parenteses_profundos, blocos_aninhados
+
+
+def analisar(classe, code, trace):
+    # (válido, mensagem, linha, logs, parser) de uma análise completa
+    tokens = tokenizar(code)
+    saida = io.StringIO()
+    p = classe(tokens, trace=trace, saida=saida)
+    try:
+        p.parse_program()
+        return True, None, None, saida.getvalue(), p
+    except SyntaxError as e:
+        return False, str(e), e.linha, saida.getvalue(), p
+
+
+def lexicamente_validos(programas):
+    for code in programas:
+        try:
+            tokenizar(code)
+        except SyntaxError:
+            continue
+        yield code
+
+
+@pytest.mark.parametrize("trace", ["text", "off"])
+def test_iterativo_igual_ao_recursivo(todos, trace):
+    for code in lexicamente_validos(todos):
+        recursivo = analisar(Parser, code, trace)
+        iterativo = analisar(ParserIterativo, code, trace)
+        assert iterativo[:4] == recursivo[:4]
+
+
+def test_rastro_estruturado_igual(todos):
+    for code in lexicamente_validos(todos):
+        recursivo = analisar(Parser, code, "struct")[4].trace
+        iterativo = analisar(ParserIterativo, code, "struct")[4].trace
+        assert list(iterativo.registros()) == list(recursivo.registros())
+        assert iterativo.regras == recursivo.regras
+
+
+def test_iterativo_sem_limite_de_recursao():
+    # O Parser recursivo estoura a pilha do Python; o iterativo não
+    for code in (parenteses_profundos(5000), blocos_aninhados(5000)):
+        p = ParserIterativo(tokenizar(code), trace="off")
+        p.parse_program()
@@ -0,0 +1,31 @@
+from nucleo import Parser, analisar_diagnosticos, tokenizar
+
+
+def test_primeiro_erro_igual_ao_do_parser(todos):
+    for code in todos:
+        diagnosticos = analisar_diagnosticos(code)
+        try:
+            tokens = tokenizar(code)
+        except SyntaxError as e:
+            # O lexer para no primeiro caractere inválido, que a recuperação
+            # também reporta (depois dos erros de sintaxe que vierem antes)
+            lexicos = [d for d in diagnosticos["errors"] if d["type"] == "lexico"]
+            assert lexicos[0]["message"] == str(e)
+            continue
+        try:
+            Parser(tokens, trace="off").parse_program()
+            erro = None
+        except SyntaxError as e:
+            erro = e
+        assert diagnosticos["valid"] == (erro is None)
+        if erro is not None:
+            primeiro = diagnosticos["errors"][0]
+            assert primeiro["message"] in str(erro)
+            assert primeiro["line"] == erro.linha
+
+
+def test_varios_erros_em_uma_passada():
+    code = "program p; begin x := ; y := 1 +; z := (2; end."
+    diagnosticos = analisar_diagnosticos(code)
+    assert not diagnosticos["valid"]
+    assert len(diagnosticos["errors"]) == 3
@@ -0,0 +1,45 @@
+import pytest
+
+import linguagem
+import nucleo
+from nucleo import lexer_regex, tokenizar
+
+DIALETOS = sorted(linguagem.DIALETOS)
+
+
+def tokens_ou_erro(gerar):
+    try:
+        return list(gerar())
+    except SyntaxError as e:
+        return ("erro", str(e), getattr(e, "linha", None), getattr(e, "coluna", None))
+
+
+@pytest.mark.parametrize("dialeto", DIALETOS)
+def test_tokenizar_igual_ao_lexer(todos, dialeto):
+    for code in todos:
+        esperado = tokens_ou_erro(lambda: lexer_regex(code, dialeto))
+        assert tokens_ou_erro(lambda: tokenizar(code, dialeto=dialeto)) == esperado
+
+
+def test_acesso_preguicoso(validos):
+    for code in validos:
+        tokens = tokenizar(code)
+        for i, (tipo, valor, linha) in enumerate(lexer_regex(code)):
+            assert (tokens.kind(i), tokens.value(i), tokens.line(i)) == (tipo, valor, linha)
+            inicio = tokens.starts[i]
+            assert tokens.column(i) == inicio - code.rfind("\n", 0, inicio)
+
+
+@pytest.mark.parametrize("lote", [1, 2, 3, 7])
+@pytest.mark.parametrize("recuperar", [False, True])
+def test_lotes_iguais_ao_laco_por_token(monkeypatch, todos, lote, recuperar):
+    # Lotes minúsculos: caracteres inválidos vizinhos (juntados em um MISMATCH
+    # só) e erros caem na fronteira entre dois lotes
+    monkeypatch.setattr(nucleo, "LOTE_TOKENS", lote)
+    extras = ["x := @@@;", "x := 1 @ @", "x @é$ := 2", "@@"]
+    for dialeto in DIALETOS:
+        for code in todos[:40] + extras:
+            def arrays(engine):
+                tokens = tokenizar(code, recuperar, dialeto, engine)
+                return tokens.kinds, tokens.starts, tokens.ends, tokens.lines
+            assert tokens_ou_erro(lambda: arrays("regex")) == tokens_ou_erro(lambda: arrays("dfa"))
@@ -0,0 +1,26 @@
+import threading
+import time
+
+import pytest
+
+from trabalhos import CANCELADO, RODANDO, FilaCheia, GerenciadorTrabalhos
+
+
+def test_fechar_com_a_fila_cheia():
+    gerenciador = GerenciadorTrabalhos(workers=1, max_fila=2, preload=())
+    rodando = gerenciador.submeter(time.sleep, 30)
+    prazo = time.monotonic() + 30
+    while rodando.estado != RODANDO and time.monotonic() < prazo:
+        time.sleep(0.01)
+    na_fila = [gerenciador.submeter(time.sleep, 30) for _ in range(2)]
+    with pytest.raises(FilaCheia):
+        gerenciador.submeter(time.sleep, 30)
+
+    # Em uma thread, para o teste falhar (e não travar) se fechar() bloquear
+    fechar = threading.Thread(target=gerenciador.fechar, daemon=True)
+    fechar.start()
+    fechar.join(10)
+    assert not fechar.is_alive()
+    for trabalho in na_fila:
+        assert trabalho.esperar(0)
+        assert trabalho.estado == CANCELADO
@@ -0,0 +1,106 @@
+from array import array
+
+from linhas import IndiceLinhas
+
+# ==============================================================================
+# FLUXO DE TOKENS COMPACTO
+# ==============================================================================
+#
+# Em vez de uma lista de tuplas (tipo, valor, linha) com strings Python, guarda
+# cada token em arrays paralelos: o tipo como código inteiro pequeno
+# (array('B')), o início/fim do lexema e a linha como array('I'). O valor é
+# fatiado da fonte original só quando alguém pede por ele.
+#
+# As linhas não são contadas pelo lexer: no primeiro acesso a lines (erros,
+# diagnósticos, a árvore sintática), calcular_linhas() tira as linhas de todos
+# os tokens do índice de linhas da fonte (linhas.py) de uma vez; quem só
+# valida não paga por elas. O mesmo índice dá a coluna de cada token.
+
+
+class TokenStream:
+    def __init__(self, source, kind_names):
+        if len(kind_names) > 256:
+            raise ValueError("TokenStream suporta no máximo 256 tipos de token")
+        self.source = source
+        self.kind_names = tuple(kind_names)
+        self.kind_codes = {name: i for i, name in enumerate(self.kind_names)}
+        self.kinds = array('B')
+        self.starts = array('I')
+        self.ends = array('I')
+        self._lines = array('I')
+        self._indice = None
+
+    def append(self, code, start, end, line=None):
+        # line: a linha do token, se quem o gerou já sabe (senão sai do índice)
+        if line is not None:
+            self.calcular_linhas()
+            self._lines.append(line)
+        self.kinds.append(code)
+        self.starts.append(start)
+        self.ends.append(end)
+
+    def extend(self, codes, starts, ends, lines=None):
+        # Vários tokens de uma vez (os lexers que trabalham por lote): os
+        # códigos em bytes (ou array('B')), início, fim e as linhas, se já
+        # conhecidas, em iteráveis de inteiros
+        if lines is not None:
+            self.calcular_linhas()
+            self._lines.extend(lines)
+        self.kinds.frombytes(codes)
+        self.starts.extend(starts)
+        self.ends.extend(ends)
+
+    @property
+    def lines(self):
+        # array('I') com a linha de cada token, calculado no primeiro uso
+        if len(self._lines) < len(self.kinds):
+            self.calcular_linhas()
+        return self._lines
+
+    def calcular_linhas(self):
+        # Linhas dos tokens acrescentados desde a última chamada. Monta um
+        # array novo em vez de estender o atual: duas threads que pedirem as
+        # linhas ao mesmo tempo chegam ao mesmo resultado, sem duplicá-las
+        feitos = len(self._lines)
+        if feitos < len(self.kinds):
+            self._lines = self._lines + self.indice.linhas(
+                self.starts[feitos:] if feitos else self.starts)
+
+    @property
+    def indice(self):
+        # Índice de linhas da fonte, montado no primeiro uso
+        if self._indice is None:
+            self._indice = IndiceLinhas(self.source)
+        return self._indice
+
+    def __len__(self):
+        return len(self.kinds)
+
+    # --- Acesso preguiçoso ---
+    def kind(self, i):
+        return self.kind_names[self.kinds[i]]
+
+    def value(self, i):
+        return self.source[self.starts[i]:self.ends[i]]
+
+    def line(self, i):
+        return self.lines[i]
+
+    def column(self, i):
+        # Coluna (a partir de 1) do início do token i
+        return self.indice.coluna(self.starts[i])
+
+    def __getitem__(self, i):
+        # Materializa a tupla (tipo, valor, linha) do token i, compatível com
+        # o formato gerado por lexer()
+        return (self.kind_names[self.kinds[i]],
+                self.source[self.starts[i]:self.ends[i]],
+                self.lines[i])
+
+    def __iter__(self):
+        for i in range(len(self.kinds)):
+            yield self[i]
+
+    def nbytes(self):
+        # Memória ocupada pelos arrays (sem contar a fonte, que já existia)
+        return sum(a.itemsize * len(a) for a in (self.kinds, self.starts, self.ends, self.lines))
@@ -0,0 +1,370 @@
+import multiprocessing
+import os
+import queue
+import threading
+import time
+import uuid
+
+# ==============================================================================
+# POOL DE PROCESSOS COM FILA LIMITADA (MODO DE PRODUÇÃO)
+# ==============================================================================
+#
+# As análises (funções do nucleo.py) rodam em N processos de trabalho, cada um
+# atendido por uma thread despachante que tira trabalhos de uma fila
+# limitada. Quando a fila está cheia, submeter() falha na hora (FilaCheia, que
+# o servidor devolve como 503) em vez de acumular requisições. Cada trabalho
+# tem um tempo limite: se estourar (ou se o trabalho for cancelado enquanto
+# roda), o processo é morto e substituído por um novo, então uma análise
+# descontrolada não prende o worker.
+#
+# Os trabalhos ficam registrados por id (para a API de submissão + consulta)
+# por `retencao` segundos depois de terminarem.
+
+FILA_PADRAO = 64
+TEMPO_LIMITE_PADRAO = 30.0
+RETENCAO_PADRAO = 600.0
+_INTERVALO = 0.05   # de quanto em quanto tempo o despachante olha o cancelamento
+_MARGEM = 5.0       # além do tempo limite, antes de quem espera desistir do trabalho
+
+# Estados de um trabalho
+NA_FILA, RODANDO, CONCLUIDO, FALHOU, TEMPO_ESGOTADO, CANCELADO = (
+    "queued", "running", "done", "error", "timeout", "cancelled")
+FINAIS = (CONCLUIDO, FALHOU, TEMPO_ESGOTADO, CANCELADO)
+
+
+def contexto_processos(preload=("nucleo",)):
+    # forkserver: processos novos (inclusive os que substituem um worker
+    # morto) nascem de um servidor limpo, com o núcleo já importado, e não de
+    # um fork do servidor web cheio de threads. Também usado pelo pool de
+    # lote.py
+    metodos = multiprocessing.get_all_start_methods()
+    contexto = multiprocessing.get_context("forkserver" if "forkserver" in metodos else "spawn")
+    if contexto.get_start_method() == "forkserver":
+        contexto.set_forkserver_preload(list(preload))
+    return contexto
+
+
+class FilaCheia(Exception):
+    pass
+
+
+class TempoEsgotado(Exception):
+    pass
+
+
+class FalhaNoTrabalho(Exception):
+    pass
+
+
+def _laco_do_processo(conexao):
+    # Roda no processo de trabalho: recebe (função, argumentos), devolve
+    # (True, resultado) ou (False, mensagem de erro)
+    while True:
+        try:
+            pedido = conexao.recv()
+        except EOFError:
+            return
+        if pedido is None:
+            return
+        funcao, args = pedido
+        try:
+            resposta = (True, funcao(*args))
+        except Exception as e:
+            resposta = (False, f"{type(e).__name__}: {e}")
+        conexao.send(resposta)
+
+
+class _Processo:
+    def __init__(self, contexto):
+        self.contexto = contexto
+        self._iniciar()
+
+    def _iniciar(self):
+        self.conexao, filho = self.contexto.Pipe()
+        self.processo = self.contexto.Process(target=_laco_do_processo, args=(filho,), daemon=True)
+        self.processo.start()
+        filho.close()
+
+    def reiniciar(self):
+        self.processo.kill()
+        self.processo.join()
+        self.conexao.close()
+        self._iniciar()
+
+    def encerrar(self):
+        try:
+            self.conexao.send(None)
+        except OSError:
+            pass
+        self.processo.join(1)
+        if self.processo.is_alive():
+            self.processo.kill()
+        self.conexao.close()
+
+
+class Trabalho:
+    def __init__(self, funcao, args, tempo_limite):
+        self.id = uuid.uuid4().hex
+        self.funcao = funcao
+        self.args = args
+        self.tempo_limite = tempo_limite
+        self.estado = NA_FILA
+        self.resultado = None
+        self.erro = None
+        self.criado = time.time()
+        self.iniciado = None
+        self.terminado = None
+        self.cancelado = False
+        self._pronto = threading.Event()
+
+    def esperar(self, timeout=None):
+        return self._pronto.wait(timeout)
+
+    def _terminar(self, estado, resultado=None, erro=None):
+        if self._pronto.is_set():
+            return
+        self.estado = estado
+        self.resultado = resultado
+        self.erro = erro
+        self.terminado = time.time()
+        self.args = None  # o código-fonte não precisa ficar retido
+        self._pronto.set()
+
+    def para_json(self):
+        dados = {"id": self.id, "status": self.estado, "created": self.criado,
+                 "started": self.iniciado, "finished": self.terminado}
+        if self.estado == CONCLUIDO:
+            dados["result"] = self.resultado
+        elif self.erro is not None:
+            dados["error"] = self.erro
+        return dados
+
+
+class GerenciadorTrabalhos:
+    def __init__(self, workers=None, max_fila=FILA_PADRAO, tempo_limite=TEMPO_LIMITE_PADRAO,
+                 retencao=RETENCAO_PADRAO, preload=("nucleo",)):
+        self.workers = workers or os.cpu_count() or 1
+        self.max_fila = max_fila
+        self.tempo_limite = tempo_limite
+        self.retencao = retencao
+        contexto = contexto_processos(preload)
+        self._fila = queue.Queue(max_fila)
+        self._trabalhos = {}
+        self._lock = threading.Lock()
+        self._fechado = False
+        # Sinal de parada dos despachantes: não passa pela fila, que pode
+        # estar cheia
+        self._parar = threading.Event()
+        self.rodando = 0
+        self.concluidos = 0
+        self.falhas = 0
+        self.rejeitados = 0
+        self.tempos_esgotados = 0
+        self.cancelados = 0
+        self._processos = [_Processo(contexto) for _ in range(self.workers)]
+        self._threads = [threading.Thread(target=self._despachar, args=(p,), daemon=True)
+                         for p in self._processos]
+        for t in self._threads:
+            t.start()
+
+    # --- Submissão ---
+    def submeter(self, funcao, *args, tempo_limite=None):
+        trabalho = Trabalho(funcao, args, tempo_limite or self.tempo_limite)
+        with self._lock:
+            self._limpar()
+            try:
+                self._fila.put_nowait(trabalho)
+            except queue.Full:
+                self.rejeitados += 1
+                raise FilaCheia(f"Servidor ocupado: {self.max_fila} análises já estão na fila")
+            self._trabalhos[trabalho.id] = trabalho
+        return trabalho
+
+    def executar(self, funcao, *args, tempo_limite=None):
+        """Submete e espera: devolve o resultado ou levanta a falha do trabalho."""
+        return self.mapear(funcao, [args], tempo_limite=tempo_limite)[0]
+
+    def mapear(self, funcao, lista_de_args, tempo_limite=None):
+        """Um trabalho por item de lista_de_args, todos na fila de uma vez.
+
+        Devolve os resultados na ordem ou levanta a primeira falha. Se a fila
+        não tem lugar para todos, nenhum é submetido (FilaCheia).
+        """
+        tempo_limite = tempo_limite or self.tempo_limite
+        lote = [Trabalho(funcao, args, tempo_limite) for args in lista_de_args]
+        with self._lock:
+            self._limpar()
+            livres = self.max_fila - self._fila.qsize() if self.max_fila > 0 else len(lote)
+            if len(lote) > livres:
+                self.rejeitados += 1
+                raise FilaCheia(f"Servidor ocupado: {self.max_fila} análises já estão na fila")
+            for trabalho in lote:
+                self._fila.put_nowait(trabalho)
+                self._trabalhos[trabalho.id] = trabalho
+        try:
+            for trabalho in lote:
+                self._aguardar(trabalho)
+                if trabalho.estado != CONCLUIDO:
+                    break
+        finally:
+            # Se um trabalho do lote falhou, o resultado dos outros não serve
+            # mais: os que estão na fila são descartados e os que estão
+            # rodando têm o processo morto pelo despachante
+            with self._lock:
+                for trabalho in lote:
+                    self._trabalhos.pop(trabalho.id, None)
+                    if trabalho.estado in FINAIS:
+                        continue
+                    trabalho.cancelado = True
+                    if trabalho.estado == NA_FILA:
+                        self.cancelados += 1
+                        trabalho._terminar(CANCELADO, erro="Cancelado")
+        for trabalho in lote:
+            if trabalho.estado == TEMPO_ESGOTADO:
+                raise TempoEsgotado(trabalho.erro)
+            if trabalho.estado != CONCLUIDO:
+                raise FalhaNoTrabalho(trabalho.erro)
+        return [trabalho.resultado for trabalho in lote]
+
+    def _aguardar(self, trabalho):
+        # O despachante termina todo trabalho até o tempo limite depois de
+        # começá-lo; a margem só cobre um despacho que falhou sem terminá-lo,
+        # para a requisição não ficar presa. O tempo na fila não conta.
+        espera = trabalho.tempo_limite + _MARGEM
+        while not trabalho.esperar(espera):
+            iniciado = trabalho.iniciado
+            if iniciado is not None and time.time() - iniciado > espera:
+                with self._lock:
+                    if trabalho.estado not in FINAIS:
+                        self.falhas += 1
+                        trabalho._terminar(FALHOU, erro="O trabalho não terminou no tempo limite")
+                return
+
+    def obter(self, id_trabalho):
+        with self._lock:
+            return self._trabalhos.get(id_trabalho)
+
+    def cancelar(self, id_trabalho):
+        # Um trabalho na fila é descartado quando chegar a vez dele; um que
+        # está rodando tem o processo morto pelo despachante
+        with self._lock:
+            trabalho = self._trabalhos.get(id_trabalho)
+            if trabalho is None or trabalho.estado in FINAIS:
+                return trabalho
+            trabalho.cancelado = True
+            if trabalho.estado == NA_FILA:
+                self.cancelados += 1
+                trabalho._terminar(CANCELADO, erro="Cancelado")
+        return trabalho
+
+    def _limpar(self):
+        # Chamado com o lock adquirido: esquece trabalhos terminados há mais
+        # de `retencao` segundos
+        limite = time.time() - self.retencao
+        velhos = [i for i, t in self._trabalhos.items()
+                  if t.terminado is not None and t.terminado < limite]
+        for i in velhos:
+            del self._trabalhos[i]
+
+    # --- Despacho ---
+    def _despachar(self, processo):
+        while not self._parar.is_set():
+            try:
+                trabalho = self._fila.get(timeout=_INTERVALO)
+            except queue.Empty:
+                continue
+            with self._lock:
+                if trabalho.estado != NA_FILA:
+                    continue  # cancelado enquanto esperava
+                trabalho.estado = RODANDO
+                trabalho.iniciado = time.time()
+                self.rodando += 1
+            try:
+                self._rodar(processo, trabalho)
+            except Exception as e:
+                # Falha do próprio despacho (um processo que não sobe de novo,
+                # argumentos que não passam pelo pipe): o trabalho falha, o
+                # processo é trocado e a thread continua atendendo a fila
+                with self._lock:
+                    self.falhas += 1
+                trabalho._terminar(FALHOU, erro=f"{type(e).__name__}: {e}")
+                try:
+                    processo.reiniciar()
+                except Exception:
+                    pass  # o próximo trabalho tenta de novo
+            finally:
+                with self._lock:
+                    self.rodando -= 1
+
+    def _rodar(self, processo, trabalho):
+        try:
+            processo.conexao.send((trabalho.funcao, trabalho.args))
+        except OSError:
+            processo.reiniciar()
+            processo.conexao.send((trabalho.funcao, trabalho.args))
+        prazo = time.monotonic() + trabalho.tempo_limite
+        while not processo.conexao.poll(_INTERVALO):
+            if trabalho.cancelado or time.monotonic() > prazo:
+                processo.reiniciar()
+                with self._lock:
+                    if trabalho.cancelado:
+                        self.cancelados += 1
+                        estado, erro = CANCELADO, "Cancelado"
+                    else:
+                        self.tempos_esgotados += 1
+                        estado = TEMPO_ESGOTADO
+                        erro = f"Tempo limite de {trabalho.tempo_limite:g} s excedido"
+                trabalho._terminar(estado, erro=erro)
+                return
+        try:
+            ok, valor = processo.conexao.recv()
+        except (EOFError, OSError):
+            # O processo morreu (ex.: sem memória): sobe outro
+            processo.reiniciar()
+            ok, valor = False, "O processo de análise terminou inesperadamente"
+        with self._lock:
+            if ok:
+                self.concluidos += 1
+            else:
+                self.falhas += 1
+        if ok:
+            trabalho._terminar(CONCLUIDO, resultado=valor)
+        else:
+            trabalho._terminar(FALHOU, erro=valor)
+
+    # --- Estado ---
+    def stats(self):
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "running": self.rodando,
+                "queued": self._fila.qsize(),
+                "max_queue": self.max_fila,
+                "time_limit": self.tempo_limite,
+                "completed": self.concluidos,
+                "failed": self.falhas,
+                "rejected": self.rejeitados,
+                "timed_out": self.tempos_esgotados,
+                "cancelled": self.cancelados,
+                "tracked_jobs": len(self._trabalhos),
+            }
+
+    def fechar(self):
+        if self._fechado:
+            return
+        self._fechado = True
+        self._parar.set()
+        # Quem espera por um trabalho que não vai mais rodar é liberado
+        with self._lock:
+            while True:
+                try:
+                    trabalho = self._fila.get_nowait()
+                except queue.Empty:
+                    break
+                if trabalho.estado == NA_FILA:
+                    self.cancelados += 1
+                    trabalho._terminar(CANCELADO, erro="Cancelado")
+        for t in self._threads:
+            t.join(1)
+        for p in self._processos:
+            p.encerrar()